@@ -0,0 +1,33 @@
+"""index comments.user_id and playlist_video.video_id
+
+Revision ID: 0d6a8f3e5b17
+Revises: e71f4c2b9d35
+Create Date: 2026-10-18 15:02:44.810259
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0d6a8f3e5b17"
+down_revision: Union[str, Sequence[str], None] = "e71f4c2b9d35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f("ix_comments_user_id"), "comments", ["user_id"], unique=False)
+    op.create_index(
+        op.f("ix_playlist_video_video_id"), "playlist_video", ["video_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_playlist_video_video_id"), table_name="playlist_video")
+    op.drop_index(op.f("ix_comments_user_id"), table_name="comments")
@@ -0,0 +1,39 @@
+"""index active subscriptions by channel
+
+Revision ID: 2b7e4d9c1f86
+Revises: d5c8a2f7b9e3
+Create Date: 2026-10-18 19:14:48.217390
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2b7e4d9c1f86"
+down_revision: Union[str, Sequence[str], None] = "d5c8a2f7b9e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_subscription_active_channel_id_user_id",
+        "subscription",
+        ["channel_id", "user_id"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_subscription_active_channel_id_user_id",
+        table_name="subscription",
+        postgresql_where=sa.text("is_active"),
+    )
@@ -0,0 +1,171 @@
+"""add channel_stats rollup
+
+Revision ID: 4e9b1d7c3a52
+Revises: 7c4e2a9f6d10
+Create Date: 2026-10-18 17:41:09.128534
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4e9b1d7c3a52"
+down_revision: Union[str, Sequence[str], None] = "7c4e2a9f6d10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same functions and triggers as app.db.models.CHANNEL_STATS_TRIGGERS at this revision.
+TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION channel_stats_add_channel() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO channel_stats (channel_id) VALUES (NEW.id);
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE TRIGGER channel_stats_add_channel AFTER INSERT ON channels
+    FOR EACH ROW EXECUTE FUNCTION channel_stats_add_channel()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION channel_stats_count_videos() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE channel_stats SET video_count = video_count + 1
+            WHERE channel_id = NEW.channel_id;
+            RETURN NULL;
+        END IF;
+        -- Before the delete, while the views it cascades to can still be counted.
+        UPDATE channel_stats SET
+            video_count = video_count - 1,
+            total_views = total_views - (SELECT count(*) FROM views WHERE video_id = OLD.id)
+        WHERE channel_id = OLD.channel_id;
+        RETURN OLD;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE TRIGGER channel_stats_video_insert AFTER INSERT ON videos
+    FOR EACH ROW EXECUTE FUNCTION channel_stats_count_videos()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER channel_stats_video_delete BEFORE DELETE ON videos
+    FOR EACH ROW EXECUTE FUNCTION channel_stats_count_videos()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION channel_stats_count_views() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        -- Once per statement: a batch of views costs one update per channel. Rows are
+        -- locked in channel order so concurrent batches cannot deadlock. Views cascading
+        -- from a deleted video find no video here; its trigger already subtracted them.
+        PERFORM 1 FROM channel_stats
+        WHERE channel_id IN (
+            SELECT videos.channel_id FROM changed JOIN videos ON videos.id = changed.video_id
+        )
+        ORDER BY channel_id
+        FOR UPDATE;
+        UPDATE channel_stats
+        SET total_views = total_views
+            + CASE TG_OP WHEN 'INSERT' THEN delta.views ELSE -delta.views END
+        FROM (
+            SELECT videos.channel_id, count(*) AS views
+            FROM changed JOIN videos ON videos.id = changed.video_id
+            GROUP BY videos.channel_id
+        ) delta
+        WHERE channel_stats.channel_id = delta.channel_id;
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE TRIGGER channel_stats_views_insert AFTER INSERT ON views
+    REFERENCING NEW TABLE AS changed
+    FOR EACH STATEMENT EXECUTE FUNCTION channel_stats_count_views()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER channel_stats_views_delete AFTER DELETE ON views
+    REFERENCING OLD TABLE AS changed
+    FOR EACH STATEMENT EXECUTE FUNCTION channel_stats_count_views()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION channel_stats_count_subscribers() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            IF OLD.is_active THEN
+                UPDATE channel_stats SET subscriber_count = subscriber_count - 1
+                WHERE channel_id = OLD.channel_id;
+            END IF;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            IF NEW.is_active THEN
+                UPDATE channel_stats SET subscriber_count = subscriber_count + 1
+                WHERE channel_id = NEW.channel_id;
+            END IF;
+        END IF;
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE TRIGGER channel_stats_subscription
+    AFTER INSERT OR DELETE OR UPDATE OF is_active, channel_id ON subscription
+    FOR EACH ROW EXECUTE FUNCTION channel_stats_count_subscribers()
+    """,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "channel_stats",
+        sa.Column("channel_id", sa.Integer(), nullable=False),
+        sa.Column("total_views", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("subscriber_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("video_count", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(
+            ["channel_id"],
+            ["channels.id"],
+            name=op.f("fk_channel_stats_channel_id_channels"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("channel_id", name=op.f("pk_channel_stats")),
+    )
+    # Creating the triggers locks out writers until commit, so the backfill below
+    # cannot miss or double count a concurrent write.
+    for statement in TRIGGERS:
+        op.execute(statement)
+    op.execute(
+        "INSERT INTO channel_stats (channel_id, total_views, subscriber_count, video_count) "
+        "SELECT channels.id, coalesce(v.total_views, 0), coalesce(s.subscribers, 0), coalesce(v.videos, 0) "
+        "FROM channels "
+        "LEFT JOIN ("
+        " SELECT videos.channel_id, count(*) AS videos, sum(coalesce(per_video.views, 0)) AS total_views"
+        " FROM videos LEFT JOIN ("
+        "  SELECT video_id, count(*) AS views FROM views GROUP BY video_id"
+        " ) per_video ON per_video.video_id = videos.id"
+        " GROUP BY videos.channel_id"
+        ") v ON v.channel_id = channels.id "
+        "LEFT JOIN ("
+        " SELECT channel_id, count(*) AS subscribers FROM subscription WHERE is_active GROUP BY channel_id"
+        ") s ON s.channel_id = channels.id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER channel_stats_subscription ON subscription")
+    op.execute("DROP TRIGGER channel_stats_views_delete ON views")
+    op.execute("DROP TRIGGER channel_stats_views_insert ON views")
+    op.execute("DROP TRIGGER channel_stats_video_delete ON videos")
+    op.execute("DROP TRIGGER channel_stats_video_insert ON videos")
+    op.execute("DROP TRIGGER channel_stats_add_channel ON channels")
+    op.execute("DROP FUNCTION channel_stats_count_subscribers()")
+    op.execute("DROP FUNCTION channel_stats_count_views()")
+    op.execute("DROP FUNCTION channel_stats_count_videos()")
+    op.execute("DROP FUNCTION channel_stats_add_channel()")
+    op.drop_table("channel_stats")
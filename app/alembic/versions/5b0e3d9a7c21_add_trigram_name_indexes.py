@@ -0,0 +1,56 @@
+"""add trigram name indexes
+
+Revision ID: 5b0e3d9a7c21
+Revises: c2d7e9f41a08
+Create Date: 2026-10-18 13:05:27.441093
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b0e3d9a7c21"
+down_revision: Union[str, Sequence[str], None] = "c2d7e9f41a08"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_users_username_trgm",
+        "users",
+        ["username"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"username": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_channels_name_trgm",
+        "channels",
+        ["name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_channels_name_trgm",
+        table_name="channels",
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    op.drop_index(
+        "ix_users_username_trgm",
+        table_name="users",
+        postgresql_using="gin",
+        postgresql_ops={"username": "gin_trgm_ops"},
+    )
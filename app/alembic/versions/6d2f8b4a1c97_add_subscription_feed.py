@@ -0,0 +1,92 @@
+"""add subscription feed
+
+Revision ID: 6d2f8b4a1c97
+Revises: 2b7e4d9c1f86
+Create Date: 2026-10-19 09:22:37.604118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6d2f8b4a1c97"
+down_revision: Union[str, Sequence[str], None] = "2b7e4d9c1f86"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same functions and triggers as app.db.models.FEED_OUTBOX_TRIGGERS at this revision.
+TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION feed_outbox_enqueue() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO feed_outbox (video_id) SELECT id FROM inserted ORDER BY id;
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE TRIGGER feed_outbox_video_insert AFTER INSERT ON videos
+    REFERENCING NEW TABLE AS inserted
+    FOR EACH STATEMENT EXECUTE FUNCTION feed_outbox_enqueue()
+    """,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "feed_outbox",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("video_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["video_id"],
+            ["videos.id"],
+            name=op.f("fk_feed_outbox_video_id_videos"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_feed_outbox")),
+    )
+    op.create_table(
+        "feed_inbox",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("uploaded_at", sa.Date(), nullable=False),
+        sa.Column("video_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name=op.f("fk_feed_inbox_user_id_users"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["video_id"],
+            ["videos.id"],
+            name=op.f("fk_feed_inbox_video_id_videos"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "user_id", "uploaded_at", "video_id", name=op.f("pk_feed_inbox")
+        ),
+    )
+    op.create_index(
+        op.f("ix_feed_inbox_video_id"), "feed_inbox", ["video_id"], unique=False
+    )
+    for statement in TRIGGERS:
+        op.execute(statement)
+    # Feeds start with the last month of uploads; the fan-out worker drains these.
+    op.execute(
+        "INSERT INTO feed_outbox (video_id) "
+        "SELECT id FROM videos WHERE uploaded_at >= CURRENT_DATE - 30 ORDER BY id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER feed_outbox_video_insert ON videos")
+    op.execute("DROP FUNCTION feed_outbox_enqueue()")
+    op.drop_index(op.f("ix_feed_inbox_video_id"), table_name="feed_inbox")
+    op.drop_table("feed_inbox")
+    op.drop_table("feed_outbox")
@@ -0,0 +1,163 @@
+"""partition views by month
+
+Revision ID: 7c4e2a9f6d10
+Revises: 0d6a8f3e5b17
+Create Date: 2026-10-18 16:10:52.306477
+
+"""
+
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c4e2a9f6d10"
+down_revision: Union[str, Sequence[str], None] = "0d6a8f3e5b17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same horizon as app.utils.partitions; the maintenance job takes over from here.
+MONTHS_AHEAD = 3
+
+
+def _add_months(month: date, months: int) -> date:
+    years, month_index = divmod(month.month - 1 + months, 12)
+    return date(month.year + years, month_index + 1, 1)
+
+
+def _rename_out_of_the_way(table: str, suffix: str, indexes: list[str]) -> None:
+    op.rename_table("views", table)
+    op.execute(f"ALTER TABLE {table} RENAME CONSTRAINT pk_views TO pk_views_{suffix}")
+    for index in indexes:
+        op.execute(f"ALTER INDEX {index} RENAME TO {index}_{suffix}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _rename_out_of_the_way(
+        "views_unpartitioned",
+        "unpartitioned",
+        ["ix_views_watched_at", "ix_views_video_id"],
+    )
+
+    op.create_table(
+        "views",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("video_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "watched_at",
+            sa.Date(),
+            server_default=sa.text("CURRENT_DATE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "watched_percentage", sa.Float(), nullable=False, server_default="0.0"
+        ),
+        sa.Column("reaction", sa.String(), nullable=True),
+        sa.CheckConstraint(
+            "watched_percentage >= 0.0 AND watched_percentage <= 1.0",
+            name=op.f("ck_views_watched_amount"),
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name=op.f("fk_views_user_id_users"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["video_id"],
+            ["videos.id"],
+            name=op.f("fk_views_video_id_videos"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "user_id", "video_id", "watched_at", name=op.f("pk_views")
+        ),
+        postgresql_partition_by="RANGE (watched_at)",
+    )
+
+    first_day = (
+        op.get_bind()
+        .execute(sa.text("SELECT min(watched_at) FROM views_unpartitioned"))
+        .scalar()
+    )
+    current = date.today().replace(day=1)
+    month = min(first_day.replace(day=1), current) if first_day else current
+    while month <= _add_months(current, MONTHS_AHEAD):
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE views_p{month:%Y_%m} PARTITION OF views "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+    op.execute("CREATE TABLE views_default PARTITION OF views DEFAULT")
+
+    op.execute(
+        "INSERT INTO views (user_id, video_id, watched_at, watched_percentage, reaction) "
+        "SELECT user_id, video_id, watched_at, watched_percentage, reaction FROM views_unpartitioned"
+    )
+    op.drop_table("views_unpartitioned")
+
+    op.create_index(op.f("ix_views_watched_at"), "views", ["watched_at"], unique=False)
+    op.create_index(
+        "ix_views_video_id",
+        "views",
+        ["video_id"],
+        unique=False,
+        postgresql_include=["reaction"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rename_out_of_the_way(
+        "views_partitioned", "partitioned", ["ix_views_watched_at", "ix_views_video_id"]
+    )
+
+    op.create_table(
+        "views",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("video_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "watched_at",
+            sa.Date(),
+            server_default=sa.text("CURRENT_DATE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "watched_percentage", sa.Float(), nullable=False, server_default="0.0"
+        ),
+        sa.Column("reaction", sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name=op.f("fk_views_user_id_users"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["video_id"],
+            ["videos.id"],
+            name=op.f("fk_views_video_id_videos"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("user_id", "video_id", name=op.f("pk_views")),
+    )
+    # Only one row per (user, video) fits the old key; keep the latest.
+    op.execute(
+        "INSERT INTO views (user_id, video_id, watched_at, watched_percentage, reaction) "
+        "SELECT DISTINCT ON (user_id, video_id) user_id, video_id, watched_at, watched_percentage, reaction "
+        "FROM views_partitioned ORDER BY user_id, video_id, watched_at DESC"
+    )
+    op.drop_table("views_partitioned")
+
+    op.create_index(op.f("ix_views_watched_at"), "views", ["watched_at"], unique=False)
+    op.create_index(
+        "ix_views_video_id",
+        "views",
+        ["video_id"],
+        unique=False,
+        postgresql_include=["reaction"],
+    )
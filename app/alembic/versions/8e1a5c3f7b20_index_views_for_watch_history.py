@@ -0,0 +1,51 @@
+"""index views for watch history
+
+Revision ID: 8e1a5c3f7b20
+Revises: 6d2f8b4a1c97
+Create Date: 2026-10-19 10:41:05.388217
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e1a5c3f7b20"
+down_revision: Union[str, Sequence[str], None] = "6d2f8b4a1c97"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_views_user_id_watched_at",
+        "views",
+        ["user_id", sa.text("watched_at DESC"), sa.text("video_id DESC")],
+        unique=False,
+        postgresql_include=["watched_percentage"],
+    )
+    op.create_index(
+        "ix_views_unfinished_user_id_watched_at",
+        "views",
+        ["user_id", sa.text("watched_at DESC")],
+        unique=False,
+        postgresql_where=sa.text("watched_percentage < 0.95"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_views_unfinished_user_id_watched_at",
+        table_name="views",
+        postgresql_where=sa.text("watched_percentage < 0.95"),
+    )
+    op.drop_index(
+        "ix_views_user_id_watched_at",
+        table_name="views",
+        postgresql_include=["watched_percentage"],
+    )
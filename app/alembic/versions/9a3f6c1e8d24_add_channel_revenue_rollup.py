@@ -0,0 +1,66 @@
+"""add channel_revenue_monthly rollup
+
+Revision ID: 9a3f6c1e8d24
+Revises: 4e9b1d7c3a52
+Create Date: 2026-10-18 18:20:37.552610
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9a3f6c1e8d24"
+down_revision: Union[str, Sequence[str], None] = "4e9b1d7c3a52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "channel_revenue_monthly",
+        sa.Column("channel_id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column(
+            "tier",
+            postgresql.ENUM(
+                "BRONZE",
+                "SILVER",
+                "GOLD",
+                "DIAMOND",
+                name="paidsubtier",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("subscribers", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["channel_id"],
+            ["channels.id"],
+            name=op.f("fk_channel_revenue_monthly_channel_id_channels"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "channel_id", "month", "tier", name=op.f("pk_channel_revenue_monthly")
+        ),
+    )
+    op.create_index(
+        "ix_paid_subscriptions_channel_active",
+        "paid_subscriptions",
+        ["sub_channel_id", "active_since", "active_to"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_paid_subscriptions_channel_active", table_name="paid_subscriptions"
+    )
+    op.drop_table("channel_revenue_monthly")
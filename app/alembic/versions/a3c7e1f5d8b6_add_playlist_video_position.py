@@ -0,0 +1,52 @@
+"""add playlist_video position
+
+Revision ID: a3c7e1f5d8b6
+Revises: 8e1a5c3f7b20
+Create Date: 2026-10-19 12:03:51.742960
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c7e1f5d8b6"
+down_revision: Union[str, Sequence[str], None] = "8e1a5c3f7b20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same spacing as app.repositories.playlist.POSITION_GAP.
+POSITION_GAP = 1024
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "playlist_video", sa.Column("position", sa.BigInteger(), nullable=True)
+    )
+    # Existing entries had no order; number them by video id.
+    op.execute(
+        f"UPDATE playlist_video SET position = numbered.n * {POSITION_GAP} "
+        "FROM ("
+        " SELECT playlist_id, video_id, row_number() OVER (PARTITION BY playlist_id ORDER BY video_id) AS n"
+        " FROM playlist_video"
+        ") numbered "
+        "WHERE playlist_video.playlist_id = numbered.playlist_id "
+        "AND playlist_video.video_id = numbered.video_id"
+    )
+    op.alter_column("playlist_video", "position", nullable=False)
+    op.create_index(
+        "ix_playlist_video_playlist_id_position",
+        "playlist_video",
+        ["playlist_id", "position"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_playlist_video_playlist_id_position", table_name="playlist_video")
+    op.drop_column("playlist_video", "position")
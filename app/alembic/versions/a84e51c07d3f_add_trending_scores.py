@@ -0,0 +1,59 @@
+"""add trending scores
+
+Revision ID: a84e51c07d3f
+Revises: 3f1c9a7d2b64
+Create Date: 2026-10-18 13:47:05.731622
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a84e51c07d3f"
+down_revision: Union[str, Sequence[str], None] = "3f1c9a7d2b64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "job_watermarks",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("value", sa.Date(), nullable=False),
+        sa.PrimaryKeyConstraint("name", name=op.f("pk_job_watermarks")),
+    )
+    op.create_table(
+        "video_trending_scores",
+        sa.Column("video_id", sa.Integer(), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column(
+            "updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.ForeignKeyConstraint(
+            ["video_id"],
+            ["videos.id"],
+            name=op.f("fk_video_trending_scores_video_id_videos"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("video_id", name=op.f("pk_video_trending_scores")),
+    )
+    op.create_index(
+        op.f("ix_video_trending_scores_score"),
+        "video_trending_scores",
+        ["score"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_video_trending_scores_score"), table_name="video_trending_scores"
+    )
+    op.drop_table("video_trending_scores")
+    op.drop_table("job_watermarks")
@@ -0,0 +1,67 @@
+"""record pulled feed videos
+
+Revision ID: b8d4f2a6c3e9
+Revises: a3c7e1f5d8b6
+Create Date: 2026-10-19 14:05:12.418305
+
+"""
+
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8d4f2a6c3e9"
+down_revision: Union[str, Sequence[str], None] = "a3c7e1f5d8b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "feed_pulled",
+        sa.Column("channel_id", sa.Integer(), nullable=False),
+        sa.Column("uploaded_at", sa.Date(), nullable=False),
+        sa.Column("video_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["channel_id"],
+            ["channels.id"],
+            name=op.f("fk_feed_pulled_channel_id_channels"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["video_id"],
+            ["videos.id"],
+            name=op.f("fk_feed_pulled_video_id_videos"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "channel_id", "uploaded_at", "video_id", name=op.f("pk_feed_pulled")
+        ),
+    )
+    op.create_index(
+        op.f("ix_feed_pulled_video_id"), "feed_pulled", ["video_id"], unique=False
+    )
+    # Until now every video of a channel above the threshold was merged at read time; those
+    # videos keep that treatment. Videos still queued are decided by the fan-out worker.
+    op.execute(
+        sa.text(
+            "INSERT INTO feed_pulled (channel_id, uploaded_at, video_id) "
+            "SELECT videos.channel_id, videos.uploaded_at, videos.id FROM videos "
+            "JOIN channel_stats ON channel_stats.channel_id = videos.channel_id "
+            "WHERE channel_stats.subscriber_count > :max_subscribers "
+            "AND videos.id NOT IN (SELECT video_id FROM feed_outbox)"
+        ).bindparams(
+            max_subscribers=int(os.getenv("FEED_FANOUT_MAX_SUBSCRIBERS", "10000"))
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_feed_pulled_video_id"), table_name="feed_pulled")
+    op.drop_table("feed_pulled")
@@ -0,0 +1,56 @@
+"""add video full text search
+
+Revision ID: c2d7e9f41a08
+Revises: a84e51c07d3f
+Create Date: 2026-10-18 15:02:19.448213
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c2d7e9f41a08"
+down_revision: Union[str, Sequence[str], None] = "a84e51c07d3f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "videos",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_videos_search_vector",
+        "videos",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_where=sa.text("is_active"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_videos_search_vector",
+        table_name="videos",
+        postgresql_using="gin",
+        postgresql_where=sa.text("is_active"),
+    )
+    op.drop_column("videos", "search_vector")
@@ -0,0 +1,54 @@
+"""add channel_strikes.expires_at
+
+Revision ID: d5c8a2f7b9e3
+Revises: 9a3f6c1e8d24
+Create Date: 2026-10-18 18:52:14.903117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d5c8a2f7b9e3"
+down_revision: Union[str, Sequence[str], None] = "9a3f6c1e8d24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "channel_strikes",
+        sa.Column(
+            "expires_at",
+            sa.DateTime(),
+            sa.Computed("issued_at + duration", persisted=True),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_channel_strikes_channel_id_expires_at",
+        "channel_strikes",
+        ["channel_id", "expires_at"],
+        unique=False,
+    )
+    # Covered by the leading column of the composite index.
+    op.drop_index(op.f("ix_channel_strikes_channel_id"), table_name="channel_strikes")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        op.f("ix_channel_strikes_channel_id"),
+        "channel_strikes",
+        ["channel_id"],
+        unique=False,
+    )
+    op.drop_index(
+        "ix_channel_strikes_channel_id_expires_at", table_name="channel_strikes"
+    )
+    op.drop_column("channel_strikes", "expires_at")
@@ -0,0 +1,67 @@
+"""replace boolean indexes with partial and covering indexes
+
+Revision ID: e71f4c2b9d35
+Revises: 5b0e3d9a7c21
+Create Date: 2026-10-18 14:21:09.572316
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e71f4c2b9d35"
+down_revision: Union[str, Sequence[str], None] = "5b0e3d9a7c21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index(op.f("ix_reports_is_resolved"), table_name="reports")
+    op.drop_index(op.f("ix_videos_is_active"), table_name="videos")
+    op.drop_index(op.f("ix_users_is_deleted"), table_name="users")
+    op.create_index(
+        "ix_reports_unresolved_created_at",
+        "reports",
+        ["created_at"],
+        unique=False,
+        postgresql_where=sa.text("NOT is_resolved"),
+    )
+    op.create_index(
+        "ix_videos_active_channel_id_uploaded_at",
+        "videos",
+        ["channel_id", sa.text("uploaded_at DESC")],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+    op.create_index(
+        "ix_users_active_id",
+        "users",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("NOT is_deleted"),
+    )
+    op.create_index(
+        "ix_views_video_id",
+        "views",
+        ["video_id"],
+        unique=False,
+        postgresql_include=["reaction"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_views_video_id", table_name="views")
+    op.drop_index("ix_users_active_id", table_name="users")
+    op.drop_index("ix_videos_active_channel_id_uploaded_at", table_name="videos")
+    op.drop_index("ix_reports_unresolved_created_at", table_name="reports")
+    op.create_index(op.f("ix_users_is_deleted"), "users", ["is_deleted"], unique=False)
+    op.create_index(op.f("ix_videos_is_active"), "videos", ["is_active"], unique=False)
+    op.create_index(
+        op.f("ix_reports_is_resolved"), "reports", ["is_resolved"], unique=False
+    )
@@ -1,27 +1,35 @@
 from __future__ import annotations
 
 import enum
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from decimal import Decimal
 from typing import Literal
 
 from sqlalchemy import (
+    DDL,
+    BigInteger,
     Boolean,
     CheckConstraint,
+    Computed,
     Date,
     DateTime,
     Enum,
     Float,
     ForeignKey,
     ForeignKeyConstraint,
+    Index,
     Integer,
     Interval,
     MetaData,
+    Numeric,
     String,
     Text,
     func,
+    event,
     text,
     true,
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 naming_convention: dict[str, str] = {
@@ -32,6 +40,7 @@ naming_convention: dict[str, str] = {
     "pk": "pk_%(table_name)s",
 }
 metadata = MetaData(naming_convention=naming_convention)
+event.listen(metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
 
 
 class Base(DeclarativeBase):
@@ -40,6 +49,15 @@ class Base(DeclarativeBase):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index(
+            "ix_users_username_trgm",
+            "username",
+            postgresql_using="gin",
+            postgresql_ops={"username": "gin_trgm_ops"},
+        ),
+        Index("ix_users_active_id", "id", postgresql_where=text("NOT is_deleted")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     username: Mapped[str] = mapped_column(String(32), nullable=False, unique=True)
@@ -47,7 +65,7 @@ class User(Base):
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
     created_at: Mapped[str] = mapped_column(Date, nullable=False)
     is_moderator: Mapped[bool] = mapped_column(default=False, nullable=False)
-    is_deleted: Mapped[bool] = mapped_column(default=False, nullable=False, index=True)
+    is_deleted: Mapped[bool] = mapped_column(default=False, nullable=False)
     is_banned: Mapped[bool] = mapped_column(default=False, nullable=False)
 
     channels: Mapped[list["Channel"]] = relationship(
@@ -72,15 +90,25 @@ class User(Base):
 
 class ChannelStrike(Base):
     __tablename__ = "channel_strikes"
+    __table_args__ = (
+        Index("ix_channel_strikes_channel_id_expires_at", "channel_id", "expires_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     issued_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     duration: Mapped[timedelta] = mapped_column(Interval)
+    # Active while expires_at > localtimestamp. localtimestamp is a naive timestamp like
+    # issued_at, so the cutoff is in the same clock as the stored values; now() would also
+    # use the index (btree datetime_ops has cross-type operators), but would shift the cutoff
+    # by the session time zone.
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime, Computed("issued_at + duration", persisted=True)
+    )
     video_id: Mapped[int | None] = mapped_column(
         Integer, ForeignKey("videos.id"), nullable=True
     )
     channel_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("channels.id", ondelete="CASCADE"), index=True
+        Integer, ForeignKey("channels.id", ondelete="CASCADE")
     )
 
     video: Mapped[Video | None] = relationship(
@@ -91,6 +119,14 @@ class ChannelStrike(Base):
 
 class Channel(Base):
     __tablename__ = "channels"
+    __table_args__ = (
+        Index(
+            "ix_channels_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(32), nullable=False)
@@ -118,6 +154,18 @@ class Video(Base):
         CheckConstraint(
             "length(description) <= 256", name="ck_videos_description_length"
         ),
+        Index(
+            "ix_videos_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_videos_active_channel_id_uploaded_at",
+            "channel_id",
+            text("uploaded_at DESC"),
+            postgresql_where=text("is_active"),
+        ),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -126,10 +174,22 @@ class Video(Base):
     uploaded_at: Mapped[str] = mapped_column(
         Date, nullable=False, server_default=text("CURRENT_DATE")
     )
-    is_active: Mapped[bool] = mapped_column(default=True, nullable=False, index=True)
+    is_active: Mapped[bool] = mapped_column(default=True, nullable=False)
     is_monetized: Mapped[bool] = mapped_column(default=False, nullable=False)
     channel_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("channels.id", ondelete="CASCADE"), nullable=False, index=True
+        Integer,
+        ForeignKey("channels.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
     )
 
     channel: Mapped[Channel] = relationship("Channel", back_populates="videos")
@@ -162,7 +222,7 @@ class Comment(Base):
         Date, nullable=False, server_default=text("CURRENT_DATE"), index=True
     )
     user_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
     video_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("videos.id", ondelete="CASCADE"), nullable=False, index=True
@@ -192,13 +252,21 @@ class Playlist(Base):
 
 class PlaylistVideo(Base):
     __tablename__ = "playlist_video"
+    __table_args__ = (
+        # Playlist contents in order; positions are spaced so a move rewrites one row.
+        Index("ix_playlist_video_playlist_id_position", "playlist_id", "position"),
+    )
 
     playlist_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("playlists.id", ondelete="CASCADE"), primary_key=True
     )
     video_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True
+        Integer,
+        ForeignKey("videos.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
     )
+    position: Mapped[int] = mapped_column(BigInteger, nullable=False)
 
     playlist: Mapped[Playlist] = relationship("Playlist", back_populates="videos")
     video: Mapped[Video] = relationship("Video", back_populates="playlist_entries")
@@ -206,6 +274,15 @@ class PlaylistVideo(Base):
 
 class Subscription(Base):
     __tablename__ = "subscription"
+    __table_args__ = (
+        # Subscriber listings page through a channel by user_id.
+        Index(
+            "ix_subscription_active_channel_id_user_id",
+            "channel_id",
+            "user_id",
+            postgresql_where=text("is_active"),
+        ),
+    )
 
     user_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
@@ -236,6 +313,12 @@ class PaidSubscription(Base):
             ["sub_user_id", "sub_channel_id"],
             ["subscription.user_id", "subscription.channel_id"],
         ),
+        Index(
+            "ix_paid_subscriptions_channel_active",
+            "sub_channel_id",
+            "active_since",
+            "active_to",
+        ),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -248,7 +331,22 @@ class PaidSubscription(Base):
     sub_user_id: Mapped[int] = mapped_column(Integer, nullable=False)
     sub_channel_id: Mapped[int] = mapped_column(Integer, nullable=False)
 
-    subscription: Mapped[Subscription] = relationship("Subscription", back_populates="paid_subs")
+    subscription: Mapped[Subscription] = relationship(
+        "Subscription", back_populates="paid_subs"
+    )
+
+
+class ChannelRevenueMonthly(Base):
+    # Rebuilt month by month by app.utils.revenue.
+    __tablename__ = "channel_revenue_monthly"
+
+    channel_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("channels.id", ondelete="CASCADE"), primary_key=True
+    )
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+    tier: Mapped[PaidSubTier] = mapped_column(Enum(PaidSubTier), primary_key=True)
+    subscribers: Mapped[int] = mapped_column(Integer, nullable=False)
+    revenue: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
 
 
 class View(Base):
@@ -259,6 +357,24 @@ class View(Base):
             "watched_percentage >= 0.0 AND watched_percentage <= 1.0",
             name="ck_views_watched_amount",
         ),
+        Index("ix_views_video_id", "video_id", postgresql_include=["reaction"]),
+        # Watch history, newest first, without touching the heap.
+        Index(
+            "ix_views_user_id_watched_at",
+            "user_id",
+            text("watched_at DESC"),
+            text("video_id DESC"),
+            postgresql_include=["watched_percentage"],
+        ),
+        # Continue watching: only the unfinished views, a small share of the table.
+        Index(
+            "ix_views_unfinished_user_id_watched_at",
+            "user_id",
+            text("watched_at DESC"),
+            postgresql_where=text("watched_percentage < 0.95"),
+        ),
+        # Monthly partitions are managed by app.utils.partitions.
+        {"postgresql_partition_by": "RANGE (watched_at)"},
     )
 
     user_id: Mapped[int] = mapped_column(
@@ -268,7 +384,11 @@ class View(Base):
         Integer, ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True
     )
     watched_at: Mapped[str] = mapped_column(
-        Date, nullable=False, server_default=text("CURRENT_DATE"), index=True
+        Date,
+        primary_key=True,
+        nullable=False,
+        server_default=text("CURRENT_DATE"),
+        index=True,
     )
     watched_percentage: Mapped[float] = mapped_column(
         Float, nullable=False, default=0.0
@@ -282,10 +402,57 @@ class View(Base):
     video: Mapped[Video] = relationship("Video", back_populates="views")
 
 
+event.listen(
+    View.__table__,
+    "after_create",
+    DDL("CREATE TABLE views_default PARTITION OF views DEFAULT"),
+)
+
+
+class UserRecommendation(Base):
+    __tablename__ = "user_recommendations"
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    rank: Mapped[int] = mapped_column(Integer, primary_key=True)
+    video_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("videos.id", ondelete="CASCADE"), nullable=False
+    )
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.now()
+    )
+
+
+class VideoTrendingScore(Base):
+    __tablename__ = "video_trending_scores"
+
+    video_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True
+    )
+    # ln of the exponentially decayed view count, measured at TRENDING_EPOCH.
+    score: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.now()
+    )
+
+
+class JobWatermark(Base):
+    __tablename__ = "job_watermarks"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[date] = mapped_column(Date, nullable=False)
+
+
 class Report(Base):
     __tablename__ = "reports"
     __table_args__ = (
         CheckConstraint("length(reason) <= 512", name="ck_reports_reason_length"),
+        Index(
+            "ix_reports_unresolved_created_at",
+            "created_at",
+            postgresql_where=text("NOT is_resolved"),
+        ),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -293,7 +460,7 @@ class Report(Base):
     created_at: Mapped[str] = mapped_column(
         Date, nullable=False, server_default=text("CURRENT_DATE")
     )
-    is_resolved: Mapped[bool] = mapped_column(default=False, nullable=False, index=True)
+    is_resolved: Mapped[bool] = mapped_column(default=False, nullable=False)
     reporter_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
@@ -302,4 +469,188 @@ class Report(Base):
     )
 
     reporter: Mapped[User] = relationship("User", back_populates="reports_created")
-    video: Mapped[Video] = relationship("Video", back_populates="reports")
\ No newline at end of file
+    video: Mapped[Video] = relationship("Video", back_populates="reports")
+
+
+class ChannelStats(Base):
+    # Maintained by the triggers below; never written by the application.
+    __tablename__ = "channel_stats"
+
+    channel_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("channels.id", ondelete="CASCADE"), primary_key=True
+    )
+    total_views: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default="0"
+    )
+    subscriber_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default="0"
+    )
+    video_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default="0"
+    )
+
+
+CHANNEL_STATS_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION channel_stats_add_channel() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO channel_stats (channel_id) VALUES (NEW.id);
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE TRIGGER channel_stats_add_channel AFTER INSERT ON channels
+    FOR EACH ROW EXECUTE FUNCTION channel_stats_add_channel()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION channel_stats_count_videos() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE channel_stats SET video_count = video_count + 1
+            WHERE channel_id = NEW.channel_id;
+            RETURN NULL;
+        END IF;
+        -- Before the delete, while the views it cascades to can still be counted.
+        UPDATE channel_stats SET
+            video_count = video_count - 1,
+            total_views = total_views - (SELECT count(*) FROM views WHERE video_id = OLD.id)
+        WHERE channel_id = OLD.channel_id;
+        RETURN OLD;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE TRIGGER channel_stats_video_insert AFTER INSERT ON videos
+    FOR EACH ROW EXECUTE FUNCTION channel_stats_count_videos()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER channel_stats_video_delete BEFORE DELETE ON videos
+    FOR EACH ROW EXECUTE FUNCTION channel_stats_count_videos()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION channel_stats_count_views() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        -- Once per statement: a batch of views costs one update per channel. Rows are
+        -- locked in channel order so concurrent batches cannot deadlock. Views cascading
+        -- from a deleted video find no video here; its trigger already subtracted them.
+        PERFORM 1 FROM channel_stats
+        WHERE channel_id IN (
+            SELECT videos.channel_id FROM changed JOIN videos ON videos.id = changed.video_id
+        )
+        ORDER BY channel_id
+        FOR UPDATE;
+        UPDATE channel_stats
+        SET total_views = total_views
+            + CASE TG_OP WHEN 'INSERT' THEN delta.views ELSE -delta.views END
+        FROM (
+            SELECT videos.channel_id, count(*) AS views
+            FROM changed JOIN videos ON videos.id = changed.video_id
+            GROUP BY videos.channel_id
+        ) delta
+        WHERE channel_stats.channel_id = delta.channel_id;
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE TRIGGER channel_stats_views_insert AFTER INSERT ON views
+    REFERENCING NEW TABLE AS changed
+    FOR EACH STATEMENT EXECUTE FUNCTION channel_stats_count_views()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER channel_stats_views_delete AFTER DELETE ON views
+    REFERENCING OLD TABLE AS changed
+    FOR EACH STATEMENT EXECUTE FUNCTION channel_stats_count_views()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION channel_stats_count_subscribers() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            IF OLD.is_active THEN
+                UPDATE channel_stats SET subscriber_count = subscriber_count - 1
+                WHERE channel_id = OLD.channel_id;
+            END IF;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            IF NEW.is_active THEN
+                UPDATE channel_stats SET subscriber_count = subscriber_count + 1
+                WHERE channel_id = NEW.channel_id;
+            END IF;
+        END IF;
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE TRIGGER channel_stats_subscription
+    AFTER INSERT OR DELETE OR UPDATE OF is_active, channel_id ON subscription
+    FOR EACH ROW EXECUTE FUNCTION channel_stats_count_subscribers()
+    """,
+)
+for statement in CHANNEL_STATS_TRIGGERS:
+    event.listen(metadata, "after_create", DDL(statement))
+
+
+class FeedOutbox(Base):
+    # Videos waiting for fan-out into feed_inbox; filled by the trigger below, drained by
+    # app.utils.feed.
+    __tablename__ = "feed_outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    video_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("videos.id", ondelete="CASCADE"), nullable=False
+    )
+
+
+class FeedInbox(Base):
+    # One row per (subscriber, video) of channels small enough to fan out on write.
+    __tablename__ = "feed_inbox"
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    uploaded_at: Mapped[date] = mapped_column(Date, primary_key=True)
+    video_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("videos.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+
+
+class FeedPulled(Base):
+    # Videos whose channel was above the fan-out threshold when they were fanned out; feeds
+    # merge them at read time. Recorded per video, so a channel crossing the threshold later
+    # neither hides nor duplicates what was already decided.
+    __tablename__ = "feed_pulled"
+
+    channel_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("channels.id", ondelete="CASCADE"), primary_key=True
+    )
+    uploaded_at: Mapped[date] = mapped_column(Date, primary_key=True)
+    video_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("videos.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+
+
+FEED_OUTBOX_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION feed_outbox_enqueue() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO feed_outbox (video_id) SELECT id FROM inserted ORDER BY id;
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE TRIGGER feed_outbox_video_insert AFTER INSERT ON videos
+    REFERENCING NEW TABLE AS inserted
+    FOR EACH STATEMENT EXECUTE FUNCTION feed_outbox_enqueue()
+    """,
+)
+for statement in FEED_OUTBOX_TRIGGERS:
+    event.listen(metadata, "after_create", DDL(statement))
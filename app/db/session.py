@@ -22,4 +22,10 @@ def get_session():
         db.close()
 
 
+def get_session_factory():
+    return SessionLocal
+
+
 DBDep = Annotated[Session, Depends(get_session)]
+# For endpoints that run independent queries concurrently, one session per thread.
+SessionFactoryDep = Annotated[sessionmaker, Depends(get_session_factory)]
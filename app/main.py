@@ -1,18 +1,71 @@
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from fastapi import FastAPI
 
 from . import routers
+from .utils import feed, partitions, revenue, trending
+from .utils.periodic import BACKGROUND_TASKS_ENABLED, run_job, run_periodically
+from .utils.view_events import (
+    FLUSH_INTERVAL,
+    PROGRESS_MAX_STALENESS,
+    view_event_buffer,
+    view_progress_buffer,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Startup
+    tasks = []
+    if BACKGROUND_TASKS_ENABLED:
+        tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    trending.refresh_trending_scores, trending.REFRESH_INTERVAL
+                )
+            )
+        )
+        tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    partitions.maintain_view_partitions, partitions.MAINTENANCE_INTERVAL
+                )
+            )
+        )
+        tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    revenue.refresh_channel_revenue, revenue.REFRESH_INTERVAL
+                )
+            )
+        )
+        tasks.append(
+            asyncio.create_task(
+                run_periodically(feed.fan_out_videos, feed.FANOUT_INTERVAL)
+            )
+        )
+        tasks.append(
+            asyncio.create_task(
+                run_periodically(view_event_buffer.flush, FLUSH_INTERVAL)
+            )
+        )
+        tasks.append(
+            asyncio.create_task(
+                run_periodically(view_progress_buffer.flush, PROGRESS_MAX_STALENESS)
+            )
+        )
 
     yield
 
     # Shutdown
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if BACKGROUND_TASKS_ENABLED:
+        await asyncio.to_thread(run_job, view_event_buffer.flush)
+        await asyncio.to_thread(run_job, view_progress_buffer.flush)
 
 
 app = FastAPI(lifespan=lifespan)
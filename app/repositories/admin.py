@@ -1,9 +1,64 @@
 from datetime import timedelta
-from sqlalchemy import Float, Integer, func, select
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Float,
+    Integer,
+    any_,
+    bindparam,
+    case,
+    func,
+    literal,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session, load_only
 from app.db.models import Channel, ChannelStrike, Report, User, Video
 
 
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _name_match(column, query: str):
+    # Both predicates are answered by the column's gin_trgm_ops index.
+    prefix = column.ilike(_escape_like(query) + "%")
+    similarity = func.word_similarity(query, column)
+    return (
+        (prefix | literal(query).op("<%")(column)),
+        similarity.label("similarity"),
+        (prefix.desc(), similarity.desc()),
+    )
+
+
+def _bulk_update(db: Session, model, ids: list[int], pending, **values):
+    # One statement: update the rows not yet in the target state and report every requested
+    # id as updated, unchanged or not_found. The outer join reads the pre-update snapshot.
+    ids_param = bindparam("ids", list(dict.fromkeys(ids)), type_=ARRAY(Integer))
+    requested = select(func.unnest(ids_param).label("id")).cte("requested")
+    updated = (
+        update(model)
+        .where(model.id == any_(ids_param), pending)
+        .values(**values)
+        .returning(model.id)
+        .cte("updated")
+    )
+    outcome = case(
+        (updated.c.id.is_not(None), "updated"),
+        (model.id.is_not(None), "unchanged"),
+        else_="not_found",
+    )
+    return db.execute(
+        select(requested.c.id, outcome.label("outcome"))
+        .select_from(
+            requested.outerjoin(updated, updated.c.id == requested.c.id).outerjoin(
+                model, model.id == requested.c.id
+            )
+        )
+        .order_by(requested.c.id)
+    ).all()
+
+
 class AdminRepository:
     @staticmethod
     def get_video_by_id(db: Session, video_id: int):
@@ -41,17 +96,84 @@ class AdminRepository:
         return (
             db.execute(
                 select(func.count(ChannelStrike.id)).where(
-                    ChannelStrike.channel_id == channel_id
+                    ChannelStrike.channel_id == channel_id,
+                    ChannelStrike.expires_at > func.localtimestamp(),
                 )
             ).scalar()
             or 0
         )
 
+    @staticmethod
+    def deactivate_videos(db: Session, video_ids: list[int]):
+        return _bulk_update(db, Video, video_ids, Video.is_active, is_active=False)
+
+    @staticmethod
+    def demonetize_videos(db: Session, video_ids: list[int]):
+        return _bulk_update(
+            db, Video, video_ids, Video.is_monetized, is_monetized=False
+        )
+
+    @staticmethod
+    def ban_users(db: Session, user_ids: list[int]):
+        return _bulk_update(db, User, user_ids, User.is_banned == False, is_banned=True)
+
+    @staticmethod
+    def resolve_reports(db: Session, report_ids: list[int]):
+        return _bulk_update(
+            db, Report, report_ids, Report.is_resolved == False, is_resolved=True
+        )
+
+    @staticmethod
+    def resolve_video_reports(db: Session, video_id: int):
+        resolved = (
+            update(Report)
+            .where(Report.video_id == video_id, Report.is_resolved == False)
+            .values(is_resolved=True)
+            .returning(Report.id)
+            .cte("resolved")
+        )
+        return db.execute(
+            select(
+                select(Video.id).where(Video.id == video_id).exists().label("found"),
+                select(func.array_agg(resolved.c.id))
+                .scalar_subquery()
+                .label("report_ids"),
+            )
+        ).one()
+
+    @staticmethod
+    def import_subscriptions(db: Session, pairs: list[tuple[int, int]]) -> int:
+        # pairs: distinct (channel_id, user_id), sorted, so concurrent imports take the
+        # channel_stats row locks of the subscriber_count trigger in the same order.
+        channel_ids, user_ids = (list(column) for column in zip(*pairs))
+        return db.execute(
+            text(
+                "INSERT INTO subscription (user_id, channel_id, is_active) "
+                "SELECT p.user_id, p.channel_id, true "
+                "FROM unnest(CAST(:channel_ids AS integer[]), CAST(:user_ids AS integer[])) "
+                "WITH ORDINALITY AS p(channel_id, user_id, n) "
+                "JOIN channels ON channels.id = p.channel_id "
+                "JOIN users ON users.id = p.user_id AND NOT users.is_deleted "
+                "ORDER BY p.n "
+                "ON CONFLICT (user_id, channel_id) DO UPDATE SET is_active = true "
+                "WHERE NOT subscription.is_active"
+            ),
+            {"channel_ids": channel_ids, "user_ids": user_ids},
+        ).rowcount
+
     @staticmethod
     def get_all_reports(
-        db: Session, resolved: bool | None = None, skip: int = 0, limit: int = 50
+        db: Session,
+        resolved: bool | None = None,
+        skip: int = 0,
+        limit: int = 50,
+        fields: list[str] | None = None,
     ):
         query = select(Report)
+        if fields:
+            query = query.options(
+                load_only(*(getattr(Report, name) for name in fields))
+            )
 
         if resolved is not None:
             query = query.where(Report.is_resolved == resolved)
@@ -139,3 +261,30 @@ class AdminRepository:
             .limit(limit)
         )
         return db.execute(query).all()
+
+    @staticmethod
+    def get_users_by_ids(db: Session, user_ids: list[int]):
+        ids_param = bindparam("ids", user_ids, type_=ARRAY(Integer))
+        return (
+            db.execute(select(User).where(User.id == any_(ids_param))).scalars().all()
+        )
+
+    @staticmethod
+    def search_users(db: Session, query: str, limit: int = 20):
+        condition, similarity, order = _name_match(User.username, query)
+        return db.execute(
+            select(User, similarity)
+            .where(condition)
+            .order_by(*order, User.id)
+            .limit(limit)
+        ).all()
+
+    @staticmethod
+    def search_channels(db: Session, query: str, limit: int = 20):
+        condition, similarity, order = _name_match(Channel.name, query)
+        return db.execute(
+            select(Channel, similarity)
+            .where(condition)
+            .order_by(*order, Channel.id)
+            .limit(limit)
+        ).all()
@@ -0,0 +1,205 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import (
+    Date,
+    Numeric,
+    case,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    text,
+)
+from sqlalchemy.orm import Session
+from app.db.models import (
+    Channel,
+    ChannelRevenueMonthly,
+    ChannelStats,
+    ChannelStrike,
+    PaidSubscription,
+    PaidSubTier,
+    Subscription,
+    User,
+)
+
+TIER_PRICE = case(
+    *(
+        (
+            PaidSubscription.tier == tier,
+            literal(Decimal(str(tier.value)), Numeric(6, 2)),
+        )
+        for tier in PaidSubTier
+    )
+)
+
+
+class ChannelRepository:
+    @staticmethod
+    def get_stats(db: Session, channel_id: int):
+        # Counters come from the trigger-maintained rollup; strikes expire with time, so the
+        # active ones are counted here from (channel_id, expires_at).
+        active_strikes = (
+            select(func.count())
+            .select_from(ChannelStrike)
+            .where(
+                ChannelStrike.channel_id == channel_id,
+                ChannelStrike.expires_at > func.localtimestamp(),
+            )
+            .scalar_subquery()
+        )
+        return db.execute(
+            select(
+                Channel.id,
+                Channel.name,
+                ChannelStats.total_views,
+                ChannelStats.subscriber_count,
+                ChannelStats.video_count,
+                active_strikes.label("active_strikes"),
+            )
+            .join(ChannelStats, ChannelStats.channel_id == Channel.id)
+            .where(Channel.id == channel_id)
+        ).one_or_none()
+
+    @staticmethod
+    def get_subscriber_count(db: Session, channel_id: int) -> int | None:
+        # None when the channel does not exist: every channel has a channel_stats row.
+        return db.scalar(
+            select(ChannelStats.subscriber_count).where(
+                ChannelStats.channel_id == channel_id
+            )
+        )
+
+    @staticmethod
+    def get_subscribers(
+        db: Session, channel_id: int, limit: int, after_id: int | None = None
+    ):
+        query = (
+            select(User.id, User.username)
+            .join(Subscription, Subscription.user_id == User.id)
+            .where(Subscription.channel_id == channel_id, Subscription.is_active)
+        )
+        if after_id is not None:
+            query = query.where(Subscription.user_id > after_id)
+        return db.execute(query.order_by(Subscription.user_id).limit(limit)).all()
+
+    @staticmethod
+    def subscribe(db: Session, channel_id: int, user_id: int):
+        # Only a row that actually flips is written, so the subscriber_count trigger fires once
+        # per real change however many clicks race; a concurrent click waits on the row lock and
+        # then skips it. The count is read from the statement snapshot, before the trigger.
+        return db.execute(
+            text(
+                "WITH target AS ("
+                " SELECT users.id AS user_id, channels.id AS channel_id FROM channels"
+                " JOIN users ON users.id = :user_id AND NOT users.is_deleted"
+                " WHERE channels.id = :channel_id"
+                "), changed AS ("
+                " INSERT INTO subscription (user_id, channel_id, is_active)"
+                " SELECT user_id, channel_id, true FROM target"
+                " ON CONFLICT (user_id, channel_id) DO UPDATE SET is_active = true"
+                " WHERE NOT subscription.is_active"
+                " RETURNING 1"
+                ") "
+                "SELECT EXISTS (SELECT 1 FROM target) AS found,"
+                " EXISTS (SELECT 1 FROM changed) AS changed,"
+                " (SELECT subscriber_count FROM channel_stats"
+                " WHERE channel_id = :channel_id) AS subscriber_count"
+            ),
+            {"channel_id": channel_id, "user_id": user_id},
+        ).one()
+
+    @staticmethod
+    def unsubscribe(db: Session, channel_id: int, user_id: int):
+        # The row is kept inactive rather than deleted: paid_subscriptions reference it. Paid
+        # tiers still running on it end with it, so billing stops at the same moment.
+        return db.execute(
+            text(
+                "WITH changed AS ("
+                " UPDATE subscription SET is_active = false"
+                " WHERE user_id = :user_id AND channel_id = :channel_id AND is_active"
+                " RETURNING user_id, channel_id"
+                "), closed AS ("
+                " UPDATE paid_subscriptions SET active_to = localtimestamp FROM changed"
+                " WHERE paid_subscriptions.sub_channel_id = changed.channel_id"
+                " AND paid_subscriptions.sub_user_id = changed.user_id"
+                " AND paid_subscriptions.active_to IS NULL"
+                ") "
+                "SELECT EXISTS (SELECT 1 FROM changed) AS changed,"
+                " (SELECT subscriber_count FROM channel_stats"
+                " WHERE channel_id = :channel_id) AS subscriber_count"
+            ),
+            {"channel_id": channel_id, "user_id": user_id},
+        ).one()
+
+    @staticmethod
+    def get_active_strikes(db: Session, channel_id: int):
+        # Index-only range scan; localtimestamp comes back too, so callers can tell how long
+        # the count holds without comparing against the application's clock.
+        return db.execute(
+            select(
+                func.count(), func.min(ChannelStrike.expires_at), func.localtimestamp()
+            ).where(
+                ChannelStrike.channel_id == channel_id,
+                ChannelStrike.expires_at > func.localtimestamp(),
+            )
+        ).one()
+
+    @staticmethod
+    def get_first_paid_month(db: Session) -> date | None:
+        return db.scalar(
+            select(
+                cast(
+                    func.date_trunc("month", func.min(PaidSubscription.active_since)),
+                    Date,
+                )
+            )
+        )
+
+    @staticmethod
+    def rebuild_revenue_month(db: Session, month: date, next_month: date):
+        # Every subscription active at any point of the month pays that month's full price.
+        db.execute(
+            delete(ChannelRevenueMonthly).where(ChannelRevenueMonthly.month == month)
+        )
+        active = (
+            select(
+                PaidSubscription.sub_channel_id,
+                literal(month, Date),
+                PaidSubscription.tier,
+                func.count(),
+                func.sum(TIER_PRICE),
+            )
+            .where(
+                PaidSubscription.active_since < next_month,
+                or_(
+                    PaidSubscription.active_to.is_(None),
+                    PaidSubscription.active_to >= month,
+                ),
+            )
+            .group_by(PaidSubscription.sub_channel_id, PaidSubscription.tier)
+        )
+        db.execute(
+            insert(ChannelRevenueMonthly).from_select(
+                ["channel_id", "month", "tier", "subscribers", "revenue"], active
+            )
+        )
+
+    @staticmethod
+    def get_revenue(db: Session, channel_id: int, start: date, end: date):
+        return (
+            db.execute(
+                select(ChannelRevenueMonthly)
+                .where(
+                    ChannelRevenueMonthly.channel_id == channel_id,
+                    ChannelRevenueMonthly.month >= start,
+                    ChannelRevenueMonthly.month <= end,
+                )
+                .order_by(ChannelRevenueMonthly.month, ChannelRevenueMonthly.tier)
+            )
+            .scalars()
+            .all()
+        )
@@ -0,0 +1,106 @@
+from datetime import date
+
+from sqlalchemy import and_, select, text, true, tuple_, union
+from sqlalchemy.orm import Session
+from app.db.models import FeedInbox, FeedPulled, Subscription, Video
+
+
+class FeedRepository:
+    @staticmethod
+    def fan_out(db: Session, batch_size: int, max_subscribers: int):
+        # Claims the oldest outbox rows, skipping those another worker holds, copies each video
+        # into the inboxes of its channel's active subscribers and drops the rows, all in one
+        # statement. Videos of channels above max_subscribers go to feed_pulled instead and are
+        # merged at read time; the choice is kept per video.
+        return db.execute(
+            text(
+                "WITH claimed AS ("
+                " DELETE FROM feed_outbox WHERE id IN ("
+                "  SELECT id FROM feed_outbox ORDER BY id LIMIT :batch_size FOR UPDATE SKIP LOCKED"
+                " ) RETURNING video_id"
+                "), decided AS ("
+                " SELECT videos.id, videos.channel_id, videos.uploaded_at,"
+                " coalesce(channel_stats.subscriber_count, 0) <= :max_subscribers AS pushed"
+                " FROM claimed JOIN videos ON videos.id = claimed.video_id"
+                " LEFT JOIN channel_stats ON channel_stats.channel_id = videos.channel_id"
+                "), pulled AS ("
+                " INSERT INTO feed_pulled (channel_id, uploaded_at, video_id)"
+                " SELECT channel_id, uploaded_at, id FROM decided WHERE NOT pushed"
+                " ON CONFLICT DO NOTHING"
+                "), fanned AS ("
+                " INSERT INTO feed_inbox (user_id, uploaded_at, video_id)"
+                " SELECT subscription.user_id, decided.uploaded_at, decided.id FROM decided"
+                " JOIN subscription ON subscription.channel_id = decided.channel_id"
+                " AND subscription.is_active"
+                " WHERE decided.pushed"
+                " ON CONFLICT DO NOTHING"
+                " RETURNING 1"
+                ") "
+                "SELECT (SELECT count(*) FROM claimed) AS videos,"
+                " (SELECT count(*) FROM fanned) AS inserted"
+            ),
+            {"batch_size": batch_size, "max_subscribers": max_subscribers},
+        ).one()
+
+    @staticmethod
+    def get_feed(
+        db: Session,
+        user_id: int,
+        limit: int,
+        after: tuple[date, int] | None = None,
+    ):
+        # Newest first by (uploaded_at, id). Inbox rows are read backwards along the primary
+        # key; videos that were not fanned out come from feed_pulled, newest per followed
+        # channel. UNION drops a video found both ways.
+        inbox = (
+            select(FeedInbox.uploaded_at, FeedInbox.video_id)
+            .join(Video, and_(Video.id == FeedInbox.video_id, Video.is_active))
+            .join(
+                Subscription,
+                and_(
+                    Subscription.user_id == FeedInbox.user_id,
+                    Subscription.channel_id == Video.channel_id,
+                    Subscription.is_active,
+                ),
+            )
+            .where(FeedInbox.user_id == user_id)
+        )
+        recent = (
+            select(FeedPulled.uploaded_at, FeedPulled.video_id)
+            .join(Video, and_(Video.id == FeedPulled.video_id, Video.is_active))
+            .where(FeedPulled.channel_id == Subscription.channel_id)
+        )
+        if after is not None:
+            inbox = inbox.where(
+                tuple_(FeedInbox.uploaded_at, FeedInbox.video_id) < after
+            )
+            recent = recent.where(
+                tuple_(FeedPulled.uploaded_at, FeedPulled.video_id) < after
+            )
+        recent = (
+            recent.order_by(FeedPulled.uploaded_at.desc(), FeedPulled.video_id.desc())
+            .limit(limit)
+            .lateral("recent")
+        )
+        merged = (
+            select(recent.c.uploaded_at, recent.c.video_id)
+            .select_from(Subscription)
+            .join(recent, true())
+            .where(Subscription.user_id == user_id, Subscription.is_active)
+            .order_by(recent.c.uploaded_at.desc(), recent.c.video_id.desc())
+            .limit(limit)
+        )
+        inbox = inbox.order_by(
+            FeedInbox.uploaded_at.desc(), FeedInbox.video_id.desc()
+        ).limit(limit)
+        page = union(inbox, merged).subquery("page")
+        return (
+            db.execute(
+                select(Video)
+                .join(page, page.c.video_id == Video.id)
+                .order_by(page.c.uploaded_at.desc(), page.c.video_id.desc())
+                .limit(limit)
+            )
+            .scalars()
+            .all()
+        )
@@ -0,0 +1,26 @@
+from datetime import date
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.db.models import JobWatermark
+
+
+class JobRepository:
+    @staticmethod
+    def try_lock(db: Session, name: str) -> bool:
+        # Held until the end of the transaction, so one worker runs a job at a time.
+        return db.scalar(select(func.pg_try_advisory_xact_lock(func.hashtext(name))))
+
+    @staticmethod
+    def get_watermark(db: Session, name: str) -> date | None:
+        return db.scalar(select(JobWatermark.value).where(JobWatermark.name == name))
+
+    @staticmethod
+    def set_watermark(db: Session, name: str, value: date):
+        stmt = insert(JobWatermark).values(name=name, value=value)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[JobWatermark.name], set_={"value": stmt.excluded.value}
+            )
+        )
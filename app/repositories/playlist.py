@@ -1,6 +1,22 @@
-from sqlalchemy import select
+from sqlalchemy import (
+    Integer,
+    any_,
+    bindparam,
+    delete,
+    func,
+    null,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session
-from app.db.models import User, Playlist
+from app.db.models import User, Playlist, PlaylistVideo, Video
+
+# Distance between neighbouring positions; a move takes the midpoint of its new neighbours.
+POSITION_GAP = 1024
+
 
 class PlaylistRepository:
     @staticmethod
@@ -16,14 +32,47 @@ class PlaylistRepository:
         return playlist
 
     @staticmethod
-    def get_all_by_user(db: Session, user_id: int):
-        return db.execute(select(Playlist).where(Playlist.author_id == user_id)).scalars().all()
+    def get_all_by_user(db: Session, user_id: int, preview: int):
+        # Every playlist with its size and first entries in one round trip: one lateral
+        # count and one lateral top-N per playlist, both off the playlist_video indexes.
+        return db.execute(
+            text(
+                "SELECT playlists.id, playlists.name, playlists.created_at, playlists.author_id,"
+                " counted.video_count, coalesce(previews.videos, CAST('[]' AS json)) AS videos "
+                "FROM playlists "
+                "CROSS JOIN LATERAL ("
+                " SELECT count(*) AS video_count FROM playlist_video"
+                " WHERE playlist_video.playlist_id = playlists.id"
+                ") counted "
+                "CROSS JOIN LATERAL ("
+                " SELECT json_agg(json_build_object("
+                "  'id', head.id, 'title', head.title, 'channel_id', head.channel_id"
+                " ) ORDER BY head.position, head.id) AS videos"
+                " FROM ("
+                "  SELECT videos.id, videos.title, videos.channel_id, playlist_video.position"
+                "  FROM playlist_video JOIN videos ON videos.id = playlist_video.video_id"
+                "  WHERE playlist_video.playlist_id = playlists.id"
+                "  ORDER BY playlist_video.position, playlist_video.video_id"
+                "  LIMIT :preview"
+                " ) head"
+                ") previews "
+                "WHERE playlists.author_id = :user_id "
+                "ORDER BY playlists.id"
+            ),
+            {"user_id": user_id, "preview": preview},
+        ).all()
 
     @staticmethod
-    def get_by_id(db: Session, playlist_id: int, author_id: int):
-        return db.execute(
-            select(Playlist).where(Playlist.id == playlist_id, Playlist.author_id == author_id)
-        ).scalar_one_or_none()
+    def get_by_id(
+        db: Session, playlist_id: int, author_id: int, for_update: bool = False
+    ):
+        query = select(Playlist).where(
+            Playlist.id == playlist_id, Playlist.author_id == author_id
+        )
+        if for_update:
+            # Serializes edits of one playlist, so appends never compute the same positions.
+            query = query.with_for_update()
+        return db.execute(query).scalar_one_or_none()
 
     @staticmethod
     def update(db: Session, playlist, name: str):
@@ -35,4 +84,148 @@ class PlaylistRepository:
     @staticmethod
     def delete(db: Session, playlist):
         db.delete(playlist)
-        db.commit()
\ No newline at end of file
+        db.commit()
+
+    @staticmethod
+    def duplicate(db: Session, playlist, name: str):
+        # The copy and its entries in one INSERT ... SELECT; no rows pass through the app.
+        return db.execute(
+            text(
+                "WITH created AS ("
+                " INSERT INTO playlists (name, author_id) VALUES (:name, :author_id)"
+                " RETURNING id, name, created_at, author_id"
+                "), copied AS ("
+                " INSERT INTO playlist_video (playlist_id, video_id, position)"
+                " SELECT created.id, playlist_video.video_id, playlist_video.position"
+                " FROM created, playlist_video WHERE playlist_video.playlist_id = :playlist_id"
+                ") "
+                "SELECT * FROM created"
+            ),
+            {"name": name, "author_id": playlist.author_id, "playlist_id": playlist.id},
+        ).one()
+
+    @staticmethod
+    def get_videos(
+        db: Session,
+        playlist_id: int,
+        limit: int,
+        after_position: int | None = None,
+        after_id: int | None = None,
+    ):
+        # Positions are not unique within a playlist, so the cursor carries the video id too.
+        query = (
+            select(PlaylistVideo.position, Video)
+            .join(Video, Video.id == PlaylistVideo.video_id)
+            .where(PlaylistVideo.playlist_id == playlist_id)
+        )
+        if after_position is not None:
+            query = query.where(
+                tuple_(PlaylistVideo.position, PlaylistVideo.video_id)
+                > tuple_(after_position, after_id)
+            )
+        return db.execute(
+            query.order_by(PlaylistVideo.position, PlaylistVideo.video_id).limit(limit)
+        ).all()
+
+    @staticmethod
+    def add_videos(db: Session, playlist_id: int, video_ids: list[int]) -> list[int]:
+        # Appends in request order after the current last entry; videos already in the
+        # playlist, unknown or inactive ones are skipped.
+        return (
+            db.execute(
+                text(
+                    "INSERT INTO playlist_video (playlist_id, video_id, position) "
+                    "SELECT :playlist_id, videos.id, last.position + requested.n * :gap "
+                    "FROM unnest(CAST(:video_ids AS integer[])) "
+                    "WITH ORDINALITY AS requested(video_id, n) "
+                    "JOIN videos ON videos.id = requested.video_id AND videos.is_active "
+                    "CROSS JOIN ("
+                    " SELECT coalesce(max(position), 0) AS position FROM playlist_video"
+                    " WHERE playlist_id = :playlist_id"
+                    ") last "
+                    "ORDER BY requested.n "
+                    "ON CONFLICT (playlist_id, video_id) DO NOTHING "
+                    "RETURNING video_id"
+                ),
+                {
+                    "playlist_id": playlist_id,
+                    "video_ids": video_ids,
+                    "gap": POSITION_GAP,
+                },
+            )
+            .scalars()
+            .all()
+        )
+
+    @staticmethod
+    def remove_videos(db: Session, playlist_id: int, video_ids: list[int]) -> list[int]:
+        ids_param = bindparam("video_ids", video_ids, type_=ARRAY(Integer))
+        return (
+            db.execute(
+                delete(PlaylistVideo)
+                .where(
+                    PlaylistVideo.playlist_id == playlist_id,
+                    PlaylistVideo.video_id == any_(ids_param),
+                )
+                .returning(PlaylistVideo.video_id)
+            )
+            .scalars()
+            .all()
+        )
+
+    @staticmethod
+    def get_move_bounds(
+        db: Session, playlist_id: int, video_id: int, after_video_id: int | None
+    ):
+        # Positions of the moved entry and of the two it goes between. A null current means
+        # the video is not in the playlist; a null previous despite an after_video_id, that the
+        # anchor is not.
+        in_playlist = PlaylistVideo.playlist_id == playlist_id
+
+        def position_of(entry_id: int):
+            return (
+                select(PlaylistVideo.position)
+                .where(in_playlist, PlaylistVideo.video_id == entry_id)
+                .scalar_subquery()
+            )
+
+        previous = position_of(after_video_id) if after_video_id is not None else null()
+        following = select(func.min(PlaylistVideo.position)).where(
+            in_playlist, PlaylistVideo.video_id != video_id
+        )
+        if after_video_id is not None:
+            following = following.where(PlaylistVideo.position > previous)
+        return db.execute(
+            select(
+                position_of(video_id).label("current"),
+                previous.label("previous"),
+                following.scalar_subquery().label("following"),
+            )
+        ).one()
+
+    @staticmethod
+    def set_position(db: Session, playlist_id: int, video_id: int, position: int):
+        db.execute(
+            update(PlaylistVideo)
+            .where(
+                PlaylistVideo.playlist_id == playlist_id,
+                PlaylistVideo.video_id == video_id,
+            )
+            .values(position=position)
+        )
+
+    @staticmethod
+    def renumber(db: Session, playlist_id: int):
+        # Only when two neighbours have no free position left between them.
+        db.execute(
+            text(
+                "UPDATE playlist_video SET position = numbered.n * :gap "
+                "FROM ("
+                " SELECT video_id, row_number() OVER (ORDER BY position, video_id) AS n"
+                " FROM playlist_video WHERE playlist_id = :playlist_id"
+                ") numbered "
+                "WHERE playlist_video.playlist_id = :playlist_id"
+                " AND playlist_video.video_id = numbered.video_id"
+            ),
+            {"playlist_id": playlist_id, "gap": POSITION_GAP},
+        )
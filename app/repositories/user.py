@@ -1,11 +1,50 @@
-from sqlalchemy import select, func, extract, desc
-from sqlalchemy.orm import Session
-from app.db.models import User, View, Video, Channel, Comment, Subscription, Report
+import io
+from datetime import date
+
+from sqlalchemy import (
+    column,
+    delete,
+    desc,
+    func,
+    literal,
+    literal_column,
+    select,
+    table,
+    text,
+    true,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.orm import Session, aliased, load_only
+from app.db.models import (
+    User,
+    View,
+    Video,
+    Channel,
+    Comment,
+    Subscription,
+    Report,
+    UserRecommendation,
+)
+
+
+def _year_range(field, year: int):
+    # A plain range instead of extract(year ...) so indexes and partition pruning apply.
+    return field >= date(year, 1, 1), field < date(year + 1, 1, 1)
+
+
+video_view_totals = table(
+    "video_view_totals", column("video_id"), column("total_view_count")
+)
+
 
 class UserRepository:
     @staticmethod
-    def get_all_active(db: Session):
-        return db.execute(select(User).where(User.is_deleted == False)).scalars().all()
+    def get_all_active(db: Session, fields: list[str] | None = None):
+        query = select(User).where(User.is_deleted == False)
+        if fields:
+            query = query.options(load_only(*(getattr(User, name) for name in fields)))
+        return db.execute(query).scalars().all()
 
     @staticmethod
     def get_by_id(db: Session, user_id: int, for_update: bool = False):
@@ -14,6 +53,10 @@ class UserRepository:
             query = query.with_for_update()
         return db.execute(query).scalar_one_or_none()
 
+    @staticmethod
+    def get_by_ids(db: Session, user_ids: list[int]):
+        return db.execute(select(User).where(User.id.in_(user_ids))).scalars().all()
+
     @staticmethod
     def exists_by_username(db: Session, username: str, exclude_id: int = None):
         query = select(User).where(User.username == username)
@@ -31,35 +74,165 @@ class UserRepository:
     @staticmethod
     def get_recommendations(db: Session, user_id: int, limit: int):
         user_channel_views = (
-            select(Video.channel_id, func.count(View.user_id).label('channel_view_count'))
+            select(
+                Video.channel_id, func.count(View.user_id).label("channel_view_count")
+            )
             .join(Video, View.video_id == Video.id)
             .where(View.user_id == user_id)
-            .group_by(Video.channel_id).subquery()
+            .group_by(Video.channel_id)
+            .subquery()
+        )
+        subscriptions = (
+            select(Subscription.channel_id)
+            .where(Subscription.user_id == user_id)
+            .subquery()
+        )
+        total_views = (
+            select(View.video_id, func.count(View.user_id).label("total_view_count"))
+            .group_by(View.video_id)
+            .subquery()
         )
-        subscriptions = select(Subscription.channel_id).where(Subscription.user_id == user_id).subquery()
-        total_views = select(View.video_id, func.count(View.user_id).label('total_view_count')).group_by(View.video_id).subquery()
 
         query = (
             select(Video)
-            .outerjoin(user_channel_views, Video.channel_id == user_channel_views.c.channel_id)
+            .outerjoin(
+                user_channel_views, Video.channel_id == user_channel_views.c.channel_id
+            )
             .outerjoin(total_views, Video.id == total_views.c.video_id)
             .outerjoin(subscriptions, Video.channel_id == subscriptions.c.channel_id)
             .order_by(
                 desc(func.coalesce(user_channel_views.c.channel_view_count, 0)),
                 desc(subscriptions.c.channel_id.isnot(None)),
-                desc(func.coalesce(total_views.c.total_view_count, 0))
-            ).limit(limit)
+                desc(func.coalesce(total_views.c.total_view_count, 0)),
+            )
+            .limit(limit)
         )
         return db.execute(query).scalars().all()
 
     @staticmethod
-    def get_yearly_view_count(db: Session, user_id: int, year: int):
+    def get_precomputed_recommendations(db: Session, user_id: int, limit: int):
+        return (
+            db.execute(
+                select(Video)
+                .join(UserRecommendation, UserRecommendation.video_id == Video.id)
+                .where(UserRecommendation.user_id == user_id)
+                .order_by(UserRecommendation.rank)
+                .limit(limit)
+            )
+            .scalars()
+            .all()
+        )
+
+    @staticmethod
+    def snapshot_video_view_totals(db: Session):
+        # Session-local copy of per-video view counts, so bulk ranking scans views once per worker.
+        db.execute(text("DROP TABLE IF EXISTS video_view_totals"))
+        db.execute(
+            text(
+                "CREATE TEMP TABLE video_view_totals AS "
+                "SELECT video_id, count(*) AS total_view_count FROM views GROUP BY video_id"
+            )
+        )
+        db.execute(text("ALTER TABLE video_view_totals ADD PRIMARY KEY (video_id)"))
+        db.execute(text("ANALYZE video_view_totals"))
+
+    @staticmethod
+    def compute_recommendations_bulk(db: Session, user_ids: list[int], top_n: int):
+        # Same ordering as get_recommendations, for a whole batch of users. Only videos from
+        # watched/subscribed channels plus the global top-N can rank, so only those are scored.
+        # Needs snapshot_video_view_totals() on the same connection.
+        batch_users = (
+            select(User.id.label("user_id"))
+            .where(User.id.in_(user_ids))
+            .cte("batch_users")
+        )
+        affinity = union_all(
+            select(
+                View.user_id,
+                Video.channel_id,
+                func.count(View.video_id).label("view_count"),
+                literal(False).label("subscribed"),
+            )
+            .join(Video, View.video_id == Video.id)
+            .where(View.user_id.in_(user_ids))
+            .group_by(View.user_id, Video.channel_id),
+            select(
+                Subscription.user_id, Subscription.channel_id, literal(0), literal(True)
+            ).where(Subscription.user_id.in_(user_ids)),
+        ).subquery("affinity")
+        popular = (
+            select(Video.id.label("video_id"))
+            .outerjoin(video_view_totals, video_view_totals.c.video_id == Video.id)
+            .order_by(
+                desc(func.coalesce(video_view_totals.c.total_view_count, 0)), Video.id
+            )
+            .limit(top_n)
+            .subquery("popular")
+        )
+        candidates = union_all(
+            select(
+                affinity.c.user_id,
+                Video.id.label("video_id"),
+                affinity.c.view_count,
+                affinity.c.subscribed,
+            ).join(Video, Video.channel_id == affinity.c.channel_id),
+            select(
+                batch_users.c.user_id, popular.c.video_id, literal(0), literal(False)
+            ).select_from(batch_users.join(popular, true())),
+        ).subquery("candidates")
+
+        rank = func.row_number().over(
+            partition_by=candidates.c.user_id,
+            order_by=(
+                desc(func.max(candidates.c.view_count)),
+                desc(func.bool_or(candidates.c.subscribed)),
+                desc(func.coalesce(video_view_totals.c.total_view_count, 0)),
+                candidates.c.video_id,
+            ),
+        )
+        ranked = (
+            select(candidates.c.user_id, candidates.c.video_id, rank.label("rank"))
+            .outerjoin(
+                video_view_totals, video_view_totals.c.video_id == candidates.c.video_id
+            )
+            .group_by(
+                candidates.c.user_id,
+                candidates.c.video_id,
+                video_view_totals.c.total_view_count,
+            )
+            .subquery("ranked")
+        )
         return db.execute(
-            select(func.count(View.video_id)).where(
-                View.user_id == user_id,
-                extract('year', View.watched_at) == year
+            select(ranked.c.user_id, ranked.c.rank, ranked.c.video_id)
+            .where(ranked.c.rank <= top_n)
+            .order_by(ranked.c.user_id, ranked.c.rank)
+        ).all()
+
+    @staticmethod
+    def replace_precomputed_recommendations(db: Session, user_ids: list[int], rows):
+        db.execute(
+            delete(UserRecommendation).where(UserRecommendation.user_id.in_(user_ids))
+        )
+        buffer = io.StringIO(
+            "".join(
+                f"{user_id}\t{rank}\t{video_id}\n" for user_id, rank, video_id in rows
             )
-        ).scalar() or 0
+        )
+        with db.connection().connection.cursor() as cursor:
+            cursor.copy_expert(
+                "COPY user_recommendations (user_id, rank, video_id) FROM STDIN", buffer
+            )
+
+    @staticmethod
+    def get_yearly_view_count(db: Session, user_id: int, year: int):
+        return (
+            db.execute(
+                select(func.count(View.video_id)).where(
+                    View.user_id == user_id, *_year_range(View.watched_at, year)
+                )
+            ).scalar()
+            or 0
+        )
 
     @staticmethod
     def get_favorite_creator(db: Session, user_id: int, year: int):
@@ -67,8 +240,10 @@ class UserRepository:
             select(Channel.name, func.count(View.video_id).label("view_count"))
             .join(Video, View.video_id == Video.id)
             .join(Channel, Video.channel_id == Channel.id)
-            .where(View.user_id == user_id, extract('year', View.watched_at) == year)
-            .group_by(Channel.id).order_by(desc("view_count")).limit(1)
+            .where(View.user_id == user_id, *_year_range(View.watched_at, year))
+            .group_by(Channel.id)
+            .order_by(desc("view_count"))
+            .limit(1)
         ).first()
 
     @staticmethod
@@ -79,30 +254,94 @@ class UserRepository:
 
     @staticmethod
     def get_yearly_reaction_counts(db: Session, user_id: int, year: int):
-        comm_count = db.execute(
-            select(func.count(Comment.id)).where(
-                Comment.user_id == user_id, 
-                extract('year', Comment.commented_at) == year
-            )
-        ).scalar() or 0
-        
-        react_count = db.execute(
-            select(func.count(View.video_id)).where(
+        comm_count = (
+            db.execute(
+                select(func.count(Comment.id)).where(
+                    Comment.user_id == user_id, *_year_range(Comment.commented_at, year)
+                )
+            ).scalar()
+            or 0
+        )
+
+        react_count = (
+            db.execute(
+                select(func.count(View.video_id)).where(
+                    View.user_id == user_id,
+                    *_year_range(View.watched_at, year),
+                    View.reaction.isnot(None),
+                )
+            ).scalar()
+            or 0
+        )
+        return comm_count, react_count
+
+    @staticmethod
+    def get_history(
+        db: Session, user_id: int, limit: int, after: tuple[date, int] | None = None
+    ):
+        query = (
+            select(
+                View.video_id,
+                Video.title,
+                Video.channel_id,
+                View.watched_at,
+                View.watched_percentage,
+            )
+            .join(Video, Video.id == View.video_id)
+            .where(View.user_id == user_id, Video.is_active)
+        )
+        if after is not None:
+            query = query.where(tuple_(View.watched_at, View.video_id) < after)
+        return db.execute(
+            query.order_by(View.watched_at.desc(), View.video_id.desc()).limit(limit)
+        ).all()
+
+    @staticmethod
+    def get_continue_watching(db: Session, user_id: int, limit: int):
+        # Started but unfinished, and no later view of the same video. The threshold is a
+        # literal so the planner matches it against the partial index predicate.
+        later = aliased(View)
+        rewatched = (
+            select(later.video_id)
+            .where(
+                later.user_id == View.user_id,
+                later.video_id == View.video_id,
+                later.watched_at > View.watched_at,
+            )
+            .exists()
+        )
+        return db.execute(
+            select(
+                View.video_id,
+                Video.title,
+                Video.channel_id,
+                View.watched_at,
+                View.watched_percentage,
+            )
+            .join(Video, Video.id == View.video_id)
+            .where(
                 View.user_id == user_id,
-                extract('year', View.watched_at) == year,
-                View.reaction.isnot(None)
+                View.watched_percentage < literal_column("0.95"),
+                View.watched_percentage > 0,
+                ~rewatched,
+                Video.is_active,
             )
-        ).scalar() or 0
-        return comm_count, react_count
+            .order_by(View.watched_at.desc())
+            .limit(limit)
+        ).all()
 
     @staticmethod
     def get_credibility_data(db: Session, user_id: int):
         return db.execute(
             select(
-                User.id, User.username,
+                User.id,
+                User.username,
                 func.count(Report.id).label("total_reports"),
-                func.count(Report.id).filter(Report.is_resolved == True).label("approved_reports")
+                func.count(Report.id)
+                .filter(Report.is_resolved == True)
+                .label("approved_reports"),
             )
             .outerjoin(Report, Report.reporter_id == User.id)
-            .where(User.id == user_id).group_by(User.id, User.username)
-        ).one_or_none()
\ No newline at end of file
+            .where(User.id == user_id)
+            .group_by(User.id, User.username)
+        ).one_or_none()
@@ -1,15 +1,82 @@
-from sqlalchemy import select, func
-from sqlalchemy.orm import Session
-from app.db.models import Video, View, Comment, User
+from datetime import date, timedelta
+
+from sqlalchemy import Float, Integer, any_, bindparam, cast, select, func, text, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, load_only
+from app.db.models import Video, View, Comment, User, Channel, VideoTrendingScore
+
 
 class VideoRepository:
     @staticmethod
-    def get_by_id(db: Session, video_id: int, for_update: bool = False):
+    def get_by_id(
+        db: Session,
+        video_id: int,
+        for_update: bool = False,
+        fields: list[str] | None = None,
+    ):
         query = select(Video).where(Video.id == video_id)
+        if fields:
+            query = query.options(load_only(*(getattr(Video, name) for name in fields)))
         if for_update:
             query = query.with_for_update()
         return db.execute(query).scalar_one_or_none()
 
+    @staticmethod
+    def get_with_channel(db: Session, video_id: int):
+        return db.execute(
+            select(Video, Channel.name)
+            .join(Channel, Video.channel_id == Channel.id)
+            .where(Video.id == video_id)
+        ).one_or_none()
+
+    @staticmethod
+    def get_by_ids(db: Session, video_ids: list[int], fields: list[str] | None = None):
+        ids_param = bindparam("ids", video_ids, type_=ARRAY(Integer))
+        query = select(Video).where(Video.id == any_(ids_param))
+        if fields:
+            query = query.options(load_only(*(getattr(Video, name) for name in fields)))
+        return db.execute(query).scalars().all()
+
+    @staticmethod
+    def get_active_by_ids(db: Session, video_ids: list[int]):
+        return (
+            db.execute(select(Video).where(Video.id.in_(video_ids), Video.is_active))
+            .scalars()
+            .all()
+        )
+
+    @staticmethod
+    def search(
+        db: Session,
+        query: str,
+        limit: int,
+        after_rank: float | None = None,
+        after_id: int | None = None,
+    ):
+        ts_query = func.websearch_to_tsquery("english", query)
+        # ts_rank_cd returns real; ranking, the returned cursor and the comparison all use
+        # double precision so a cursor that round-trips through JSON matches its own row.
+        rank = cast(func.ts_rank_cd(Video.search_vector, ts_query), Float(53))
+        stmt = select(Video, rank.label("rank")).where(
+            Video.is_active, Video.search_vector.bool_op("@@")(ts_query)
+        )
+        if after_rank is not None:
+            stmt = stmt.where(
+                tuple_(rank, Video.id) < tuple_(cast(after_rank, Float(53)), after_id)
+            )
+        return db.execute(
+            stmt.order_by(rank.desc(), Video.id.desc()).limit(limit)
+        ).all()
+
+    @staticmethod
+    def get_active_texts(db: Session):
+        return db.execute(
+            select(Video.id, Video.title, Video.description)
+            .where(Video.is_active)
+            .execution_options(yield_per=10000)
+        )
+
     @staticmethod
     def create(db: Session, video: Video):
         db.add(video)
@@ -26,38 +93,168 @@ class VideoRepository:
     def get_stats(db: Session, video_id: int):
         stats_row = db.execute(
             select(
-                func.count(View.user_id).label("total_views"),
-                func.count(View.user_id).filter(View.reaction == "Liked").label("likes"),
-                func.count(View.user_id).filter(View.reaction == "Disliked").label("dislikes")
+                func.count().label("total_views"),
+                func.count().filter(View.reaction == "Liked").label("likes"),
+                func.count().filter(View.reaction == "Disliked").label("dislikes"),
             )
             .select_from(View)
             .where(View.video_id == video_id)
         ).one()
-        total_comments = db.scalar(
-            select(func.count(Comment.id)).where(Comment.video_id == video_id)
-        ) or 0
+        total_comments = (
+            db.scalar(
+                select(func.count())
+                .select_from(Comment)
+                .where(Comment.video_id == video_id)
+            )
+            or 0
+        )
 
         return (*stats_row, total_comments)
 
+    @staticmethod
+    def get_stats_by_ids(db: Session, video_ids: list[int]):
+        # Views and comments are aggregated separately so neither multiplies the other's rows.
+        ids_param = bindparam("ids", video_ids, type_=ARRAY(Integer))
+        views = (
+            select(
+                View.video_id,
+                func.count().label("total_views"),
+                func.count().filter(View.reaction == "Liked").label("likes"),
+                func.count().filter(View.reaction == "Disliked").label("dislikes"),
+            )
+            .where(View.video_id == any_(ids_param))
+            .group_by(View.video_id)
+            .subquery()
+        )
+        comments = (
+            select(Comment.video_id, func.count().label("total_comments"))
+            .where(Comment.video_id == any_(ids_param))
+            .group_by(Comment.video_id)
+            .subquery()
+        )
+        return db.execute(
+            select(
+                Video.id,
+                Video.title,
+                func.coalesce(views.c.total_views, 0),
+                func.coalesce(views.c.likes, 0),
+                func.coalesce(views.c.dislikes, 0),
+                func.coalesce(comments.c.total_comments, 0),
+            )
+            .outerjoin(views, views.c.video_id == Video.id)
+            .outerjoin(comments, comments.c.video_id == Video.id)
+            .where(Video.id == any_(ids_param))
+        ).all()
+
+    @staticmethod
+    def set_reaction(db: Session, video_id: int, user_id: int, reaction: str):
+        # The reaction goes on the user's latest view of the video and older rows drop theirs;
+        # a reaction never creates a view. Counts come from the statement snapshot, without
+        # this user's reactions.
+        return db.execute(
+            text(
+                "WITH target AS ("
+                " SELECT views.watched_at FROM views"
+                " JOIN videos ON videos.id = views.video_id AND videos.is_active"
+                " JOIN users ON users.id = views.user_id AND NOT users.is_deleted"
+                " WHERE views.user_id = :user_id AND views.video_id = :video_id"
+                " ORDER BY views.watched_at DESC LIMIT 1"
+                "), updated AS ("
+                " UPDATE views SET reaction = CASE WHEN views.watched_at = target.watched_at"
+                " THEN :reaction END FROM target"
+                " WHERE views.user_id = :user_id AND views.video_id = :video_id"
+                " AND (views.watched_at = target.watched_at OR views.reaction IS NOT NULL)"
+                ") "
+                "SELECT EXISTS (SELECT 1 FROM videos WHERE id = :video_id AND is_active)"
+                " AND EXISTS (SELECT 1 FROM users WHERE id = :user_id AND NOT is_deleted) AS found,"
+                " EXISTS (SELECT 1 FROM target) AS viewed,"
+                " count(*) FILTER (WHERE reaction = 'Liked' AND user_id <> :user_id) AS likes,"
+                " count(*) FILTER (WHERE reaction = 'Disliked' AND user_id <> :user_id) AS dislikes "
+                "FROM views WHERE video_id = :video_id"
+            ),
+            {"video_id": video_id, "user_id": user_id, "reaction": reaction},
+        ).one()
+
+    @staticmethod
+    def clear_reaction(db: Session, video_id: int, user_id: int):
+        # Same shape as set_reaction, so both answer in one round trip.
+        return db.execute(
+            text(
+                "WITH cleared AS ("
+                " UPDATE views SET reaction = NULL"
+                " WHERE user_id = :user_id AND video_id = :video_id AND reaction IS NOT NULL"
+                ") "
+                "SELECT EXISTS (SELECT 1 FROM videos WHERE id = :video_id AND is_active) AS found,"
+                " count(*) FILTER (WHERE reaction = 'Liked' AND user_id <> :user_id) AS likes,"
+                " count(*) FILTER (WHERE reaction = 'Disliked' AND user_id <> :user_id) AS dislikes "
+                "FROM views WHERE video_id = :video_id"
+            ),
+            {"video_id": video_id, "user_id": user_id},
+        ).one()
+
     @staticmethod
     def get_comments(db: Session, video_id: int, skip: int, limit: int):
-        total_count = db.scalar(
-            select(func.count(Comment.id)).where(Comment.video_id == video_id)
-        ) or 0
+        total_count = (
+            db.scalar(
+                select(func.count())
+                .select_from(Comment)
+                .where(Comment.video_id == video_id)
+            )
+            or 0
+        )
         comments = db.execute(
             select(Comment, User.username)
             .join(User, Comment.user_id == User.id)
             .where(Comment.video_id == video_id)
-            .order_by(Comment.commented_at.desc())
+            .order_by(Comment.commented_at.desc(), Comment.id.desc())
             .offset(skip)
             .limit(limit)
         ).all()
         return total_count, comments
 
+    @staticmethod
+    def create_comments(db: Session, video_id: int, comments: list[dict]):
+        # One INSERT ... RETURNING per insertmanyvalues batch, rows in parameter order.
+        return db.scalars(
+            insert(Comment).returning(Comment, sort_by_parameter_order=True),
+            [{**comment, "video_id": video_id} for comment in comments],
+        ).all()
+
     @staticmethod
     def create_with_comment(db: Session, video: Video, comment: Comment):
         db.add(video)
         db.flush()
         db.add(comment)
         db.commit()
-        return video, comment
\ No newline at end of file
+        return video, comment
+
+    @staticmethod
+    def add_trending_views(db: Session, day: date, day_offset: float):
+        # Folds one day of views into the log-space scores: score = ln(exp(score) + count * e^offset).
+        daily = (
+            select(View.video_id, (func.ln(func.count()) + day_offset).label("score"))
+            .where(View.watched_at >= day, View.watched_at < day + timedelta(days=1))
+            .group_by(View.video_id)
+        )
+        stmt = insert(VideoTrendingScore).from_select(["video_id", "score"], daily)
+        current, added = VideoTrendingScore.score, stmt.excluded.score
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[VideoTrendingScore.video_id],
+                set_={
+                    "score": func.greatest(current, added)
+                    + func.ln(1 + func.exp(-func.abs(current - added))),
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+    @staticmethod
+    def get_trending(db: Session, limit: int):
+        return db.execute(
+            select(Video, VideoTrendingScore.score)
+            .join(VideoTrendingScore, VideoTrendingScore.video_id == Video.id)
+            .where(Video.is_active)
+            .order_by(VideoTrendingScore.score.desc())
+            .limit(limit)
+        ).all()
@@ -0,0 +1,137 @@
+import io
+from datetime import date
+
+from sqlalchemy import func, select, table, column, text
+from sqlalchemy.orm import Session
+
+views_default = table("views_default", column("watched_at"))
+
+COPY_NULL = "\\N"
+
+
+class ViewRepository:
+    @staticmethod
+    def get_partition_names(db: Session) -> list[str]:
+        return (
+            db.execute(
+                text(
+                    "SELECT child.relname FROM pg_inherits "
+                    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                    "WHERE pg_inherits.inhparent = 'views'::regclass "
+                    "ORDER BY child.relname"
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+    @staticmethod
+    def get_default_partition_min_date(db: Session) -> date | None:
+        return db.scalar(select(func.min(views_default.c.watched_at)))
+
+    @staticmethod
+    def create_partition(db: Session, name: str, start: date, end: date):
+        # Built detached and then attached, so rows that already landed in the default
+        # partition for this range can be moved over first.
+        db.execute(
+            text(
+                f"CREATE TABLE {name} (LIKE views INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+        )
+        db.execute(
+            text(
+                f"WITH moved AS (DELETE FROM views_default "
+                f"WHERE watched_at >= :start AND watched_at < :end RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            ),
+            {"start": start, "end": end},
+        )
+        db.execute(
+            text(
+                f"ALTER TABLE views ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+        )
+
+    @staticmethod
+    def detach_partition(db: Session, name: str):
+        # The detached table is kept as an archive; dropping it is left to the operator.
+        db.execute(text(f"ALTER TABLE views DETACH PARTITION {name}"))
+
+    @staticmethod
+    def upsert_events(db: Session, events, synchronous_commit: bool = True) -> int:
+        # events: (seq, user_id, video_id, watched_at, watched_percentage, reaction) tuples.
+        if not synchronous_commit:
+            db.execute(text("SET LOCAL synchronous_commit = off"))
+        db.execute(
+            text(
+                "CREATE TEMP TABLE IF NOT EXISTS view_events_staging ("
+                "seq bigint, user_id integer, video_id integer, watched_at date, "
+                "watched_percentage double precision, reaction text) ON COMMIT DELETE ROWS"
+            )
+        )
+        buffer = io.StringIO(
+            "".join(
+                f"{seq}\t{user_id}\t{video_id}\t{watched_at.isoformat()}\t{percentage!r}\t{reaction or COPY_NULL}\n"
+                for seq, user_id, video_id, watched_at, percentage, reaction in events
+            )
+        )
+        with db.connection().connection.cursor() as cursor:
+            cursor.copy_expert(
+                "COPY view_events_staging (seq, user_id, video_id, watched_at, "
+                "watched_percentage, reaction) FROM STDIN",
+                buffer,
+            )
+        # Row counts for the planner: small batches join by primary key, big ones hash.
+        db.execute(text("ANALYZE view_events_staging"))
+        # One row per key per statement: progress keeps its maximum, reaction its latest value.
+        # Events for unknown/inactive videos or deleted users are dropped here. A reaction
+        # moves to its event's row, so older rows of the pair drop theirs, as in set_reaction.
+        return db.execute(
+            text(
+                "WITH reacted AS ("
+                " SELECT user_id, video_id, max(watched_at) AS watched_at FROM view_events_staging"
+                " WHERE reaction IS NOT NULL GROUP BY user_id, video_id"
+                "), cleared AS ("
+                " UPDATE views SET reaction = NULL FROM reacted"
+                " WHERE views.user_id = reacted.user_id AND views.video_id = reacted.video_id"
+                " AND views.watched_at < reacted.watched_at AND views.reaction IS NOT NULL"
+                ") "
+                "INSERT INTO views (user_id, video_id, watched_at, watched_percentage, reaction) "
+                "SELECT s.user_id, s.video_id, s.watched_at, max(s.watched_percentage), "
+                "(array_agg(s.reaction ORDER BY s.seq DESC) FILTER (WHERE s.reaction IS NOT NULL))[1] "
+                "FROM view_events_staging s "
+                "JOIN users ON users.id = s.user_id AND NOT users.is_deleted "
+                "JOIN videos ON videos.id = s.video_id AND videos.is_active "
+                "GROUP BY s.user_id, s.video_id, s.watched_at "
+                "ON CONFLICT (user_id, video_id, watched_at) DO UPDATE SET "
+                "watched_percentage = greatest(views.watched_percentage, excluded.watched_percentage), "
+                "reaction = coalesce(excluded.reaction, views.reaction)"
+            )
+        ).rowcount
+
+    @staticmethod
+    def upsert_progress(db: Session, progress) -> int:
+        # progress: (user_id, video_id, watched_at, watched_percentage) tuples, one per key.
+        user_ids, video_ids, watched_ats, percentages = (
+            list(column) for column in zip(*progress)
+        )
+        return db.execute(
+            text(
+                "INSERT INTO views (user_id, video_id, watched_at, watched_percentage) "
+                "SELECT p.user_id, p.video_id, p.watched_at, p.watched_percentage "
+                "FROM unnest(CAST(:user_ids AS integer[]), CAST(:video_ids AS integer[]), "
+                "CAST(:watched_ats AS date[]), CAST(:percentages AS double precision[])) "
+                "AS p(user_id, video_id, watched_at, watched_percentage) "
+                "JOIN users ON users.id = p.user_id AND NOT users.is_deleted "
+                "JOIN videos ON videos.id = p.video_id AND videos.is_active "
+                "ON CONFLICT (user_id, video_id, watched_at) DO UPDATE SET "
+                "watched_percentage = excluded.watched_percentage"
+            ),
+            {
+                "user_ids": user_ids,
+                "video_ids": video_ids,
+                "watched_ats": watched_ats,
+                "percentages": percentages,
+            },
+        ).rowcount
@@ -1,17 +1,26 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from app.db.session import DBDep
 from app.dependencies import require_admin
 from app.services.admin import AdminService
+from app.utils.fields import FIELDS_QUERY
 from app.schemas.schemas import (
+    AdminUserBatchResponse,
+    BulkModerationRequest,
+    BulkModerationResponse,
     ChannelAnalyticsListResponse,
+    ChannelSearchListResponse,
     ChannelStrikeResponse,
     DetailedReportsListResponse,
     ProblematicUsersListResponse,
     ReportResolveResponse,
     ReportsListResponse,
+    SubscriptionImportRequest,
+    SubscriptionImportResponse,
     UserBanResponse,
+    UserSearchListResponse,
     VideoDeactivateResponse,
     VideoDemonetizeResponse,
+    VideoReportsResolveResponse,
 )
 
 router = APIRouter(
@@ -39,11 +48,17 @@ async def add_channel_strike(channel_id: int, db: DBDep) -> ChannelStrikeRespons
     return AdminService.add_channel_strike(db, channel_id)
 
 
-@router.get("/reports", response_model=ReportsListResponse)
+@router.get(
+    "/reports", response_model=ReportsListResponse, response_model_exclude_unset=True
+)
 async def get_all_reports(
-    db: DBDep, resolved: bool | None = None, skip: int = 0, limit: int = 50
+    db: DBDep,
+    resolved: bool | None = None,
+    skip: int = 0,
+    limit: int = 50,
+    fields: str | None = FIELDS_QUERY,
 ) -> ReportsListResponse:
-    return AdminService.get_all_reports(db, resolved, skip, limit)
+    return AdminService.get_all_reports(db, resolved, skip, limit, fields)
 
 
 @router.patch("/report/{report_id}/resolve", response_model=ReportResolveResponse)
@@ -51,6 +66,48 @@ async def resolve_report(report_id: int, db: DBDep) -> ReportResolveResponse:
     return AdminService.resolve_report(db, report_id)
 
 
+@router.post("/videos/deactivate", response_model=BulkModerationResponse)
+async def deactivate_videos(
+    data: BulkModerationRequest, db: DBDep
+) -> BulkModerationResponse:
+    return AdminService.deactivate_videos(db, data.ids)
+
+
+@router.post("/videos/demonetize", response_model=BulkModerationResponse)
+async def demonetize_videos(
+    data: BulkModerationRequest, db: DBDep
+) -> BulkModerationResponse:
+    return AdminService.demonetize_videos(db, data.ids)
+
+
+@router.post("/users/ban", response_model=BulkModerationResponse)
+async def ban_users(data: BulkModerationRequest, db: DBDep) -> BulkModerationResponse:
+    return AdminService.ban_users(db, data.ids)
+
+
+@router.post("/reports/resolve", response_model=BulkModerationResponse)
+async def resolve_reports(
+    data: BulkModerationRequest, db: DBDep
+) -> BulkModerationResponse:
+    return AdminService.resolve_reports(db, data.ids)
+
+
+@router.post(
+    "/video/{video_id}/reports/resolve", response_model=VideoReportsResolveResponse
+)
+async def resolve_video_reports(
+    video_id: int, db: DBDep
+) -> VideoReportsResolveResponse:
+    return AdminService.resolve_video_reports(db, video_id)
+
+
+@router.post("/subscriptions/import", response_model=SubscriptionImportResponse)
+async def import_subscriptions(
+    data: SubscriptionImportRequest, db: DBDep
+) -> SubscriptionImportResponse:
+    return AdminService.import_subscriptions(db, data)
+
+
 @router.get("/reports/detailed", response_model=DetailedReportsListResponse)
 async def get_reports_with_details(
     db: DBDep, resolved: bool | None = None, skip: int = 0, limit: int = 50
@@ -72,3 +129,29 @@ async def get_channels_with_reports_analytics(
     db: DBDep, min_reports: int = 1, limit: int = 20
 ) -> ChannelAnalyticsListResponse:
     return AdminService.get_channels_with_reports_analytics(db, min_reports, limit)
+
+
+@router.get("/users", response_model=AdminUserBatchResponse)
+async def get_users(
+    db: DBDep,
+    ids: list[int] = Query(..., min_length=1, max_length=100),
+) -> AdminUserBatchResponse:
+    return AdminService.get_users(db, ids)
+
+
+@router.get("/users/search", response_model=UserSearchListResponse)
+async def search_users(
+    db: DBDep,
+    q: str = Query(..., min_length=2, max_length=32),
+    limit: int = Query(20, ge=1, le=100),
+) -> UserSearchListResponse:
+    return AdminService.search_users(db, q, limit)
+
+
+@router.get("/channels/search", response_model=ChannelSearchListResponse)
+async def search_channels(
+    db: DBDep,
+    q: str = Query(..., min_length=2, max_length=32),
+    limit: int = Query(20, ge=1, le=100),
+) -> ChannelSearchListResponse:
+    return AdminService.search_channels(db, q, limit)
@@ -1,13 +1,70 @@
-from fastapi import APIRouter
+from datetime import date
+
+from fastapi import APIRouter, Query
+from app.db.session import DBDep
+from app.schemas.schemas import (
+    ChannelActiveStrikesResponse,
+    ChannelRevenueResponse,
+    ChannelStatsResponse,
+    ChannelSubscribeRequest,
+    ChannelSubscriptionResponse,
+    ChannelSubscribersResponse,
+)
+from app.services.channel import ChannelService
 
 router = APIRouter(tags=["channel"], prefix="/channel")
 
-# GET Channel total viewcount
-# GET Channel subscribers
+
+@router.get("/{channel_id}/stats", response_model=ChannelStatsResponse)
+async def get_channel_stats(channel_id: int, db: DBDep) -> ChannelStatsResponse:
+    return ChannelService.get_stats(db, channel_id)
+
+
+@router.get("/{channel_id}/subscribers", response_model=ChannelSubscribersResponse)
+async def get_channel_subscribers(
+    channel_id: int,
+    db: DBDep,
+    limit: int = Query(50, ge=1, le=1000, description="Number of subscribers per page"),
+    after_id: int | None = Query(
+        None, description="next_after_id of the previous page"
+    ),
+) -> ChannelSubscribersResponse:
+    return ChannelService.get_subscribers(db, channel_id, limit, after_id)
+
+
+@router.post("/{channel_id}/subscribe", response_model=ChannelSubscriptionResponse)
+async def subscribe(
+    channel_id: int, data: ChannelSubscribeRequest, db: DBDep
+) -> ChannelSubscriptionResponse:
+    return ChannelService.subscribe(db, channel_id, data.user_id)
+
+
+@router.delete("/{channel_id}/subscribe", response_model=ChannelSubscriptionResponse)
+async def unsubscribe(
+    channel_id: int,
+    db: DBDep,
+    user_id: int = Query(..., description="User who unsubscribes"),
+) -> ChannelSubscriptionResponse:
+    return ChannelService.unsubscribe(db, channel_id, user_id)
+
+
+@router.get("/{channel_id}/strikes", response_model=ChannelActiveStrikesResponse)
+async def get_channel_active_strikes(
+    channel_id: int, db: DBDep
+) -> ChannelActiveStrikesResponse:
+    return ChannelService.get_active_strikes(db, channel_id)
+
+
+@router.get("/{channel_id}/revenue", response_model=ChannelRevenueResponse)
+async def get_channel_revenue(
+    channel_id: int,
+    db: DBDep,
+    start: date = Query(..., alias="from", description="First month (any day in it)"),
+    end: date = Query(..., alias="to", description="Last month (any day in it)"),
+) -> ChannelRevenueResponse:
+    return ChannelService.get_revenue(db, channel_id, start, end)
+
+
 # POST Upload video
 # PATCH Rename channel
 # DELETE Delete video
-#
-# OLAP: Total revenue from monthly paid subscriptions
-# OLAP: Strike count for channel, excluding the ones that have been expired.
-# NOTE: may be too easy? ^
@@ -1,26 +1,100 @@
-from fastapi import APIRouter, status, Body
+from fastapi import APIRouter, status, Body, Query
 from app.db.session import DBDep
-from app.services.playlist import PlaylistService
+from app.services.playlist import PREVIEW_SIZE, PlaylistService
 
 router = APIRouter(tags=["playlist"], prefix="/playlist")
 
+
 @router.post("/{user_id}", status_code=status.HTTP_201_CREATED)
 async def create_playlist(user_id: int, db: DBDep, name: str = Body(..., embed=True)):
     return PlaylistService.create_playlist(db, user_id, name)
 
+
 @router.get("/{user_id}")
-async def read_user_playlists(user_id: int, db: DBDep):
-    return PlaylistService.get_user_playlists(db, user_id)
+async def read_user_playlists(
+    user_id: int,
+    db: DBDep,
+    preview: int = Query(
+        PREVIEW_SIZE, ge=0, le=10, description="Videos shown per playlist"
+    ),
+):
+    return PlaylistService.get_user_playlists(db, user_id, preview)
+
 
 @router.get("/{user_id}/{playlist_id}")
 async def read_playlist(user_id: int, playlist_id: int, db: DBDep):
     return PlaylistService.get_playlist(db, user_id, playlist_id)
 
+
 @router.put("/{user_id}/{playlist_id}")
-async def update_playlist(user_id: int, playlist_id: int, db: DBDep, name: str = Body(..., embed=True)):
+async def update_playlist(
+    user_id: int, playlist_id: int, db: DBDep, name: str = Body(..., embed=True)
+):
     return PlaylistService.update_playlist(db, user_id, playlist_id, name)
 
+
 @router.delete("/{user_id}/{playlist_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_playlist(user_id: int, playlist_id: int, db: DBDep):
     PlaylistService.delete_playlist(db, user_id, playlist_id)
-    return None
\ No newline at end of file
+    return None
+
+
+@router.post("/{user_id}/{playlist_id}/copy", status_code=status.HTTP_201_CREATED)
+async def duplicate_playlist(
+    user_id: int,
+    playlist_id: int,
+    db: DBDep,
+    name: str | None = Body(None, embed=True, max_length=64),
+):
+    return PlaylistService.duplicate_playlist(db, user_id, playlist_id, name)
+
+
+@router.get("/{user_id}/{playlist_id}/videos")
+async def read_playlist_videos(
+    user_id: int,
+    playlist_id: int,
+    db: DBDep,
+    limit: int = Query(50, ge=1, le=100, description="Number of videos per page"),
+    after_position: int | None = Query(
+        None, description="next_after_position of the last page"
+    ),
+    after_id: int | None = Query(None, description="next_after_id of the last page"),
+):
+    return PlaylistService.get_playlist_videos(
+        db, user_id, playlist_id, limit, after_position, after_id
+    )
+
+
+@router.post("/{user_id}/{playlist_id}/videos")
+async def add_playlist_videos(
+    user_id: int,
+    playlist_id: int,
+    db: DBDep,
+    video_ids: list[int] = Body(..., embed=True, min_length=1, max_length=1000),
+):
+    return PlaylistService.add_videos(db, user_id, playlist_id, video_ids)
+
+
+@router.delete("/{user_id}/{playlist_id}/videos")
+async def remove_playlist_videos(
+    user_id: int,
+    playlist_id: int,
+    db: DBDep,
+    video_ids: list[int] = Query(..., min_length=1, max_length=1000),
+):
+    return PlaylistService.remove_videos(db, user_id, playlist_id, video_ids)
+
+
+@router.put("/{user_id}/{playlist_id}/videos/{video_id}/position")
+async def move_playlist_video(
+    user_id: int,
+    playlist_id: int,
+    video_id: int,
+    db: DBDep,
+    after_video_id: int | None = Body(
+        None, embed=True, description="null moves it to the front"
+    ),
+):
+    return PlaylistService.move_video(
+        db, user_id, playlist_id, video_id, after_video_id
+    )
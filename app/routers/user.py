@@ -1,43 +1,106 @@
-from fastapi import APIRouter, status
+from datetime import date
+
+from fastapi import APIRouter, Query, status
 from app.db.session import DBDep
 from app.services.user import UserService
-from app.schemas.schemas import UserUpdate, UserDetailedResponse, VideoResponse, UserCredibilityResponse
+from app.utils.fields import FIELDS_QUERY
+from app.schemas.schemas import (
+    UserUpdate,
+    UserContinueWatchingResponse,
+    UserDetailedResponse,
+    UserFeedResponse,
+    UserHistoryResponse,
+    VideoResponse,
+    UserCredibilityResponse,
+)
 
 router = APIRouter(tags=["user"], prefix="/user")
 
-@router.get("/", response_model=dict[str, list[UserDetailedResponse]])
-async def get_all_users(db: DBDep):
-    return {"users": UserService.get_all_users(db)}
+
+@router.get(
+    "/",
+    response_model=dict[str, list[UserDetailedResponse]],
+    response_model_exclude_unset=True,
+)
+async def get_all_users(db: DBDep, fields: str | None = FIELDS_QUERY):
+    return {"users": UserService.get_all_users(db, fields)}
+
 
 @router.patch("/{user_id}", response_model=UserDetailedResponse)
 async def update_user(user_id: int, user_data: UserUpdate, db: DBDep):
     return UserService.update_user(db, user_id, user_data)
 
+
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def soft_delete_user(user_id: int, db: DBDep):
     UserService.soft_delete_user(db, user_id)
     return None
 
+
 @router.get("/{user_id}/recommendations", response_model=dict[str, list[VideoResponse]])
 async def get_recommendations(user_id: int, db: DBDep, limit: int = 20):
     return {"videos": UserService.get_recommendations(db, user_id, limit)}
 
+
+@router.get("/{user_id}/feed", response_model=UserFeedResponse)
+async def get_feed(
+    user_id: int,
+    db: DBDep,
+    limit: int = Query(20, ge=1, le=100, description="Number of videos per page"),
+    after_date: date | None = Query(
+        None, description="next_after_date of the previous page"
+    ),
+    after_id: int | None = Query(
+        None, description="next_after_id of the previous page"
+    ),
+):
+    return UserService.get_feed(db, user_id, limit, after_date, after_id)
+
+
+@router.get("/{user_id}/history", response_model=UserHistoryResponse)
+async def get_history(
+    user_id: int,
+    db: DBDep,
+    limit: int = Query(20, ge=1, le=100, description="Number of views per page"),
+    after_date: date | None = Query(
+        None, description="next_after_date of the previous page"
+    ),
+    after_id: int | None = Query(
+        None, description="next_after_id of the previous page"
+    ),
+):
+    return UserService.get_history(db, user_id, limit, after_date, after_id)
+
+
+@router.get("/{user_id}/continue-watching", response_model=UserContinueWatchingResponse)
+async def get_continue_watching(
+    user_id: int,
+    db: DBDep,
+    limit: int = Query(20, ge=1, le=50, description="Number of videos"),
+):
+    return UserService.get_continue_watching(db, user_id, limit)
+
+
 @router.get("/{user_id}/views")
 async def get_user_year_views(user_id: int, db: DBDep):
     return UserService.get_yearly_views(db, user_id)
 
+
 @router.get("/{user_id}/favoriteCreator")
 async def get_user_favorite_creator(user_id: int, db: DBDep):
     return UserService.get_favorite_creator(db, user_id)
 
+
 @router.get("/{user_id}/reactions")
 async def get_user_year_reactions(user_id: int, db: DBDep):
     return UserService.get_reactions_count(db, user_id)
 
+
 @router.get("/{user_id}/averageViewTime")
 async def get_user_avg_view_time(user_id: int, db: DBDep):
     return UserService.get_average_view_time_percents(db, user_id)
 
+
 @router.get("/{user_id}/credibility", response_model=UserCredibilityResponse)
 async def get_user_credibility(user_id: int, db: DBDep):
-    return UserService.get_credibility_score(db, user_id)
\ No newline at end of file
+    return UserService.get_credibility_score(db, user_id)
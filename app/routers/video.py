@@ -1,43 +1,193 @@
 from fastapi import APIRouter, status, Query
-from app.db.session import DBDep
+from app.db.session import DBDep, SessionFactoryDep
 from app.services.video import VideoService
+from app.utils.fields import FIELDS_QUERY
 from app.schemas.schemas import (
-    VideoCreate, VideoUpdate, VideoResponse, VideoWithCommentCreate,
-    VideoStatsResponse, VideoWithCommentResponse
+    VideoCreate,
+    VideoUpdate,
+    VideoResponse,
+    VideoWithCommentCreate,
+    VideoStatsResponse,
+    VideoWithCommentResponse,
+    TrendingVideoResponse,
+    VideoSearchResponse,
+    ViewEventCreate,
+    ViewEventResponse,
+    ViewProgressUpdate,
+    VideoReactionUpdate,
+    VideoReactionResponse,
+    CommentCreate,
+    CommentBulkCreate,
+    CommentResponse,
+    VideoPageResponse,
+    VideoBatchResponse,
+    VideoStatsBatchResponse,
 )
 
 router = APIRouter(tags=["video"], prefix="/video")
 
-@router.get("/{video_id}", response_model=VideoResponse)
-async def get_video(video_id: int, db: DBDep):
-    return VideoService.get_video(db, video_id)
+
+@router.get("/trending", response_model=dict[str, list[TrendingVideoResponse]])
+async def get_trending_videos(
+    db: DBDep,
+    limit: int = Query(20, ge=1, le=100, description="Number of videos"),
+):
+    return {"videos": VideoService.get_trending(db, limit)}
+
+
+@router.get("/search", response_model=VideoSearchResponse)
+async def search_videos(
+    db: DBDep,
+    q: str = Query(..., min_length=1, max_length=256, description="Search query"),
+    limit: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    after_rank: float | None = Query(
+        None, description="next_after_rank of the previous page"
+    ),
+    after_id: int | None = Query(
+        None, description="next_after_id of the previous page"
+    ),
+):
+    return VideoService.search(db, q, limit, after_rank, after_id)
+
+
+@router.get("/", response_model=VideoBatchResponse, response_model_exclude_unset=True)
+async def get_videos(
+    db: DBDep,
+    ids: list[int] = Query(..., min_length=1, max_length=100, description="Video ids"),
+    fields: str | None = FIELDS_QUERY,
+):
+    return VideoService.get_videos(db, ids, fields)
+
+
+@router.get("/stats", response_model=VideoStatsBatchResponse)
+async def get_videos_stats(
+    db: DBDep,
+    ids: list[int] = Query(..., min_length=1, max_length=100, description="Video ids"),
+):
+    return VideoService.get_stats_batch(db, ids)
+
+
+@router.get(
+    "/{video_id}", response_model=VideoResponse, response_model_exclude_unset=True
+)
+async def get_video(video_id: int, db: DBDep, fields: str | None = FIELDS_QUERY):
+    return VideoService.get_video(db, video_id, fields)
+
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=VideoResponse)
 async def create_video(video_data: VideoCreate, db: DBDep):
     return VideoService.create_video(db, video_data)
 
+
 @router.patch("/{video_id}", response_model=VideoResponse)
 async def update_video(video_id: int, video_data: VideoUpdate, db: DBDep):
     return VideoService.update_video(db, video_id, video_data)
 
+
 @router.delete("/{video_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_video(video_id: int, db: DBDep):
     VideoService.delete_video(db, video_id)
     return None
 
+
+@router.post(
+    "/{video_id}/view",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ViewEventResponse,
+)
+async def record_view(video_id: int, event: ViewEventCreate, db: DBDep):
+    return VideoService.record_view(db, video_id, event)
+
+
+@router.put(
+    "/{video_id}/progress",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ViewEventResponse,
+)
+async def update_progress(video_id: int, progress: ViewProgressUpdate, db: DBDep):
+    return VideoService.update_progress(db, video_id, progress)
+
+
+@router.put(
+    "/{video_id}/reaction",
+    response_model=VideoReactionResponse,
+    responses={
+        404: {"description": "Video or user not found"},
+        # Reactions are stored on the latest view row; a reaction without a view is rejected
+        # rather than inventing a view that never happened.
+        409: {"description": "User has not watched this video"},
+    },
+)
+async def set_reaction(video_id: int, data: VideoReactionUpdate, db: DBDep):
+    return VideoService.set_reaction(db, video_id, data)
+
+
+@router.delete("/{video_id}/reaction", response_model=VideoReactionResponse)
+async def clear_reaction(
+    video_id: int,
+    db: DBDep,
+    user_id: int = Query(..., description="User whose reaction is removed"),
+):
+    return VideoService.clear_reaction(db, video_id, user_id)
+
+
 @router.get("/{video_id}/stats", response_model=VideoStatsResponse)
 async def get_video_stats(video_id: int, db: DBDep):
     return VideoService.get_stats(db, video_id)
 
+
+@router.get("/{video_id}/page", response_model=VideoPageResponse)
+async def get_video_page(
+    video_id: int,
+    session_factory: SessionFactoryDep,
+    comment_limit: int = Query(
+        10, ge=1, le=100, description="Comments on the first page"
+    ),
+):
+    return await VideoService.get_page(session_factory, video_id, comment_limit)
+
+
+@router.get("/{video_id}/similar", response_model=dict[str, list[VideoResponse]])
+async def get_similar_videos(
+    video_id: int,
+    db: DBDep,
+    limit: int = Query(10, ge=1, le=100, description="Number of similar videos"),
+):
+    return {"videos": VideoService.get_similar_videos(db, video_id, limit)}
+
+
 @router.get("/{video_id}/comments")
 async def get_video_comments(
     video_id: int,
     db: DBDep,
     page: int = Query(1, ge=1, description="Page number, starting from 1"),
-    limit: int = Query(10, ge=1, le=100, description="Number of items per page")
+    limit: int = Query(10, ge=1, le=100, description="Number of items per page"),
 ):
     return VideoService.get_comments(db, video_id, page, limit)
 
-@router.post("/with-comment", status_code=status.HTTP_201_CREATED, response_model=VideoWithCommentResponse)
+
+@router.post(
+    "/{video_id}/comments",
+    status_code=status.HTTP_201_CREATED,
+    response_model=CommentResponse,
+)
+async def create_comment(video_id: int, comment: CommentCreate, db: DBDep):
+    return VideoService.create_comments(db, video_id, [comment])[0]
+
+
+@router.post(
+    "/{video_id}/comments/bulk",
+    status_code=status.HTTP_201_CREATED,
+    response_model=dict[str, list[CommentResponse]],
+)
+async def create_comments(video_id: int, data: CommentBulkCreate, db: DBDep):
+    return {"comments": VideoService.create_comments(db, video_id, data.comments)}
+
+
+@router.post(
+    "/with-comment",
+    status_code=status.HTTP_201_CREATED,
+    response_model=VideoWithCommentResponse,
+)
 async def create_video_with_comment(video_data: VideoWithCommentCreate, db: DBDep):
-    return VideoService.create_with_comment(db, video_data)
\ No newline at end of file
+    return VideoService.create_with_comment(db, video_data)
@@ -1,4 +1,5 @@
-from datetime import date
+from datetime import date, datetime
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
@@ -11,9 +12,29 @@ class VideoResponse(BaseModel):
     uploaded_at: date
     is_active: bool
     is_monetized: bool
-    
+
     model_config = ConfigDict(from_attributes=True)
 
+
+class VideoBatchResponse(BaseModel):
+    videos: list[VideoResponse]
+    missing: list[int]
+
+
+class TrendingVideoResponse(VideoResponse):
+    trending_score: float
+
+
+class VideoSearchResult(VideoResponse):
+    rank: float
+
+
+class VideoSearchResponse(BaseModel):
+    videos: list[VideoSearchResult]
+    next_after_rank: float | None
+    next_after_id: int | None
+
+
 class VideoCreate(BaseModel):
     title: str = Field(..., max_length=128)
     description: str | None = Field(None, max_length=256)
@@ -28,6 +49,7 @@ class VideoUpdate(BaseModel):
     is_active: bool | None = None
     is_monetized: bool | None = None
 
+
 class VideoWithCommentCreate(BaseModel):
     title: str = Field(..., max_length=128)
     description: str | None = Field(None, max_length=256)
@@ -36,11 +58,13 @@ class VideoWithCommentCreate(BaseModel):
     is_active: bool | None = True
     is_monetized: bool | None = False
 
+
 class VideoWithCommentResponse(BaseModel):
     video: VideoResponse
     comment_id: int
     comment_text: str
 
+
 class VideoDeactivateResponse(BaseModel):
     message: str
     video_id: int
@@ -59,14 +83,49 @@ class VideoInfo(BaseModel):
     id: int
     title: str
 
+
+class ViewEventCreate(BaseModel):
+    user_id: int
+    watched_percentage: float = Field(0.0, ge=0.0, le=1.0)
+    reaction: Literal["Liked", "Disliked"] | None = None
+
+
+class ViewProgressUpdate(BaseModel):
+    user_id: int
+    watched_percentage: float = Field(..., ge=0.0, le=1.0)
+
+
+class ViewEventResponse(BaseModel):
+    status: Literal["queued", "recorded"]
+
+
+class VideoReactionUpdate(BaseModel):
+    user_id: int
+    reaction: Literal["Liked", "Disliked"]
+
+
+class VideoReactionResponse(BaseModel):
+    video_id: int
+    reaction: Literal["Liked", "Disliked"] | None
+    likes: int
+    dislikes: int
+
+
 class VideoStatsResponse(BaseModel):
     video_id: int
     title: str
-    total_views: int
+    # One per user per day: repeat watches on the same day are not counted again.
+    total_views: int = Field(..., description="Views, counted once per user per day")
     likes: int
     dislikes: int
     total_comments: int
 
+
+class VideoStatsBatchResponse(BaseModel):
+    stats: list[VideoStatsResponse]
+    missing: list[int]
+
+
 class CommentResponse(BaseModel):
     id: int
     comment_text: str
@@ -75,6 +134,15 @@ class CommentResponse(BaseModel):
     username: str
 
 
+class CommentCreate(BaseModel):
+    user_id: int
+    comment_text: str = Field(..., min_length=1, max_length=2048)
+
+
+class CommentBulkCreate(BaseModel):
+    comments: list[CommentCreate] = Field(..., min_length=1, max_length=1000)
+
+
 class VideoCommentsResponse(BaseModel):
     video_id: int
     title: str
@@ -84,6 +152,19 @@ class VideoCommentsResponse(BaseModel):
     limit: int
     total_pages: int
 
+
+class VideoPageChannel(BaseModel):
+    id: int
+    name: str
+
+
+class VideoPageResponse(BaseModel):
+    video: VideoResponse
+    channel: VideoPageChannel
+    stats: VideoStatsResponse
+    comments: VideoCommentsResponse
+
+
 class UserCreate(BaseModel):
     username: str
     email: EmailStr
@@ -126,8 +207,35 @@ class UserDetailedResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+
+class WatchedVideo(BaseModel):
+    video_id: int
+    title: str
+    channel_id: int
+    watched_at: date
+    watched_percentage: float
+
+
+class UserHistoryResponse(BaseModel):
+    user_id: int
+    history: list[WatchedVideo]
+    next_after_date: date | None
+    next_after_id: int | None
+
+
+class UserContinueWatchingResponse(BaseModel):
+    user_id: int
+    videos: list[WatchedVideo]
+
+
+class UserFeedResponse(BaseModel):
+    user_id: int
+    videos: list[VideoResponse]
+    next_after_date: date | None
+    next_after_id: int | None
+
+
 class UserCredibilityResponse(BaseModel):
-    
     user_id: int
     username: str
     total_reports: int
@@ -136,6 +244,7 @@ class UserCredibilityResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+
 class UserBanResponse(BaseModel):
     message: str
     user_id: int
@@ -157,6 +266,29 @@ class ProblematicUsersListResponse(BaseModel):
     min_reports_threshold: int
 
 
+class UserSearchResult(BaseModel):
+    id: int
+    username: str
+    email: str
+    is_banned: bool
+    is_deleted: bool
+    similarity: float
+
+
+class UserSearchListResponse(BaseModel):
+    users: list[UserSearchResult]
+    count: int
+
+
+class AdminUserResponse(UserOut):
+    is_deleted: bool
+
+
+class AdminUserBatchResponse(BaseModel):
+    users: list[AdminUserResponse]
+    missing: list[int]
+
+
 class UserLogin(BaseModel):
     username: str
     password: str
@@ -192,6 +324,58 @@ class ChannelStrikeResponse(BaseModel):
     strikes: int
 
 
+class ChannelStatsResponse(BaseModel):
+    channel_id: int
+    name: str
+    total_views: int = Field(..., description="Views, counted once per user per day")
+    subscriber_count: int
+    video_count: int
+    active_strikes: int
+
+
+class ChannelSubscriber(BaseModel):
+    user_id: int
+    username: str
+
+
+class ChannelSubscribersResponse(BaseModel):
+    channel_id: int
+    subscriber_count: int
+    subscribers: list[ChannelSubscriber]
+    next_after_id: int | None
+
+
+class ChannelSubscribeRequest(BaseModel):
+    user_id: int
+
+
+class ChannelSubscriptionResponse(BaseModel):
+    channel_id: int
+    user_id: int
+    is_subscribed: bool
+    changed: bool
+    subscriber_count: int
+
+
+class ChannelActiveStrikesResponse(BaseModel):
+    channel_id: int
+    active_strikes: int
+    next_expiry: datetime | None
+
+
+class ChannelRevenueMonth(BaseModel):
+    month: date
+    tier: str
+    subscribers: int
+    revenue: float
+
+
+class ChannelRevenueResponse(BaseModel):
+    channel_id: int
+    months: list[ChannelRevenueMonth]
+    total_revenue: float
+
+
 class ChannelInfo(BaseModel):
     id: int
     name: str
@@ -199,6 +383,18 @@ class ChannelInfo(BaseModel):
     owner_username: str
 
 
+class ChannelSearchResult(BaseModel):
+    id: int
+    name: str
+    owner_id: int
+    similarity: float
+
+
+class ChannelSearchListResponse(BaseModel):
+    channels: list[ChannelSearchResult]
+    count: int
+
+
 class ChannelAnalyticsResponse(BaseModel):
     channel: ChannelInfo
     report_stats: "ReportStats"
@@ -219,6 +415,8 @@ class ReportResponse(BaseModel):
     reporter_id: int
     video_id: int
 
+    model_config = ConfigDict(from_attributes=True)
+
 
 class ReporterInfo(BaseModel):
     id: int
@@ -241,6 +439,45 @@ class ReportResolveResponse(BaseModel):
     video_id: int
 
 
+class BulkModerationRequest(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=10000)
+
+
+class BulkModerationResult(BaseModel):
+    id: int
+    outcome: Literal["updated", "unchanged", "not_found"]
+
+
+class BulkModerationResponse(BaseModel):
+    results: list[BulkModerationResult]
+    updated: int
+    unchanged: int
+    not_found: int
+
+
+class VideoReportsResolveResponse(BaseModel):
+    video_id: int
+    resolved_report_ids: list[int]
+    resolved: int
+
+
+class SubscriptionImportEntry(BaseModel):
+    user_id: int
+    channel_ids: list[int] = Field(..., max_length=10000)
+
+
+class SubscriptionImportRequest(BaseModel):
+    followers: list[SubscriptionImportEntry] = Field(
+        ..., min_length=1, max_length=10000
+    )
+
+
+class SubscriptionImportResponse(BaseModel):
+    requested: int
+    imported: int
+    batches: int
+
+
 class ReportsListResponse(BaseModel):
     reports: list[ReportResponse]
     count: int
@@ -1,10 +1,17 @@
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from app.repositories.admin import AdminRepository
+from app.utils.fields import build, parse_fields
+from app.utils.similarity import video_similarity_index
+from app.utils.strikes import active_strike_cache
 from app.schemas.schemas import (
+    BulkModerationResponse,
+    BulkModerationResult,
     ChannelAnalyticsListResponse,
     ChannelAnalyticsResponse,
     ChannelInfo,
+    ChannelSearchListResponse,
+    ChannelSearchResult,
     ChannelStrikeResponse,
     DetailedReportResponse,
     DetailedReportsListResponse,
@@ -15,12 +22,30 @@ from app.schemas.schemas import (
     ReportsListResponse,
     ReporterInfo,
     UserBanResponse,
+    UserSearchListResponse,
+    UserSearchResult,
     VideoDeactivateResponse,
     VideoDemonetizeResponse,
     VideoInfo,
+    VideoReportsResolveResponse,
     ReportResponse,
+    AdminUserBatchResponse,
+    AdminUserResponse,
+    SubscriptionImportRequest,
+    SubscriptionImportResponse,
 )
 
+# Subscriptions written per transaction by the follower import.
+IMPORT_BATCH_SIZE = 1000
+
+
+def _bulk_response(rows) -> BulkModerationResponse:
+    results = [BulkModerationResult(id=id, outcome=outcome) for id, outcome in rows]
+    counts = {"updated": 0, "unchanged": 0, "not_found": 0}
+    for result in results:
+        counts[result.outcome] += 1
+    return BulkModerationResponse(results=results, **counts)
+
 
 class AdminService:
     @staticmethod
@@ -41,6 +66,7 @@ class AdminService:
         video.is_active = False
         db.commit()
         db.refresh(video)
+        video_similarity_index.remove(video.id)
 
         return VideoDeactivateResponse(
             message="Video deactivated successfully",
@@ -75,6 +101,21 @@ class AdminService:
             is_monetized=video.is_monetized,
         )
 
+    @staticmethod
+    def get_users(db: Session, user_ids: list[int]) -> AdminUserBatchResponse:
+        user_ids = list(dict.fromkeys(user_ids))
+        users = {
+            user.id: user for user in AdminRepository.get_users_by_ids(db, user_ids)
+        }
+        return AdminUserBatchResponse(
+            users=[
+                AdminUserResponse.model_validate(users[i])
+                for i in user_ids
+                if i in users
+            ],
+            missing=[i for i in user_ids if i not in users],
+        )
+
     @staticmethod
     def ban_user(db: Session, user_id: int) -> UserBanResponse:
         user = AdminRepository.get_user_by_id(db, user_id)
@@ -111,6 +152,7 @@ class AdminService:
 
         AdminRepository.add_channel_strike(db, channel.id, video_id=None)
         db.commit()
+        active_strike_cache.invalidate(channel.id)
 
         strikes_count = AdminRepository.get_channel_strikes_count(db, channel_id)
 
@@ -129,22 +171,17 @@ class AdminService:
 
     @staticmethod
     def get_all_reports(
-        db: Session, resolved: bool | None = None, skip: int = 0, limit: int = 50
+        db: Session,
+        resolved: bool | None = None,
+        skip: int = 0,
+        limit: int = 50,
+        fields: str | None = None,
     ) -> ReportsListResponse:
-        reports = AdminRepository.get_all_reports(db, resolved, skip, limit)
+        selected = parse_fields(ReportResponse, fields)
+        reports = AdminRepository.get_all_reports(db, resolved, skip, limit, selected)
 
         return ReportsListResponse(
-            reports=[
-                ReportResponse(
-                    id=report.id,
-                    reason=report.reason,
-                    created_at=report.created_at,
-                    is_resolved=report.is_resolved,
-                    reporter_id=report.reporter_id,
-                    video_id=report.video_id,
-                )
-                for report in reports
-            ],
+            reports=[build(ReportResponse, report, selected) for report in reports],
             count=len(reports),
             skip=skip,
             limit=limit,
@@ -176,6 +213,74 @@ class AdminService:
             video_id=report.video_id,
         )
 
+    @staticmethod
+    def deactivate_videos(db: Session, video_ids: list[int]) -> BulkModerationResponse:
+        rows = AdminRepository.deactivate_videos(db, video_ids)
+        db.commit()
+        for video_id, outcome in rows:
+            if outcome == "updated":
+                video_similarity_index.remove(video_id)
+        return _bulk_response(rows)
+
+    @staticmethod
+    def demonetize_videos(db: Session, video_ids: list[int]) -> BulkModerationResponse:
+        rows = AdminRepository.demonetize_videos(db, video_ids)
+        db.commit()
+        return _bulk_response(rows)
+
+    @staticmethod
+    def ban_users(db: Session, user_ids: list[int]) -> BulkModerationResponse:
+        rows = AdminRepository.ban_users(db, user_ids)
+        db.commit()
+        return _bulk_response(rows)
+
+    @staticmethod
+    def resolve_reports(db: Session, report_ids: list[int]) -> BulkModerationResponse:
+        rows = AdminRepository.resolve_reports(db, report_ids)
+        db.commit()
+        return _bulk_response(rows)
+
+    @staticmethod
+    def import_subscriptions(
+        db: Session, data: SubscriptionImportRequest
+    ) -> SubscriptionImportResponse:
+        pairs = sorted(
+            {
+                (channel_id, entry.user_id)
+                for entry in data.followers
+                for channel_id in entry.channel_ids
+            }
+        )
+        imported = batches = 0
+        # One commit per batch keeps channel_stats rows locked for a single batch only.
+        for start in range(0, len(pairs), IMPORT_BATCH_SIZE):
+            imported += AdminRepository.import_subscriptions(
+                db, pairs[start : start + IMPORT_BATCH_SIZE]
+            )
+            db.commit()
+            batches += 1
+        return SubscriptionImportResponse(
+            requested=len(pairs), imported=imported, batches=batches
+        )
+
+    @staticmethod
+    def resolve_video_reports(
+        db: Session, video_id: int
+    ) -> VideoReportsResolveResponse:
+        found, report_ids = AdminRepository.resolve_video_reports(db, video_id)
+
+        if not found:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Video not found"
+            )
+
+        db.commit()
+        report_ids = sorted(report_ids or [])
+        return VideoReportsResolveResponse(
+            video_id=video_id, resolved_report_ids=report_ids, resolved=len(report_ids)
+        )
+
     @staticmethod
     def get_reports_with_details(
         db: Session, resolved: bool | None = None, skip: int = 0, limit: int = 50
@@ -267,3 +372,43 @@ class AdminService:
             count=len(results),
             min_reports_threshold=min_reports,
         )
+
+    @staticmethod
+    def search_users(
+        db: Session, query: str, limit: int = 20
+    ) -> UserSearchListResponse:
+        results = AdminRepository.search_users(db, query, limit)
+
+        return UserSearchListResponse(
+            users=[
+                UserSearchResult(
+                    id=user.id,
+                    username=user.username,
+                    email=user.email,
+                    is_banned=user.is_banned,
+                    is_deleted=user.is_deleted,
+                    similarity=round(similarity, 3),
+                )
+                for user, similarity in results
+            ],
+            count=len(results),
+        )
+
+    @staticmethod
+    def search_channels(
+        db: Session, query: str, limit: int = 20
+    ) -> ChannelSearchListResponse:
+        results = AdminRepository.search_channels(db, query, limit)
+
+        return ChannelSearchListResponse(
+            channels=[
+                ChannelSearchResult(
+                    id=channel.id,
+                    name=channel.name,
+                    owner_id=channel.owner_id,
+                    similarity=round(similarity, 3),
+                )
+                for channel, similarity in results
+            ],
+            count=len(results),
+        )
@@ -0,0 +1,142 @@
+from datetime import date
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from app.db.models import Channel
+from app.repositories.channel import ChannelRepository
+from app.utils.strikes import active_strike_cache
+from app.schemas.schemas import (
+    ChannelActiveStrikesResponse,
+    ChannelRevenueMonth,
+    ChannelRevenueResponse,
+    ChannelStatsResponse,
+    ChannelSubscriptionResponse,
+    ChannelSubscriber,
+    ChannelSubscribersResponse,
+)
+
+
+class ChannelService:
+    @staticmethod
+    def get_stats(db: Session, channel_id: int) -> ChannelStatsResponse:
+        row = ChannelRepository.get_stats(db, channel_id)
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Channel not found"
+            )
+        return ChannelStatsResponse(
+            channel_id=row.id,
+            name=row.name,
+            total_views=row.total_views,
+            subscriber_count=row.subscriber_count,
+            video_count=row.video_count,
+            active_strikes=row.active_strikes,
+        )
+
+    @staticmethod
+    def get_revenue(
+        db: Session, channel_id: int, start: date, end: date
+    ) -> ChannelRevenueResponse:
+        if start > end:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'from' must not be after 'to'",
+            )
+        if not db.get(Channel, channel_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Channel not found"
+            )
+        rows = ChannelRepository.get_revenue(
+            db, channel_id, start.replace(day=1), end.replace(day=1)
+        )
+        return ChannelRevenueResponse(
+            channel_id=channel_id,
+            months=[
+                ChannelRevenueMonth(
+                    month=row.month,
+                    tier=row.tier.name,
+                    subscribers=row.subscribers,
+                    revenue=float(row.revenue),
+                )
+                for row in rows
+            ],
+            total_revenue=float(sum(row.revenue for row in rows)),
+        )
+
+    @staticmethod
+    def get_active_strikes(
+        db: Session, channel_id: int
+    ) -> ChannelActiveStrikesResponse:
+        if not db.get(Channel, channel_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Channel not found"
+            )
+        active_strikes, next_expiry = active_strike_cache.get(db, channel_id)
+        return ChannelActiveStrikesResponse(
+            channel_id=channel_id,
+            active_strikes=active_strikes,
+            next_expiry=next_expiry,
+        )
+
+    @staticmethod
+    def get_subscribers(
+        db: Session, channel_id: int, limit: int, after_id: int | None = None
+    ) -> ChannelSubscribersResponse:
+        subscriber_count = ChannelRepository.get_subscriber_count(db, channel_id)
+        if subscriber_count is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Channel not found"
+            )
+        rows = ChannelRepository.get_subscribers(db, channel_id, limit, after_id)
+        return ChannelSubscribersResponse(
+            channel_id=channel_id,
+            subscriber_count=subscriber_count,
+            subscribers=[
+                ChannelSubscriber(user_id=user_id, username=username)
+                for user_id, username in rows
+            ],
+            next_after_id=rows[-1].id if len(rows) == limit else None,
+        )
+
+    @staticmethod
+    def subscribe(
+        db: Session, channel_id: int, user_id: int
+    ) -> ChannelSubscriptionResponse:
+        found, changed, subscriber_count = ChannelRepository.subscribe(
+            db, channel_id, user_id
+        )
+        if not found:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Channel or user not found",
+            )
+        db.commit()
+        return ChannelSubscriptionResponse(
+            channel_id=channel_id,
+            user_id=user_id,
+            is_subscribed=True,
+            changed=changed,
+            subscriber_count=subscriber_count + changed,
+        )
+
+    @staticmethod
+    def unsubscribe(
+        db: Session, channel_id: int, user_id: int
+    ) -> ChannelSubscriptionResponse:
+        changed, subscriber_count = ChannelRepository.unsubscribe(
+            db, channel_id, user_id
+        )
+        if subscriber_count is None:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Channel not found"
+            )
+        db.commit()
+        return ChannelSubscriptionResponse(
+            channel_id=channel_id,
+            user_id=user_id,
+            is_subscribed=False,
+            changed=changed,
+            subscriber_count=subscriber_count - changed,
+        )
@@ -1,6 +1,22 @@
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from app.repositories.playlist import PlaylistRepository
+from app.repositories.playlist import POSITION_GAP, PlaylistRepository
+
+# Videos shown per playlist in the listing.
+PREVIEW_SIZE = 4
+
+
+def _position_between(previous: int | None, following: int | None) -> int | None:
+    if previous is None and following is None:
+        return POSITION_GAP
+    if previous is None:
+        return following - POSITION_GAP
+    if following is None:
+        return previous + POSITION_GAP
+    if following - previous > 1:
+        return (previous + following) // 2
+    return None
+
 
 class PlaylistService:
     @staticmethod
@@ -12,20 +28,22 @@ class PlaylistService:
             "id": playlist.id,
             "name": playlist.name,
             "created_at": playlist.created_at,
-            "author_id": playlist.author_id
+            "author_id": playlist.author_id,
         }
 
     @staticmethod
-    def get_user_playlists(db: Session, user_id: int):
+    def get_user_playlists(db: Session, user_id: int, preview: int = PREVIEW_SIZE):
         if not PlaylistRepository.get_user(db, user_id):
             raise HTTPException(status_code=404, detail="User not found")
-        playlists = PlaylistRepository.get_all_by_user(db, user_id)
+        playlists = PlaylistRepository.get_all_by_user(db, user_id, preview)
         return [
             {
                 "id": p.id,
                 "name": p.name,
                 "created_at": p.created_at,
-                "author_id": p.author_id
+                "author_id": p.author_id,
+                "video_count": p.video_count,
+                "preview_videos": p.videos,
             }
             for p in playlists
         ]
@@ -39,7 +57,7 @@ class PlaylistService:
             "id": playlist.id,
             "name": playlist.name,
             "created_at": playlist.created_at,
-            "author_id": playlist.author_id
+            "author_id": playlist.author_id,
         }
 
     @staticmethod
@@ -52,7 +70,7 @@ class PlaylistService:
             "id": playlist.id,
             "name": playlist.name,
             "created_at": playlist.created_at,
-            "author_id": playlist.author_id
+            "author_id": playlist.author_id,
         }
 
     @staticmethod
@@ -60,4 +78,119 @@ class PlaylistService:
         playlist = PlaylistRepository.get_by_id(db, playlist_id, user_id)
         if not playlist:
             raise HTTPException(status_code=404, detail="Playlist not found")
-        PlaylistRepository.delete(db, playlist)
\ No newline at end of file
+        PlaylistRepository.delete(db, playlist)
+
+    @staticmethod
+    def duplicate_playlist(
+        db: Session, user_id: int, playlist_id: int, name: str | None
+    ):
+        playlist = PlaylistRepository.get_by_id(db, playlist_id, user_id)
+        if not playlist:
+            raise HTTPException(status_code=404, detail="Playlist not found")
+        copy = PlaylistRepository.duplicate(
+            db, playlist, name or f"{playlist.name} (copy)"[:64]
+        )
+        db.commit()
+        return {
+            "id": copy.id,
+            "name": copy.name,
+            "created_at": copy.created_at,
+            "author_id": copy.author_id,
+        }
+
+    @staticmethod
+    def get_playlist_videos(
+        db: Session,
+        user_id: int,
+        playlist_id: int,
+        limit: int,
+        after_position: int | None,
+        after_id: int | None,
+    ):
+        if (after_position is None) != (after_id is None):
+            raise HTTPException(
+                status_code=400,
+                detail="after_position and after_id must be passed together",
+            )
+        if not PlaylistRepository.get_by_id(db, playlist_id, user_id):
+            raise HTTPException(status_code=404, detail="Playlist not found")
+        rows = PlaylistRepository.get_videos(
+            db, playlist_id, limit, after_position, after_id
+        )
+        last = rows[-1] if len(rows) == limit else None
+        return {
+            "playlist_id": playlist_id,
+            "videos": [
+                {
+                    "position": position,
+                    "id": video.id,
+                    "title": video.title,
+                    "description": video.description,
+                    "channel_id": video.channel_id,
+                    "uploaded_at": video.uploaded_at,
+                    "is_active": video.is_active,
+                }
+                for position, video in rows
+            ],
+            "next_after_position": last.position if last else None,
+            "next_after_id": last.Video.id if last else None,
+        }
+
+    @staticmethod
+    def add_videos(db: Session, user_id: int, playlist_id: int, video_ids: list[int]):
+        if not PlaylistRepository.get_by_id(db, playlist_id, user_id, for_update=True):
+            raise HTTPException(status_code=404, detail="Playlist not found")
+        video_ids = list(dict.fromkeys(video_ids))
+        added = set(PlaylistRepository.add_videos(db, playlist_id, video_ids))
+        db.commit()
+        return {
+            "playlist_id": playlist_id,
+            "added": [v for v in video_ids if v in added],
+        }
+
+    @staticmethod
+    def remove_videos(
+        db: Session, user_id: int, playlist_id: int, video_ids: list[int]
+    ):
+        if not PlaylistRepository.get_by_id(db, playlist_id, user_id, for_update=True):
+            raise HTTPException(status_code=404, detail="Playlist not found")
+        removed = set(PlaylistRepository.remove_videos(db, playlist_id, video_ids))
+        db.commit()
+        return {
+            "playlist_id": playlist_id,
+            "removed": [v for v in dict.fromkeys(video_ids) if v in removed],
+        }
+
+    @staticmethod
+    def move_video(
+        db: Session,
+        user_id: int,
+        playlist_id: int,
+        video_id: int,
+        after_video_id: int | None,
+    ):
+        if after_video_id == video_id:
+            raise HTTPException(
+                status_code=400, detail="A video cannot be moved after itself"
+            )
+        if not PlaylistRepository.get_by_id(db, playlist_id, user_id, for_update=True):
+            raise HTTPException(status_code=404, detail="Playlist not found")
+        current, previous, following = PlaylistRepository.get_move_bounds(
+            db, playlist_id, video_id, after_video_id
+        )
+        if current is None:
+            raise HTTPException(status_code=404, detail="Video not in playlist")
+        if after_video_id is not None and previous is None:
+            raise HTTPException(
+                status_code=404, detail="after_video_id not in playlist"
+            )
+        position = _position_between(previous, following)
+        if position is None:
+            PlaylistRepository.renumber(db, playlist_id)
+            _, previous, following = PlaylistRepository.get_move_bounds(
+                db, playlist_id, video_id, after_video_id
+            )
+            position = _position_between(previous, following)
+        PlaylistRepository.set_position(db, playlist_id, video_id, position)
+        db.commit()
+        return {"playlist_id": playlist_id, "video_id": video_id, "position": position}
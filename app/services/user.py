@@ -1,43 +1,70 @@
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
+from app.repositories.feed import FeedRepository
 from app.repositories.user import UserRepository
+from app.utils.fields import build, parse_fields
+from app.utils.recommendations import TOP_N
 from app.schemas.schemas import (
-    UserDetailedResponse, UserUpdate, UserCredibilityResponse, VideoResponse
+    UserContinueWatchingResponse,
+    UserDetailedResponse,
+    UserUpdate,
+    UserCredibilityResponse,
+    UserFeedResponse,
+    UserHistoryResponse,
+    VideoResponse,
+    WatchedVideo,
 )
-from datetime import datetime
+from datetime import date, datetime
+
 
 class UserService:
     @staticmethod
     def get_active_user_or_404(db: Session, user_id: int) -> UserDetailedResponse:
         user = UserRepository.get_by_id(db, user_id)
         if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            )
         if user.is_deleted:
-            raise HTTPException(status_code=status.HTTP_410_GONE, detail="User has been deleted")
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE, detail="User has been deleted"
+            )
         return UserDetailedResponse.model_validate(user)
 
     @staticmethod
-    def get_all_users(db: Session) -> list[UserDetailedResponse]:
-        users = UserRepository.get_all_active(db)
-        return [UserDetailedResponse.model_validate(u) for u in users]
+    def get_all_users(
+        db: Session, fields: str | None = None
+    ) -> list[UserDetailedResponse]:
+        selected = parse_fields(UserDetailedResponse, fields)
+        users = UserRepository.get_all_active(db, selected)
+        return [build(UserDetailedResponse, u, selected) for u in users]
 
     @staticmethod
-    def update_user(db: Session, user_id: int, user_data: UserUpdate) -> UserDetailedResponse:
+    def update_user(
+        db: Session, user_id: int, user_data: UserUpdate
+    ) -> UserDetailedResponse:
         user = UserRepository.get_by_id(db, user_id, for_update=True)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         if user.is_deleted:
             raise HTTPException(status_code=410, detail="User has been deleted")
 
-        if user_data.username and UserRepository.exists_by_username(db, user_data.username, user_id):
+        if user_data.username and UserRepository.exists_by_username(
+            db, user_data.username, user_id
+        ):
             raise HTTPException(status_code=400, detail="Username already exists")
-        if user_data.email and UserRepository.exists_by_email(db, user_data.email, user_id):
+        if user_data.email and UserRepository.exists_by_email(
+            db, user_data.email, user_id
+        ):
             raise HTTPException(status_code=400, detail="Email already exists")
-        
-        if user_data.username: user.username = user_data.username
-        if user_data.email: user.email = user_data.email
-        if user_data.is_moderator is not None: user.is_moderator = user_data.is_moderator
-        
+
+        if user_data.username:
+            user.username = user_data.username
+        if user_data.email:
+            user.email = user_data.email
+        if user_data.is_moderator is not None:
+            user.is_moderator = user_data.is_moderator
+
         db.commit()
         db.refresh(user)
         return UserDetailedResponse.model_validate(user)
@@ -53,11 +80,75 @@ class UserService:
         db.commit()
 
     @staticmethod
-    def get_recommendations(db: Session, user_id: int, limit: int) -> list[VideoResponse]:
+    def get_recommendations(
+        db: Session, user_id: int, limit: int
+    ) -> list[VideoResponse]:
         UserService.get_active_user_or_404(db, user_id)
-        videos = UserRepository.get_recommendations(db, user_id, limit)
+        videos = []
+        if limit <= TOP_N:
+            videos = UserRepository.get_precomputed_recommendations(db, user_id, limit)
+        if not videos:
+            videos = UserRepository.get_recommendations(db, user_id, limit)
         return [VideoResponse.model_validate(v) for v in videos]
 
+    @staticmethod
+    def get_feed(
+        db: Session,
+        user_id: int,
+        limit: int,
+        after_date: date | None,
+        after_id: int | None,
+    ) -> UserFeedResponse:
+        if (after_date is None) != (after_id is None):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="after_date and after_id must be given together",
+            )
+        UserService.get_active_user_or_404(db, user_id)
+        after = (after_date, after_id) if after_id is not None else None
+        videos = FeedRepository.get_feed(db, user_id, limit, after)
+        last = videos[-1] if len(videos) == limit else None
+        return UserFeedResponse(
+            user_id=user_id,
+            videos=[VideoResponse.model_validate(v) for v in videos],
+            next_after_date=last.uploaded_at if last else None,
+            next_after_id=last.id if last else None,
+        )
+
+    @staticmethod
+    def get_history(
+        db: Session,
+        user_id: int,
+        limit: int,
+        after_date: date | None,
+        after_id: int | None,
+    ) -> UserHistoryResponse:
+        if (after_date is None) != (after_id is None):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="after_date and after_id must be given together",
+            )
+        UserService.get_active_user_or_404(db, user_id)
+        after = (after_date, after_id) if after_id is not None else None
+        rows = UserRepository.get_history(db, user_id, limit, after)
+        last = rows[-1] if len(rows) == limit else None
+        return UserHistoryResponse(
+            user_id=user_id,
+            history=[WatchedVideo(**row._mapping) for row in rows],
+            next_after_date=last.watched_at if last else None,
+            next_after_id=last.video_id if last else None,
+        )
+
+    @staticmethod
+    def get_continue_watching(
+        db: Session, user_id: int, limit: int
+    ) -> UserContinueWatchingResponse:
+        UserService.get_active_user_or_404(db, user_id)
+        rows = UserRepository.get_continue_watching(db, user_id, limit)
+        return UserContinueWatchingResponse(
+            user_id=user_id, videos=[WatchedVideo(**row._mapping) for row in rows]
+        )
+
     @staticmethod
     def get_yearly_views(db: Session, user_id: int, year: int | None = None) -> dict:
         UserService.get_active_user_or_404(db, user_id)
@@ -67,22 +158,36 @@ class UserService:
         return {"user_id": user_id, "total_views": int(total), "year": year}
 
     @staticmethod
-    def get_favorite_creator(db: Session, user_id: int, year: int | None = None) -> dict:
+    def get_favorite_creator(
+        db: Session, user_id: int, year: int | None = None
+    ) -> dict:
         UserService.get_active_user_or_404(db, user_id)
         if year is None:
             year = datetime.now().year
         result = UserRepository.get_favorite_creator(db, user_id, year)
         if not result:
-            return {"user_id": user_id, "year": year, "favorite_creator": None, "message": "No views found for this year"}
+            return {
+                "user_id": user_id,
+                "year": year,
+                "favorite_creator": None,
+                "message": "No views found for this year",
+            }
         channel_name, view_count = result
-        return {"user_id": user_id, "year": year, "favorite_creator": channel_name, "videos_watched": int(view_count or 0)}
+        return {
+            "user_id": user_id,
+            "year": year,
+            "favorite_creator": channel_name,
+            "videos_watched": int(view_count or 0),
+        }
 
     @staticmethod
     def get_reactions_count(db: Session, user_id: int, year: int | None = None) -> dict:
         UserService.get_active_user_or_404(db, user_id)
         if year is None:
             year = datetime.now().year
-        comments_count, reacts_count = UserRepository.get_yearly_reaction_counts(db, user_id, year)
+        comments_count, reacts_count = UserRepository.get_yearly_reaction_counts(
+            db, user_id, year
+        )
         total = int((comments_count or 0) + (reacts_count or 0))
         return {"user_id": user_id, "year": year, "total_reactions": total}
 
@@ -92,7 +197,10 @@ class UserService:
         avg = UserRepository.get_avg_view_percentage(db, user_id)
         if avg is None:
             return {"user_id": user_id, "average_view_percents": 0.0}
-        return {"user_id": user_id, "average_view_percents": round(float(avg) * 100.0, 2)}
+        return {
+            "user_id": user_id,
+            "average_view_percents": round(float(avg) * 100.0, 2),
+        }
 
     @staticmethod
     def get_credibility_score(db: Session, user_id: int) -> UserCredibilityResponse:
@@ -106,5 +214,5 @@ class UserService:
             username=username,
             total_reports=total,
             approved_reports=approved,
-            credibility_score=round(score, 2)
-        )
\ No newline at end of file
+            credibility_score=round(score, 2),
+        )
@@ -1,20 +1,147 @@
+import asyncio
+import logging
+
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+from app.repositories.user import UserRepository
 from app.repositories.video import VideoRepository
+from app.utils.fields import build, parse_fields
+from app.utils.comment_cache import DEPTH as COMMENT_CACHE_DEPTH, comment_cache
+from app.utils.similarity import video_similarity_index
+from app.utils.trending import decayed_views
+from app.utils.view_events import view_event_buffer, view_progress_buffer
 from app.db.models import Video, Channel, Comment, User
 from app.schemas.schemas import (
-    VideoCreate, VideoUpdate, VideoResponse, VideoWithCommentCreate,
-    VideoStatsResponse, VideoCommentsResponse, CommentResponse, VideoWithCommentResponse
+    VideoCreate,
+    VideoUpdate,
+    VideoResponse,
+    VideoWithCommentCreate,
+    VideoStatsResponse,
+    VideoCommentsResponse,
+    CommentResponse,
+    VideoWithCommentResponse,
+    TrendingVideoResponse,
+    VideoSearchResult,
+    VideoSearchResponse,
+    ViewEventCreate,
+    ViewEventResponse,
+    ViewProgressUpdate,
+    VideoReactionUpdate,
+    VideoReactionResponse,
+    CommentCreate,
+    VideoPageChannel,
+    VideoPageResponse,
+    VideoBatchResponse,
+    VideoStatsBatchResponse,
 )
 from datetime import date
 
+logger = logging.getLogger(__name__)
+
+
 class VideoService:
     @staticmethod
-    def get_video(db: Session, video_id: int) -> VideoResponse:
-        video = VideoRepository.get_by_id(db, video_id)
+    def get_video(
+        db: Session, video_id: int, fields: str | None = None
+    ) -> VideoResponse:
+        selected = parse_fields(VideoResponse, fields)
+        video = VideoRepository.get_by_id(db, video_id, fields=selected)
         if not video:
             raise HTTPException(status_code=404, detail="Video not found")
-        return VideoResponse.model_validate(video)
+        return build(VideoResponse, video, selected)
+
+    @staticmethod
+    def get_videos(
+        db: Session, video_ids: list[int], fields: str | None = None
+    ) -> VideoBatchResponse:
+        selected = parse_fields(VideoResponse, fields)
+        video_ids = list(dict.fromkeys(video_ids))
+        videos = {
+            video.id: video
+            for video in VideoRepository.get_by_ids(db, video_ids, selected)
+        }
+        return VideoBatchResponse(
+            videos=[
+                build(VideoResponse, videos[i], selected)
+                for i in video_ids
+                if i in videos
+            ],
+            missing=[i for i in video_ids if i not in videos],
+        )
+
+    @staticmethod
+    def get_trending(db: Session, limit: int) -> list[TrendingVideoResponse]:
+        return [
+            TrendingVideoResponse(
+                **VideoResponse.model_validate(video).model_dump(),
+                trending_score=round(decayed_views(score), 4),
+            )
+            for video, score in VideoRepository.get_trending(db, limit)
+        ]
+
+    @staticmethod
+    def search(
+        db: Session,
+        query: str,
+        limit: int,
+        after_rank: float | None = None,
+        after_id: int | None = None,
+    ) -> VideoSearchResponse:
+        if (after_rank is None) != (after_id is None):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="after_rank and after_id must be passed together",
+            )
+        rows = VideoRepository.search(db, query, limit, after_rank, after_id)
+        results = [
+            VideoSearchResult(
+                **VideoResponse.model_validate(video).model_dump(), rank=rank
+            )
+            for video, rank in rows
+        ]
+        last = results[-1] if len(results) == limit else None
+        return VideoSearchResponse(
+            videos=results,
+            next_after_rank=last.rank if last else None,
+            next_after_id=last.id if last else None,
+        )
+
+    @staticmethod
+    def record_view(
+        db: Session, video_id: int, event: ViewEventCreate
+    ) -> ViewEventResponse:
+        # No lookups on this path: events for unknown videos or users are dropped at flush time.
+        flush_due = view_event_buffer.add(
+            event.user_id, video_id, event.watched_percentage, event.reaction
+        )
+        if flush_due:
+            try:
+                view_event_buffer.flush(db)
+            except SQLAlchemyError:
+                if view_event_buffer.durable:
+                    raise HTTPException(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail="View could not be recorded",
+                    )
+                logger.exception("Flushing view events failed; they stay queued")
+        return ViewEventResponse(
+            status="recorded" if view_event_buffer.durable else "queued"
+        )
+
+    @staticmethod
+    def update_progress(
+        db: Session, video_id: int, progress: ViewProgressUpdate
+    ) -> ViewEventResponse:
+        # Only the latest heartbeat per user/video survives until the next flush.
+        if view_progress_buffer.set(
+            progress.user_id, video_id, progress.watched_percentage
+        ):
+            try:
+                view_progress_buffer.flush(db)
+            except SQLAlchemyError:
+                logger.exception("Flushing watch progress failed; it stays queued")
+        return ViewEventResponse(status="queued")
 
     @staticmethod
     def create_video(db: Session, video_data: VideoCreate) -> VideoResponse:
@@ -26,13 +153,21 @@ class VideoService:
             description=video_data.description,
             uploaded_at=date.today(),
             channel_id=video_data.channel_id,
-            is_active=video_data.is_active if video_data.is_active is not None else True,
-            is_monetized=video_data.is_monetized if video_data.is_monetized is not None else False,
+            is_active=video_data.is_active
+            if video_data.is_active is not None
+            else True,
+            is_monetized=video_data.is_monetized
+            if video_data.is_monetized is not None
+            else False,
         )
-        return VideoResponse.model_validate(VideoRepository.create(db, video))
+        video = VideoRepository.create(db, video)
+        video_similarity_index.sync(video)
+        return VideoResponse.model_validate(video)
 
     @staticmethod
-    def update_video(db: Session, video_id: int, video_data: VideoUpdate) -> VideoResponse:
+    def update_video(
+        db: Session, video_id: int, video_data: VideoUpdate
+    ) -> VideoResponse:
         video = VideoRepository.get_by_id(db, video_id, for_update=True)
         if not video:
             raise HTTPException(status_code=404, detail="Video not found")
@@ -46,6 +181,7 @@ class VideoService:
             video.is_monetized = video_data.is_monetized
         db.commit()
         db.refresh(video)
+        video_similarity_index.sync(video)
         return VideoResponse.model_validate(video)
 
     @staticmethod
@@ -54,50 +190,249 @@ class VideoService:
         if not video:
             raise HTTPException(status_code=404, detail="Video not found")
         VideoRepository.delete(db, video)
+        video_similarity_index.remove(video_id)
+        comment_cache.invalidate(video_id)
+
+    @staticmethod
+    def get_similar_videos(
+        db: Session, video_id: int, limit: int
+    ) -> list[VideoResponse]:
+        video = VideoRepository.get_by_id(db, video_id)
+        if not video:
+            raise HTTPException(status_code=404, detail="Video not found")
+        video_similarity_index.ensure_built(db)
+        similar_ids = video_similarity_index.similar(
+            video.id, video.title, video.description, limit
+        )
+        videos = {v.id: v for v in VideoRepository.get_active_by_ids(db, similar_ids)}
+        return [
+            VideoResponse.model_validate(videos[i]) for i in similar_ids if i in videos
+        ]
 
     @staticmethod
     def get_stats(db: Session, video_id: int) -> VideoStatsResponse:
         video = VideoRepository.get_by_id(db, video_id)
         if not video:
             raise HTTPException(status_code=404, detail="Video not found")
-        total_views, likes, dislikes, total_comments = VideoRepository.get_stats(db, video_id)
+        total_views, likes, dislikes, total_comments = VideoRepository.get_stats(
+            db, video_id
+        )
         return VideoStatsResponse(
             video_id=video_id,
             title=video.title,
             total_views=total_views or 0,
             likes=likes or 0,
             dislikes=dislikes or 0,
-            total_comments=total_comments
+            total_comments=total_comments,
+        )
+
+    @staticmethod
+    def get_stats_batch(db: Session, video_ids: list[int]) -> VideoStatsBatchResponse:
+        video_ids = list(dict.fromkeys(video_ids))
+        rows = {row[0]: row for row in VideoRepository.get_stats_by_ids(db, video_ids)}
+        return VideoStatsBatchResponse(
+            stats=[
+                VideoStatsResponse(
+                    video_id=video_id,
+                    title=title,
+                    total_views=total_views,
+                    likes=likes,
+                    dislikes=dislikes,
+                    total_comments=total_comments,
+                )
+                for video_id, title, total_views, likes, dislikes, total_comments in (
+                    rows[i] for i in video_ids if i in rows
+                )
+            ],
+            missing=[i for i in video_ids if i not in rows],
+        )
+
+    @staticmethod
+    def set_reaction(
+        db: Session, video_id: int, data: VideoReactionUpdate
+    ) -> VideoReactionResponse:
+        found, viewed, likes, dislikes = VideoRepository.set_reaction(
+            db, video_id, data.user_id, data.reaction
+        )
+        if not found:
+            db.rollback()
+            raise HTTPException(status_code=404, detail="Video or user not found")
+        if not viewed:
+            db.rollback()
+            raise HTTPException(
+                status_code=409, detail="User has not watched this video"
+            )
+        db.commit()
+        return VideoReactionResponse(
+            video_id=video_id,
+            reaction=data.reaction,
+            likes=likes + (data.reaction == "Liked"),
+            dislikes=dislikes + (data.reaction == "Disliked"),
+        )
+
+    @staticmethod
+    def clear_reaction(
+        db: Session, video_id: int, user_id: int
+    ) -> VideoReactionResponse:
+        found, likes, dislikes = VideoRepository.clear_reaction(db, video_id, user_id)
+        if not found:
+            db.rollback()
+            raise HTTPException(status_code=404, detail="Video not found")
+        db.commit()
+        return VideoReactionResponse(
+            video_id=video_id, reaction=None, likes=likes, dislikes=dislikes
         )
 
     @staticmethod
-    def get_comments(db: Session, video_id: int, page: int, limit: int) -> VideoCommentsResponse:
+    def get_comments(
+        db: Session, video_id: int, page: int, limit: int
+    ) -> VideoCommentsResponse:
         video = VideoRepository.get_by_id(db, video_id)
         if not video:
             raise HTTPException(status_code=404, detail="Video not found")
+        total_count, comments = VideoService._comment_page(db, video_id, page, limit)
+        return VideoService._comments_response(
+            video, total_count, comments, page, limit
+        )
+
+    @staticmethod
+    async def get_page(
+        session_factory: sessionmaker, video_id: int, comment_limit: int
+    ) -> VideoPageResponse:
+        def video_and_comments(db: Session):
+            # The comment page is read only for an existing video, so unknown ids never
+            # reach the comment cache.
+            row = VideoRepository.get_with_channel(db, video_id)
+            if row is None:
+                return None, (0, [])
+            return row, VideoService._comment_page(db, video_id, 1, comment_limit)
+
+        def run(fetch, *args):
+            with session_factory() as db:
+                return fetch(db, *args)
+
+        # Stats do not depend on the rest, so they run in their own session and thread.
+        (row, (total_count, comments)), stats = await asyncio.gather(
+            asyncio.to_thread(run, video_and_comments),
+            asyncio.to_thread(run, VideoRepository.get_stats, video_id),
+        )
+        if row is None:
+            raise HTTPException(status_code=404, detail="Video not found")
+        video, channel_name = row
+        total_views, likes, dislikes, total_comments = stats
+        return VideoPageResponse(
+            video=VideoResponse.model_validate(video),
+            channel=VideoPageChannel(id=video.channel_id, name=channel_name),
+            stats=VideoStatsResponse(
+                video_id=video_id,
+                title=video.title,
+                total_views=total_views or 0,
+                likes=likes or 0,
+                dislikes=dislikes or 0,
+                total_comments=total_comments,
+            ),
+            comments=VideoService._comments_response(
+                video, total_count, comments, 1, comment_limit
+            ),
+        )
+
+    @staticmethod
+    def _comment_page(
+        db: Session, video_id: int, page: int, limit: int
+    ) -> tuple[int, list[CommentResponse]]:
+        cached = comment_cache.get(video_id, limit) if page == 1 else None
+        if cached:
+            return cached
+        if page == 1 and limit <= COMMENT_CACHE_DEPTH:
+            version = comment_cache.version(video_id)
+            total_count, rows = VideoRepository.get_comments(
+                db, video_id, 0, COMMENT_CACHE_DEPTH
+            )
+            comments = [
+                VideoService._comment_response(comment, username)
+                for comment, username in rows
+            ]
+            comment_cache.fill(video_id, version, total_count, comments)
+            return total_count, comments[:limit]
         skip = (page - 1) * limit
-        total_count, comments = VideoRepository.get_comments(db, video_id, skip, limit)
+        total_count, rows = VideoRepository.get_comments(db, video_id, skip, limit)
+        comments = [
+            VideoService._comment_response(comment, username)
+            for comment, username in rows
+        ]
+        return total_count, comments
+
+    @staticmethod
+    def _comments_response(
+        video: Video,
+        total_count: int,
+        comments: list[CommentResponse],
+        page: int,
+        limit: int,
+    ) -> VideoCommentsResponse:
         return VideoCommentsResponse(
-            video_id=video_id,
+            video_id=video.id,
             title=video.title,
-            comments=[
-                CommentResponse(
-                    id=comment.id,
-                    comment_text=comment.comment_text,
-                    commented_at=comment.commented_at,
-                    user_id=comment.user_id,
-                    username=username
-                )
-                for comment, username in comments
-            ],
+            comments=comments,
             total_comments=total_count,
             page=page,
             limit=limit,
-            total_pages=(total_count + limit - 1) // limit
+            total_pages=(total_count + limit - 1) // limit,
+        )
+
+    @staticmethod
+    def create_comments(
+        db: Session, video_id: int, comments: list[CommentCreate]
+    ) -> list[CommentResponse]:
+        video = VideoRepository.get_by_id(db, video_id)
+        if not video or not video.is_active:
+            raise HTTPException(status_code=404, detail="Video not found")
+        users = {
+            user.id: user
+            for user in UserRepository.get_by_ids(
+                db, list({c.user_id for c in comments})
+            )
+        }
+        for comment in comments:
+            user = users.get(comment.user_id)
+            if not user:
+                raise HTTPException(
+                    status_code=404, detail=f"User {comment.user_id} not found"
+                )
+            if user.is_deleted:
+                raise HTTPException(
+                    status_code=410, detail=f"User {comment.user_id} has been deleted"
+                )
+            if user.is_banned:
+                raise HTTPException(
+                    status_code=403, detail=f"User {comment.user_id} is banned"
+                )
+        created = VideoRepository.create_comments(
+            db, video_id, [comment.model_dump() for comment in comments]
         )
+        db.commit()
+        responses = [
+            VideoService._comment_response(comment, users[comment.user_id].username)
+            for comment in created
+        ]
+        # Newest first, as the first page lists them; the cached page and count move with it.
+        comment_cache.add(video_id, responses[::-1])
+        return responses
 
     @staticmethod
-    def create_with_comment(db: Session, video_data: VideoWithCommentCreate) -> VideoWithCommentResponse:
+    def _comment_response(comment: Comment, username: str) -> CommentResponse:
+        return CommentResponse(
+            id=comment.id,
+            comment_text=comment.comment_text,
+            commented_at=comment.commented_at,
+            user_id=comment.user_id,
+            username=username,
+        )
+
+    @staticmethod
+    def create_with_comment(
+        db: Session, video_data: VideoWithCommentCreate
+    ) -> VideoWithCommentResponse:
         channel = db.get(Channel, video_data.channel_id)
         if not channel:
             raise HTTPException(status_code=404, detail="Channel not found")
@@ -105,7 +440,9 @@ class VideoService:
         if not author:
             raise HTTPException(status_code=404, detail="Channel owner not found")
         if author.is_deleted:
-            raise HTTPException(status_code=410, detail="Channel owner has been deleted")
+            raise HTTPException(
+                status_code=410, detail="Channel owner has been deleted"
+            )
         if author.is_banned:
             raise HTTPException(status_code=403, detail="Channel owner is banned")
         video = Video(
@@ -113,8 +450,12 @@ class VideoService:
             description=video_data.description,
             uploaded_at=date.today(),
             channel_id=video_data.channel_id,
-            is_active=video_data.is_active if video_data.is_active is not None else True,
-            is_monetized=video_data.is_monetized if video_data.is_monetized is not None else False,
+            is_active=video_data.is_active
+            if video_data.is_active is not None
+            else True,
+            is_monetized=video_data.is_monetized
+            if video_data.is_monetized is not None
+            else False,
         )
         db.add(video)
         db.flush()
@@ -122,12 +463,11 @@ class VideoService:
             comment_text=video_data.initial_comment,
             user_id=author.id,
             video_id=video.id,
-            commented_at=date.today()
+            commented_at=date.today(),
         )
         db.add(comment)
         db.commit()
+        video_similarity_index.sync(video)
         return VideoWithCommentResponse(
-            video=video,
-            comment_id=comment.id,
-            comment_text=comment.comment_text
-        )
\ No newline at end of file
+            video=video, comment_id=comment.id, comment_text=comment.comment_text
+        )
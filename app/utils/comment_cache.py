@@ -0,0 +1,105 @@
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from app.schemas.schemas import CommentResponse
+
+# Newest comments kept per video; first pages up to this limit are served from memory.
+DEPTH = int(os.getenv("COMMENT_CACHE_DEPTH", "100"))
+MAX_VIDEOS = int(os.getenv("COMMENT_CACHE_MAX_VIDEOS", "1000"))
+# Writes made by other workers or outside this service show up after at most this long.
+TTL = float(os.getenv("COMMENT_CACHE_TTL", "30"))
+
+
+class FirstPageCommentCache:
+    """Newest comments and comment count per video, kept current as comments are posted."""
+
+    def __init__(
+        self, depth: int = DEPTH, max_videos: int = MAX_VIDEOS, ttl: float = TTL
+    ):
+        self.depth = depth
+        self.max_videos = max_videos
+        self.ttl = ttl
+        # video_id -> (expires at, total comments, newest comments)
+        self._pages: OrderedDict[int, tuple[float, int, list[CommentResponse]]] = (
+            OrderedDict()
+        )
+        # Bumped on every write, so a page read before a write is never stored after it.
+        self._clock = itertools.count(1)
+        self._versions: dict[int, int] = {}
+        # Version of every video whose entry was pruned from _versions.
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def get(
+        self, video_id: int, limit: int
+    ) -> tuple[int, list[CommentResponse]] | None:
+        with self._lock:
+            entry = self._pages.get(video_id)
+            if entry is None:
+                return None
+            expires, total, comments = entry
+            if expires < time.monotonic():
+                del self._pages[video_id]
+                return None
+            if len(comments) < min(limit, total):
+                return None
+            self._pages.move_to_end(video_id)
+            return total, comments[:limit]
+
+    def version(self, video_id: int) -> int:
+        with self._lock:
+            return self._versions.get(video_id, self._floor)
+
+    def fill(
+        self, video_id: int, version: int, total: int, comments: list[CommentResponse]
+    ) -> None:
+        with self._lock:
+            # An empty page is never stored: the first comments on a new video are often
+            # written elsewhere (imports, other workers) and must show up on the next read.
+            if total == 0 or self._versions.get(video_id, self._floor) != version:
+                return
+            self._pages[video_id] = (
+                time.monotonic() + self.ttl,
+                total,
+                comments[: self.depth],
+            )
+            self._pages.move_to_end(video_id)
+            while len(self._pages) > self.max_videos:
+                self._pages.popitem(last=False)
+
+    def add(self, video_id: int, comments: list[CommentResponse]) -> None:
+        # comments: newly committed, newest first.
+        with self._lock:
+            self._bump(video_id)
+            entry = self._pages.get(video_id)
+            if entry is not None:
+                expires, total, cached = entry
+                self._pages[video_id] = (
+                    expires,
+                    total + len(comments),
+                    (comments + cached)[: self.depth],
+                )
+
+    def invalidate(self, video_id: int) -> None:
+        with self._lock:
+            self._bump(video_id)
+            self._pages.pop(video_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._versions.clear()
+            self._floor = next(self._clock)
+            self._pages.clear()
+
+    def _bump(self, video_id: int) -> None:
+        self._versions[video_id] = next(self._clock)
+        if len(self._versions) > 4 * self.max_videos:
+            # Forgetting a version is safe once the floor is newer than every version handed out.
+            self._floor = next(self._clock)
+            self._versions = {v: self._floor for v in self._pages}
+
+
+comment_cache = FirstPageCommentCache()
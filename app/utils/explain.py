@@ -0,0 +1,542 @@
+import argparse
+import json
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import date
+
+from sqlalchemy import Engine, event, text
+from sqlalchemy.orm import Session
+
+from app.db.models import Comment, Video
+from app.db.session import engine
+from app.repositories.admin import AdminRepository
+from app.repositories.auth import AuthRepository
+from app.repositories.channel import ChannelRepository
+from app.repositories.feed import FeedRepository
+from app.repositories.job import JobRepository
+from app.repositories.playlist import PlaylistRepository
+from app.repositories.user import UserRepository
+from app.repositories.video import VideoRepository
+from app.repositories.view import ViewRepository
+from app.utils.partitions import maintain_view_partitions
+from app.utils.revenue import refresh_channel_revenue
+
+REPOSITORIES = {
+    "admin": AdminRepository,
+    "auth": AuthRepository,
+    "channel": ChannelRepository,
+    "feed": FeedRepository,
+    "job": JobRepository,
+    "playlist": PlaylistRepository,
+    "user": UserRepository,
+    "video": VideoRepository,
+    "view": ViewRepository,
+}
+
+# Row counts at --scale 1. Large enough that the planner prefers indexes wherever they apply.
+BASE_ROWS = {
+    "users": 20_000,
+    "channels": 2_000,
+    "videos": 50_000,
+    "views": 500_000,
+    "comments": 200_000,
+    "subscriptions": 60_000,
+    "playlists": 5_000,
+    "playlist_videos": 50_000,
+    "reports": 20_000,
+    "strikes": 1_000,
+}
+
+# Every table has explicit ids so foreign keys can be generated arithmetically; the seed
+# therefore expects an empty schema (alembic upgrade head on a fresh database).
+SEED_STATEMENTS = [
+    "SELECT setseed(0.42)",
+    """
+    INSERT INTO users (id, username, email, hashed_password, created_at,
+                       is_moderator, is_deleted, is_banned)
+    SELECT g, 'user' || g, 'user' || g || '@example.com', 'x', DATE '2020-01-01' + g % 2000,
+           g % 200 = 0, g % 33 = 0, g % 50 = 0
+    FROM generate_series(1, :users) g
+    """,
+    """
+    INSERT INTO channels (id, name, created_at, owner_id)
+    SELECT g, 'channel ' || g, DATE '2021-01-01' + g % 1000, 1 + (g * 7) % :users
+    FROM generate_series(1, :channels) g
+    """,
+    # Channel and view popularity are skewed with power(random(), k) so a few rows are hot.
+    """
+    INSERT INTO videos (id, title, description, uploaded_at, is_active, is_monetized, channel_id)
+    SELECT g, 'video ' || g || ' ' || left(md5(g::text), 8), 'description ' || md5(g::text),
+           DATE '2023-01-01' + g % 1000, g % 20 <> 0, g % 3 = 0,
+           1 + floor(:channels * power(random(), 2))::int
+    FROM generate_series(1, :videos) g
+    """,
+    """
+    INSERT INTO views (user_id, video_id, watched_at, watched_percentage, reaction)
+    SELECT 1 + floor(:users * random())::int, 1 + floor(:videos * power(random(), 3))::int,
+           DATE '2024-01-01' + floor(700 * random())::int, random(),
+           CASE WHEN g % 10 = 0 THEN 'Liked' WHEN g % 47 = 0 THEN 'Disliked' END
+    FROM generate_series(1, :views) g
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO comments (id, comment_text, commented_at, user_id, video_id)
+    SELECT g, 'comment ' || g, DATE '2024-01-01' + g % 700,
+           1 + floor(:users * random())::int, 1 + floor(:videos * power(random(), 3))::int
+    FROM generate_series(1, :comments) g
+    """,
+    """
+    INSERT INTO subscription (user_id, channel_id, is_active)
+    SELECT 1 + floor(:users * random())::int, 1 + floor(:channels * power(random(), 2))::int,
+           true
+    FROM generate_series(1, :subscriptions) g
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO paid_subscriptions (id, active_since, active_to, tier, sub_user_id, sub_channel_id)
+    SELECT row_number() OVER (), since,
+           CASE WHEN random() < 0.6 THEN since + floor(1 + 12 * random()) * INTERVAL '1 month' END,
+           (ARRAY['BRONZE', 'SILVER', 'GOLD', 'DIAMOND'])[1 + floor(4 * random())::int]::paidsubtier,
+           user_id, channel_id
+    FROM (
+        SELECT user_id, channel_id, TIMESTAMP '2024-01-01' + random() * INTERVAL '600 days' AS since
+        FROM subscription
+        WHERE (user_id + channel_id) % 4 = 0
+    ) paying
+    """,
+    # The video insert trigger queued every seeded video; keep the last hundred queued and fan
+    # out a tenth of the rest. Channels 1-10 are the large ones merged at read time.
+    "DELETE FROM feed_outbox WHERE video_id <= :videos - 100",
+    """
+    INSERT INTO feed_inbox (user_id, uploaded_at, video_id)
+    SELECT subscription.user_id, videos.uploaded_at, videos.id
+    FROM subscription JOIN videos ON videos.channel_id = subscription.channel_id
+    WHERE subscription.is_active AND subscription.channel_id > 10 AND videos.id % 10 = 0
+    """,
+    """
+    INSERT INTO feed_pulled (channel_id, uploaded_at, video_id)
+    SELECT channel_id, uploaded_at, id FROM videos
+    WHERE channel_id <= 10 AND id <= :videos - 100
+    """,
+    """
+    INSERT INTO playlists (id, name, created_at, author_id)
+    SELECT g, 'playlist ' || g, DATE '2024-01-01' + g % 700, 1 + (g * 13) % :users
+    FROM generate_series(1, :playlists) g
+    """,
+    """
+    INSERT INTO playlist_video (playlist_id, video_id, position)
+    SELECT 1 + g % :playlists, 1 + floor(:videos * random())::int, g * 1024
+    FROM generate_series(1, :playlist_videos) g
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO reports (id, reason, created_at, is_resolved, reporter_id, video_id)
+    SELECT g, 'reason ' || g, DATE '2024-01-01' + g % 700, g % 10 <> 0,
+           1 + floor(:users * random())::int, 1 + floor(:videos * random())::int
+    FROM generate_series(1, :reports) g
+    """,
+    """
+    INSERT INTO channel_strikes (id, issued_at, duration, channel_id)
+    SELECT g, TIMESTAMP '2024-01-01' + g * INTERVAL '1 hour', INTERVAL '7 days',
+           1 + floor(:channels * random())::int
+    FROM generate_series(1, :strikes) g
+    """,
+    """
+    INSERT INTO video_trending_scores (video_id, score)
+    SELECT video_id, ln(count(*)) FROM views GROUP BY video_id
+    """,
+]
+
+SERIAL_TABLES = [
+    "users",
+    "channels",
+    "videos",
+    "comments",
+    "playlists",
+    "reports",
+    "channel_strikes",
+    "paid_subscriptions",
+]
+
+
+def scaled_rows(scale: float) -> dict[str, int]:
+    return {name: max(1, int(count * scale)) for name, count in BASE_ROWS.items()}
+
+
+def seed(db: Session, scale: float = 1.0) -> None:
+    rows = scaled_rows(scale)
+    for statement in SEED_STATEMENTS:
+        db.execute(text(statement), rows)
+    for table in SERIAL_TABLES:
+        db.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"
+            )
+        )
+    db.commit()
+    # Seeded views land in the default partition; split them into monthly partitions.
+    maintain_view_partitions(db)
+    refresh_channel_revenue(db)
+    # Fresh statistics and visibility map, otherwise index-only scans still visit the heap.
+    # The raised target makes ANALYZE sample every row (300 rows per unit of target), so the
+    # statistics, and with them near-tie plan choices, come out the same on every seed.
+    with (
+        db.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT") as conn
+    ):
+        conn.exec_driver_sql("SET default_statistics_target = 10000")
+        conn.exec_driver_sql("VACUUM ANALYZE")
+
+
+@contextmanager
+def capture_statements(db: Session) -> Iterator[list[tuple[str, object]]]:
+    captured: list[tuple[str, object]] = []
+    conn = db.connection()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().split(None, 1)[0].upper() in (
+            "SELECT",
+            "WITH",
+            "INSERT",
+            "UPDATE",
+            "DELETE",
+        ):
+            captured.append((statement, parameters))
+
+    event.listen(conn, "before_cursor_execute", record)
+    try:
+        yield captured
+    finally:
+        event.remove(conn, "before_cursor_execute", record)
+
+
+def explain(db: Session, statement: str, parameters, analyze: bool = False) -> dict:
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+    # The raw cursor keeps the driver's own parameter handling, exactly as the statement ran.
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN ({options}) {statement}", parameters)
+        result = cursor.fetchone()[0]
+    finally:
+        cursor.close()
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]
+
+
+def plan_nodes(node: dict) -> Iterator[dict]:
+    yield node
+    for child in node.get("Plans", ()):
+        yield from plan_nodes(child)
+
+
+def format_plan(node: dict, depth: int = 0) -> list[str]:
+    label = node["Node Type"]
+    if "Index Name" in node:
+        label += f" using {node['Index Name']}"
+    if "Relation Name" in node:
+        label += f" on {node['Relation Name']}"
+    details = f"cost={node['Total Cost']:.2f} rows={node['Plan Rows']}"
+    if "Actual Total Time" in node:
+        details += (
+            f" actual={node['Actual Total Time']:.3f}ms rows={node['Actual Rows']}"
+        )
+    if "Heap Fetches" in node:
+        details += f" heap_fetches={node['Heap Fetches']}"
+    lines = [f"{'  ' * depth}{label} ({details})"]
+    for child in node.get("Plans", ()):
+        lines.extend(format_plan(child, depth + 1))
+    return lines
+
+
+@contextmanager
+def rolled_back_session(bind: Engine = engine) -> Iterator[Session]:
+    # Repository methods that commit only release a savepoint; everything is undone on exit.
+    with bind.connect() as conn:
+        transaction = conn.begin()
+        db = Session(bind=conn, join_transaction_mode="create_savepoint")
+        try:
+            yield db
+        finally:
+            db.close()
+            transaction.rollback()
+
+
+def _get_playlist(db: Session):
+    return PlaylistRepository.get_by_id(db, 42, 1 + 42 * 13 % BASE_ROWS["users"])
+
+
+def _search_channels_by_index(db: Session):
+    # The seeded channels table is small enough that a sequential scan always wins; with it
+    # disabled the plan shows whether ix_channels_name_trgm can still answer the search.
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    return AdminRepository.search_channels(db, "chanel 1777")
+
+
+def _create_with_comment(db: Session):
+    video = Video(title="new", channel_id=77)
+    comment = Comment(comment_text="first", user_id=1234, video=video)
+    return VideoRepository.create_with_comment(db, video, comment)
+
+
+def _recommendations_bulk(db: Session):
+    UserRepository.snapshot_video_view_totals(db)
+    return UserRepository.compute_recommendations_bulk(db, list(range(1, 101)), 50)
+
+
+# One entry per repository method (several for methods whose plan depends on arguments),
+# named "<repository>.<method>[variant]". Ids are typical rows of the seeded dataset.
+CASES: dict[str, Callable[[Session], object]] = {
+    "admin.get_video_by_id": lambda db: AdminRepository.get_video_by_id(db, 1000),
+    "admin.get_users_by_ids": lambda db: AdminRepository.get_users_by_ids(
+        db, list(range(1000, 1020))
+    ),
+    "admin.get_user_by_id": lambda db: AdminRepository.get_user_by_id(db, 1234),
+    "admin.get_channel_by_id": lambda db: AdminRepository.get_channel_by_id(db, 77),
+    "admin.get_report_by_id": lambda db: AdminRepository.get_report_by_id(db, 500),
+    "admin.add_channel_strike": lambda db: AdminRepository.add_channel_strike(db, 77),
+    "admin.get_channel_strikes_count": lambda db: AdminRepository.get_channel_strikes_count(
+        db, 77
+    ),
+    "admin.get_all_reports[unresolved]": lambda db: AdminRepository.get_all_reports(
+        db, False
+    ),
+    "admin.get_all_reports[all]": lambda db: AdminRepository.get_all_reports(db),
+    "admin.get_reports_with_details[unresolved]": lambda db: AdminRepository.get_reports_with_details(
+        db, False
+    ),
+    "admin.get_problematic_users": lambda db: AdminRepository.get_problematic_users(db),
+    "admin.get_channels_with_reports_analytics": lambda db: AdminRepository.get_channels_with_reports_analytics(
+        db
+    ),
+    "admin.deactivate_videos": lambda db: AdminRepository.deactivate_videos(
+        db, list(range(1000, 1100))
+    ),
+    "admin.demonetize_videos": lambda db: AdminRepository.demonetize_videos(
+        db, list(range(1000, 1100))
+    ),
+    "admin.ban_users": lambda db: AdminRepository.ban_users(
+        db, list(range(1000, 1100))
+    ),
+    "admin.resolve_reports": lambda db: AdminRepository.resolve_reports(
+        db, list(range(1000, 1100))
+    ),
+    "admin.resolve_video_reports": lambda db: AdminRepository.resolve_video_reports(
+        db, 1000
+    ),
+    "admin.import_subscriptions": lambda db: AdminRepository.import_subscriptions(
+        db,
+        [
+            (channel_id, user_id)
+            for channel_id in (77, 78)
+            for user_id in range(1000, 1050)
+        ],
+    ),
+    "admin.search_users": lambda db: AdminRepository.search_users(db, "user1234"),
+    "admin.search_channels": lambda db: AdminRepository.search_channels(
+        db, "channel 77"
+    ),
+    "admin.search_channels[trigram]": _search_channels_by_index,
+    "auth.get_user_by_username": lambda db: AuthRepository.get_user_by_username(
+        db, "user1234"
+    ),
+    "auth.get_user_by_email": lambda db: AuthRepository.get_user_by_email(
+        db, "user1234@example.com"
+    ),
+    "auth.create_user": lambda db: AuthRepository.create_user(
+        db, "new", "new@example.com", "x"
+    ),
+    "channel.get_stats": lambda db: ChannelRepository.get_stats(db, 77),
+    "channel.get_subscriber_count": lambda db: ChannelRepository.get_subscriber_count(
+        db, 1
+    ),
+    "channel.get_subscribers": lambda db: ChannelRepository.get_subscribers(
+        db, 1, 50, 5000
+    ),
+    "channel.subscribe": lambda db: ChannelRepository.subscribe(db, 77, 1234),
+    "channel.unsubscribe": lambda db: ChannelRepository.unsubscribe(db, 77, 1234),
+    "channel.get_active_strikes": lambda db: ChannelRepository.get_active_strikes(
+        db, 77
+    ),
+    "channel.get_first_paid_month": lambda db: ChannelRepository.get_first_paid_month(
+        db
+    ),
+    "channel.rebuild_revenue_month": lambda db: ChannelRepository.rebuild_revenue_month(
+        db, date(2025, 3, 1), date(2025, 4, 1)
+    ),
+    "channel.get_revenue": lambda db: ChannelRepository.get_revenue(
+        db, 77, date(2024, 1, 1), date(2025, 12, 1)
+    ),
+    "feed.fan_out": lambda db: FeedRepository.fan_out(db, 20, 500),
+    "feed.get_feed": lambda db: FeedRepository.get_feed(
+        db, 1234, 20, (date(2025, 6, 1), 40000)
+    ),
+    "job.try_lock": lambda db: JobRepository.try_lock(db, "explain"),
+    "job.get_watermark": lambda db: JobRepository.get_watermark(db, "trending"),
+    "job.set_watermark": lambda db: JobRepository.set_watermark(
+        db, "explain", date(2024, 6, 1)
+    ),
+    "playlist.get_user": lambda db: PlaylistRepository.get_user(db, 1234),
+    "playlist.create": lambda db: PlaylistRepository.create(db, "new", 1234),
+    "playlist.get_all_by_user": lambda db: PlaylistRepository.get_all_by_user(
+        db, 547, 4
+    ),
+    "playlist.get_by_id": _get_playlist,
+    "playlist.update": lambda db: PlaylistRepository.update(
+        db, _get_playlist(db), "renamed"
+    ),
+    "playlist.delete": lambda db: PlaylistRepository.delete(db, _get_playlist(db)),
+    "playlist.duplicate": lambda db: PlaylistRepository.duplicate(
+        db, _get_playlist(db), "copy"
+    ),
+    "playlist.get_videos": lambda db: PlaylistRepository.get_videos(
+        db, 42, 50, 1024, 1000
+    ),
+    "playlist.add_videos": lambda db: PlaylistRepository.add_videos(
+        db, 42, list(range(1000, 1020))
+    ),
+    "playlist.remove_videos": lambda db: PlaylistRepository.remove_videos(
+        db, 42, list(range(1000, 1020))
+    ),
+    "playlist.get_move_bounds": lambda db: PlaylistRepository.get_move_bounds(
+        db, 42, 1000, 1001
+    ),
+    "playlist.set_position": lambda db: PlaylistRepository.set_position(
+        db, 42, 1000, 1536
+    ),
+    "playlist.renumber": lambda db: PlaylistRepository.renumber(db, 42),
+    "user.get_all_active": lambda db: UserRepository.get_all_active(db),
+    "user.get_by_id[for_update]": lambda db: UserRepository.get_by_id(db, 1234, True),
+    "user.get_by_ids": lambda db: UserRepository.get_by_ids(
+        db, list(range(1000, 1020))
+    ),
+    "user.exists_by_username": lambda db: UserRepository.exists_by_username(
+        db, "user1234", 1
+    ),
+    "user.exists_by_email": lambda db: UserRepository.exists_by_email(
+        db, "user1234@example.com", 1
+    ),
+    "user.get_recommendations": lambda db: UserRepository.get_recommendations(
+        db, 1234, 20
+    ),
+    "user.get_precomputed_recommendations": lambda db: UserRepository.get_precomputed_recommendations(
+        db, 1234, 20
+    ),
+    "user.snapshot_video_view_totals+compute_recommendations_bulk": _recommendations_bulk,
+    "user.replace_precomputed_recommendations": lambda db: UserRepository.replace_precomputed_recommendations(
+        db, [1234], []
+    ),
+    "user.get_yearly_view_count": lambda db: UserRepository.get_yearly_view_count(
+        db, 1234, 2024
+    ),
+    "user.get_favorite_creator": lambda db: UserRepository.get_favorite_creator(
+        db, 1234, 2024
+    ),
+    "user.get_avg_view_percentage": lambda db: UserRepository.get_avg_view_percentage(
+        db, 1234
+    ),
+    "user.get_yearly_reaction_counts": lambda db: UserRepository.get_yearly_reaction_counts(
+        db, 1234, 2024
+    ),
+    "user.get_history": lambda db: UserRepository.get_history(
+        db, 1234, 20, (date(2025, 6, 1), 40000)
+    ),
+    "user.get_continue_watching": lambda db: UserRepository.get_continue_watching(
+        db, 1234, 20
+    ),
+    "user.get_credibility_data": lambda db: UserRepository.get_credibility_data(
+        db, 1234
+    ),
+    "video.get_by_id[for_update]": lambda db: VideoRepository.get_by_id(db, 1000, True),
+    "video.get_by_ids": lambda db: VideoRepository.get_by_ids(
+        db, list(range(1000, 1020))
+    ),
+    "video.get_with_channel": lambda db: VideoRepository.get_with_channel(db, 1000),
+    "video.get_active_by_ids": lambda db: VideoRepository.get_active_by_ids(
+        db, list(range(1000, 1020))
+    ),
+    "video.search": lambda db: VideoRepository.search(db, "video 1000", 20),
+    "video.get_active_texts": lambda db: VideoRepository.get_active_texts(db).all(),
+    "video.create": lambda db: VideoRepository.create(
+        db, Video(title="new", channel_id=77)
+    ),
+    "video.delete": lambda db: VideoRepository.delete(
+        db, VideoRepository.get_by_id(db, 1000)
+    ),
+    "video.get_stats": lambda db: VideoRepository.get_stats(db, 1000),
+    "video.get_stats_by_ids": lambda db: VideoRepository.get_stats_by_ids(
+        db, list(range(1000, 1020))
+    ),
+    "video.set_reaction": lambda db: VideoRepository.set_reaction(
+        db, 1000, 1234, "Liked"
+    ),
+    "video.clear_reaction": lambda db: VideoRepository.clear_reaction(db, 1000, 1234),
+    "video.get_comments": lambda db: VideoRepository.get_comments(db, 1000, 0, 20),
+    "video.create_comments": lambda db: VideoRepository.create_comments(
+        db, 1000, [{"user_id": 1234, "comment_text": "new"}]
+    ),
+    "video.create_with_comment": _create_with_comment,
+    "video.add_trending_views": lambda db: VideoRepository.add_trending_views(
+        db, date(2024, 6, 1), 0.0
+    ),
+    "video.get_trending": lambda db: VideoRepository.get_trending(db, 20),
+    "view.get_partition_names": lambda db: ViewRepository.get_partition_names(db),
+    "view.get_default_partition_min_date": lambda db: ViewRepository.get_default_partition_min_date(
+        db
+    ),
+    "view.create_partition": lambda db: ViewRepository.create_partition(
+        db, "views_p2040_01", date(2040, 1, 1), date(2040, 2, 1)
+    ),
+    "view.detach_partition": lambda db: ViewRepository.detach_partition(
+        db, "views_p2024_06"
+    ),
+    "view.upsert_events": lambda db: ViewRepository.upsert_events(
+        db, [(seq, 1234, 1000 + seq, date.today(), 0.5, "Liked") for seq in range(10)]
+    ),
+    "view.upsert_progress": lambda db: ViewRepository.upsert_progress(
+        db, [(1234, 1000 + n, date.today(), 0.5) for n in range(10)]
+    ),
+}
+
+
+def explain_case(
+    db: Session, case: Callable[[Session], object], analyze: bool = False
+) -> list[dict]:
+    with capture_statements(db) as statements:
+        case(db)
+    return [
+        explain(db, statement, parameters, analyze)
+        for statement, parameters in statements
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Print query plans of repository calls"
+    )
+    parser.add_argument(
+        "--seed", action="store_true", help="load the synthetic dataset first"
+    )
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument(
+        "--analyze", action="store_true", help="EXPLAIN ANALYZE, BUFFERS"
+    )
+    parser.add_argument("cases", nargs="*", default=list(CASES))
+    args = parser.parse_args()
+
+    if args.seed:
+        with Session(engine) as db:
+            seed(db, args.scale)
+
+    for name in args.cases:
+        with rolled_back_session() as db:
+            plans = explain_case(db, CASES[name], args.analyze)
+        print(f"== {name}")
+        for plan in plans:
+            print("\n".join(format_plan(plan["Plan"])))
+            if "Execution Time" in plan:
+                print(f"Execution Time: {plan['Execution Time']:.3f}ms")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import os
+
+from sqlalchemy.orm import Session
+
+from app.repositories.feed import FeedRepository
+
+FANOUT_INTERVAL = float(os.getenv("FEED_FANOUT_INTERVAL", "5"))
+# Videos claimed per transaction.
+FANOUT_BATCH_SIZE = int(os.getenv("FEED_FANOUT_BATCH_SIZE", "20"))
+# Channels with more active subscribers are not fanned out; feeds merge them at read time.
+FANOUT_MAX_SUBSCRIBERS = int(os.getenv("FEED_FANOUT_MAX_SUBSCRIBERS", "10000"))
+
+
+def fan_out_videos(db: Session) -> int:
+    # Outbox rows are claimed with SKIP LOCKED, so several workers can drain it at once.
+    processed = 0
+    while True:
+        videos, _ = FeedRepository.fan_out(
+            db, FANOUT_BATCH_SIZE, FANOUT_MAX_SUBSCRIBERS
+        )
+        db.commit()
+        processed += videos
+        if videos < FANOUT_BATCH_SIZE:
+            return processed
@@ -0,0 +1,33 @@
+from typing import TypeVar
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+
+Model = TypeVar("Model", bound=BaseModel)
+
+FIELDS_QUERY = Query(
+    None, max_length=512, description="Comma-separated fields to return, e.g. id,title"
+)
+
+
+def parse_fields(model: type[BaseModel], fields: str | None) -> list[str] | None:
+    # None means every field. The id is always kept so list items stay identifiable.
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",")} - {""}
+    unknown = requested - model.model_fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    requested.add("id")
+    return [name for name in model.model_fields if name in requested]
+
+
+def build(model: type[Model], source, fields: list[str] | None) -> Model:
+    # Sparse models are constructed with only the requested fields set, so routes declared
+    # with response_model_exclude_unset serialize just those and never touch unloaded columns.
+    if fields is None:
+        return model.model_validate(source)
+    return model.model_construct(**{name: getattr(source, name) for name in fields})
@@ -0,0 +1,67 @@
+import os
+import re
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from app.repositories.job import JobRepository
+from app.repositories.view import ViewRepository
+
+MONTHS_AHEAD = int(os.getenv("VIEW_PARTITIONS_AHEAD", "3"))
+# Partitions whose month ended more than this many months ago are detached; 0 keeps all.
+RETENTION_MONTHS = int(os.getenv("VIEW_PARTITION_RETENTION_MONTHS", "0"))
+MAINTENANCE_INTERVAL = float(os.getenv("VIEW_PARTITION_MAINTENANCE_INTERVAL", "86400"))
+LOCK = "view_partitions"
+PARTITION_RE = re.compile(r"^views_p(\d{4})_(\d{2})$")
+
+
+def add_months(month: date, months: int) -> date:
+    years, month_index = divmod(month.month - 1 + months, 12)
+    return date(month.year + years, month_index + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"views_p{month:%Y_%m}"
+
+
+def partition_month(name: str) -> date | None:
+    match = PARTITION_RE.match(name)
+    return date(int(match[1]), int(match[2]), 1) if match else None
+
+
+def maintain_view_partitions(
+    db: Session,
+    today: date | None = None,
+    months_ahead: int = MONTHS_AHEAD,
+    retention_months: int = RETENTION_MONTHS,
+) -> tuple[list[str], list[str]]:
+    # Months that only have rows in the default partition are split out as well, so the
+    # partitions stay contiguous from the oldest row onwards.
+    current = (today or date.today()).replace(day=1)
+    if not JobRepository.try_lock(db, LOCK):
+        db.rollback()
+        return [], []
+
+    existing = set(ViewRepository.get_partition_names(db))
+    oldest = ViewRepository.get_default_partition_min_date(db)
+    month = min(oldest.replace(day=1), current) if oldest else current
+    created = []
+    while month <= add_months(current, months_ahead):
+        name = partition_name(month)
+        if name not in existing:
+            ViewRepository.create_partition(db, name, month, add_months(month, 1))
+            existing.add(name)
+            created.append(name)
+        month = add_months(month, 1)
+
+    detached = []
+    if retention_months:
+        cutoff = add_months(current, -retention_months)
+        for name in sorted(existing):
+            month = partition_month(name)
+            if month is not None and month < cutoff:
+                ViewRepository.detach_partition(db, name)
+                detached.append(name)
+
+    db.commit()
+    return created, detached
@@ -0,0 +1,31 @@
+import asyncio
+import logging
+import os
+from collections.abc import Callable
+
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND_TASKS_ENABLED = (
+    os.getenv("BACKGROUND_TASKS_ENABLED", "true").lower() == "true"
+)
+
+
+def run_job(job: Callable[[Session], object]) -> None:
+    db = SessionLocal()
+    try:
+        job(db)
+    finally:
+        db.close()
+
+
+async def run_periodically(job: Callable[[Session], object], interval: float) -> None:
+    while True:
+        try:
+            await asyncio.to_thread(run_job, job)
+        except Exception:
+            logger.exception("Background job %s failed", job.__name__)
+        await asyncio.sleep(interval)
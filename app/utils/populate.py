@@ -16,6 +16,7 @@ from app.db.models import (
     View,
 )
 from app.db.session import SessionLocal
+from app.repositories.playlist import POSITION_GAP
 from faker import Faker
 from sqlalchemy.orm import Session
 from app.utils.auth import get_password_hash
@@ -147,8 +148,10 @@ def create_test_data(session: Session) -> None:
     for playlist in playlists:
         num_entries = fake.random_int(1, 10)
         selected_videos = fake.random_elements(videos, length=num_entries, unique=True)
-        for video in selected_videos:
-            pv = PlaylistVideo(playlist=playlist, video=video)
+        for index, video in enumerate(selected_videos, 1):
+            pv = PlaylistVideo(
+                playlist=playlist, video=video, position=index * POSITION_GAP
+            )
             playlist_entries.append(pv)
 
     session.add_all(playlist_entries)
@@ -0,0 +1,81 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import User
+from app.db.session import engine
+from app.repositories.user import UserRepository
+
+# Stored depth per user. Also read by the API, which only serves limits up to this from the
+# table, so it is deliberately not a command-line option.
+TOP_N = int(os.getenv("RECOMMENDATIONS_TOP_N", "50"))
+CHUNK_SIZE = 1000
+
+
+def refresh_users(db: Session, user_ids: list[int]) -> int:
+    rows = UserRepository.compute_recommendations_bulk(db, user_ids, TOP_N)
+    UserRepository.replace_precomputed_recommendations(db, user_ids, rows)
+    return len(rows)
+
+
+def _init_worker() -> None:
+    # Pooled connections inherited through fork must not be shared with the parent.
+    engine.dispose(close=False)
+
+
+def _refresh_partition(partition: int, partitions: int, chunk_size: int) -> int:
+    written = 0
+    with engine.connect() as conn:
+        db = Session(bind=conn)
+        UserRepository.snapshot_video_view_totals(db)
+        db.commit()
+
+        last_id = 0
+        while True:
+            user_ids = (
+                db.execute(
+                    select(User.id)
+                    .where(
+                        User.is_deleted == False,
+                        User.id % partitions == partition,
+                        User.id > last_id,
+                    )
+                    .order_by(User.id)
+                    .limit(chunk_size)
+                )
+                .scalars()
+                .all()
+            )
+            if not user_ids:
+                break
+            written += refresh_users(db, user_ids)
+            db.commit()
+            last_id = user_ids[-1]
+        db.close()
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Precompute per-user video recommendations"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    with ProcessPoolExecutor(
+        max_workers=args.workers, initializer=_init_worker
+    ) as pool:
+        futures = [
+            pool.submit(_refresh_partition, partition, args.workers, args.chunk_size)
+            for partition in range(args.workers)
+        ]
+        written = sum(future.result() for future in futures)
+    print(f"Stored {written} recommendations across {args.workers} partitions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import os
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.repositories.channel import ChannelRepository
+from app.repositories.job import JobRepository
+from app.utils.partitions import add_months
+
+REFRESH_INTERVAL = float(os.getenv("CHANNEL_REVENUE_REFRESH_INTERVAL", "3600"))
+WATERMARK = "channel_revenue"
+
+
+def refresh_channel_revenue(db: Session, today: date | None = None) -> int:
+    # Months before the watermark are closed and kept as built. The watermark month is the
+    # current one when the last run happened, so it and everything after are rebuilt:
+    # subscriptions can still start or end in them.
+    today = today or date.today()
+    if not JobRepository.try_lock(db, WATERMARK):
+        db.rollback()
+        return 0
+    current = today.replace(day=1)
+    month = JobRepository.get_watermark(
+        db, WATERMARK
+    ) or ChannelRepository.get_first_paid_month(db)
+    processed = 0
+    while month is not None and month <= current:
+        ChannelRepository.rebuild_revenue_month(db, month, add_months(month, 1))
+        month = add_months(month, 1)
+        processed += 1
+    JobRepository.set_watermark(db, WATERMARK, current)
+    db.commit()
+    return processed
+
+
+def rebuild_channel_revenue(db: Session, start: date, end: date | None = None) -> int:
+    # Closed months are never revisited by the refresh, so corrections made after a month
+    # closed reach channel_revenue_monthly only through this. The watermark is left alone.
+    if not JobRepository.try_lock(db, WATERMARK):
+        db.rollback()
+        return 0
+    month, end = start.replace(day=1), (end or start).replace(day=1)
+    processed = 0
+    while month <= end:
+        ChannelRepository.rebuild_revenue_month(db, month, add_months(month, 1))
+        month = add_months(month, 1)
+        processed += 1
+    db.commit()
+    return processed
+
+
+def _month(value: str) -> date:
+    return date.fromisoformat(f"{value}-01")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Rebuild channel revenue for past months"
+    )
+    parser.add_argument("start", type=_month, help="First month to rebuild, YYYY-MM")
+    parser.add_argument(
+        "end", type=_month, nargs="?", help="Last month, YYYY-MM; defaults to start"
+    )
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        processed = rebuild_channel_revenue(db, args.start, args.end)
+    print(f"Rebuilt {processed} months")
+
+
+if __name__ == "__main__":
+    main()
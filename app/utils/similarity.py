@@ -0,0 +1,222 @@
+import hashlib
+import heapq
+import math
+import re
+import sys
+import threading
+from array import array
+from collections import Counter
+
+from sqlalchemy.orm import Session
+
+from app.repositories.video import VideoRepository
+
+TOKEN_RE = re.compile(r"[^\W_]{2,}")
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or our so that the "
+    "this to was were will with you your".split()
+)
+TITLE_WEIGHT = 2
+
+N_TABLES = 10
+N_BITS = 12
+# Below this many documents an exact scan is as fast as bucket lookups and has perfect recall.
+EXACT_SCAN_LIMIT = 5000
+
+# Each hyperplane projection lives in its own LANE_BITS-wide lane of one big int, so a token's
+# contribution to all N_TABLES * N_BITS projections is a single multiply-add.
+LANE_BITS = 32
+WEIGHT_SCALE = 1023
+
+
+def tokenize(title: str, description: str | None) -> Counter[str]:
+    counts: Counter[str] = Counter()
+    for token in TOKEN_RE.findall(title.lower()):
+        if token not in STOP_WORDS:
+            counts[token] += TITLE_WEIGHT
+    for token in TOKEN_RE.findall((description or "").lower()):
+        if token not in STOP_WORDS:
+            counts[token] += 1
+    return counts
+
+
+class VideoSimilarityIndex:
+    """In-memory TF-IDF vectors over active videos with random-hyperplane LSH buckets."""
+
+    def __init__(self, n_tables: int = N_TABLES, n_bits: int = N_BITS):
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._built = False
+        self._vocab: dict[str, int] = {}
+        self._planes: list[int] = []
+        self._df: list[int] = []
+        self._n_docs = 0
+        self._vectors: dict[int, tuple[array, array]] = {}
+        self._signatures: dict[int, tuple[int, ...]] = {}
+        self._buckets: list[dict[int, list[int]]] = [{} for _ in range(self.n_tables)]
+
+    def ensure_built(self, db: Session) -> None:
+        if self._built:
+            return
+        with self._lock:
+            if self._built:
+                return
+            self._reset()
+            docs = [
+                (video_id, tokenize(title, description))
+                for video_id, title, description in VideoRepository.get_active_texts(db)
+            ]
+            for _, counts in docs:
+                self._register(counts)
+            for video_id, counts in docs:
+                self._link(video_id, self._weigh(counts))
+            self._built = True
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def sync(self, video) -> None:
+        if video.is_active:
+            self.upsert(video.id, video.title, video.description)
+        else:
+            self.remove(video.id)
+
+    def upsert(self, video_id: int, title: str, description: str | None) -> None:
+        with self._lock:
+            if not self._built:
+                return
+            self._unlink(video_id)
+            counts = tokenize(title, description)
+            self._register(counts)
+            self._link(video_id, self._weigh(counts))
+
+    def remove(self, video_id: int) -> None:
+        with self._lock:
+            if self._built:
+                self._unlink(video_id)
+
+    def similar(
+        self, video_id: int, title: str, description: str | None, limit: int
+    ) -> list[int]:
+        with self._lock:
+            vector = self._vectors.get(video_id)
+            if vector is None:
+                vector = self._weigh(tokenize(title, description), known_only=True)
+            if self._n_docs <= EXACT_SCAN_LIMIT:
+                candidates = set(self._vectors)
+            else:
+                candidates = self._candidates(self._signature(vector), limit)
+            candidates.discard(video_id)
+
+            query = dict(zip(*vector))
+            scored = []
+            for candidate in candidates:
+                ids, weights = self._vectors[candidate]
+                score = sum(query.get(t, 0.0) * w for t, w in zip(ids, weights))
+                if score > 0:
+                    scored.append((score, candidate))
+            return [candidate for _, candidate in heapq.nlargest(limit, scored)]
+
+    def _candidates(self, signature: tuple[int, ...], limit: int) -> set[int]:
+        candidates: set[int] = set()
+        for table, key in enumerate(signature):
+            candidates.update(self._buckets[table].get(key, ()))
+        if len(candidates) <= limit:
+            # Multi-probe: neighbouring buckets one hyperplane away.
+            for table, key in enumerate(signature):
+                for bit in range(self.n_bits):
+                    candidates.update(self._buckets[table].get(key ^ (1 << bit), ()))
+        return candidates
+
+    def _register(self, counts: Counter[str]) -> None:
+        for token in counts:
+            token_id = self._vocab.get(token)
+            if token_id is None:
+                token_id = len(self._planes)
+                self._vocab[token] = token_id
+                self._planes.append(self._token_plane(token))
+                self._df.append(0)
+            self._df[token_id] += 1
+        self._n_docs += 1
+
+    def _token_plane(self, token: str) -> int:
+        # Lane i holds 1 when the token's component on hyperplane i is positive, 0 when negative.
+        n_lanes = self.n_tables * self.n_bits
+        digest = hashlib.blake2b(
+            token.encode(), digest_size=(n_lanes + 7) // 8
+        ).digest()
+        signs = int.from_bytes(digest, "little")
+        plane = 0
+        for lane in range(n_lanes):
+            if signs >> lane & 1:
+                plane |= 1 << (lane * LANE_BITS)
+        return plane
+
+    def _weigh(
+        self, counts: Counter[str], known_only: bool = False
+    ) -> tuple[array, array]:
+        ids, weights = array("I"), array("f")
+        raw = []
+        for token, count in counts.items():
+            token_id = self._vocab.get(token)
+            if token_id is None:
+                if known_only:
+                    continue
+                raise KeyError(token)
+            idf = math.log((1 + self._n_docs) / (1 + self._df[token_id])) + 1
+            ids.append(token_id)
+            raw.append((1 + math.log(count)) * idf)
+        norm = math.sqrt(sum(w * w for w in raw)) or 1.0
+        weights.extend(w / norm for w in raw)
+        return ids, weights
+
+    def _signature(self, vector: tuple[array, array]) -> tuple[int, ...]:
+        ids, weights = vector
+        positive, total = 0, 0
+        for token_id, weight in zip(ids, weights):
+            scaled = max(1, round(weight * WEIGHT_SCALE))
+            positive += self._planes[token_id] * scaled
+            total += scaled
+        n_lanes = self.n_tables * self.n_bits
+        lanes = array("I", positive.to_bytes(n_lanes * LANE_BITS // 8, "little"))
+        if sys.byteorder == "big":
+            lanes.byteswap()
+        signature = []
+        for table in range(self.n_tables):
+            key = 0
+            for bit, lane in enumerate(
+                lanes[table * self.n_bits : (table + 1) * self.n_bits]
+            ):
+                # Projection is positive - (total - positive) > 0.
+                if 2 * lane > total:
+                    key |= 1 << bit
+            signature.append(key)
+        return tuple(signature)
+
+    def _link(self, video_id: int, vector: tuple[array, array]) -> None:
+        signature = self._signature(vector)
+        self._vectors[video_id] = vector
+        self._signatures[video_id] = signature
+        for table, key in enumerate(signature):
+            self._buckets[table].setdefault(key, []).append(video_id)
+
+    def _unlink(self, video_id: int) -> None:
+        vector = self._vectors.pop(video_id, None)
+        if vector is None:
+            return
+        for table, key in enumerate(self._signatures.pop(video_id)):
+            bucket = self._buckets[table][key]
+            bucket.remove(video_id)
+            if not bucket:
+                del self._buckets[table][key]
+        for token_id in vector[0]:
+            self._df[token_id] -= 1
+        self._n_docs -= 1
+
+
+video_similarity_index = VideoSimilarityIndex()
@@ -0,0 +1,62 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.repositories.channel import ChannelRepository
+
+# Upper bound on how long a count is reused; strikes issued through another worker show up
+# after at most this long.
+TTL = float(os.getenv("STRIKE_CACHE_TTL", "60"))
+MAX_CHANNELS = int(os.getenv("STRIKE_CACHE_MAX_CHANNELS", "10000"))
+
+
+class ActiveStrikeCache:
+    """Active strike count per channel, reused until its next strike expires."""
+
+    def __init__(self, ttl: float = TTL, max_channels: int = MAX_CHANNELS):
+        self.ttl = ttl
+        self.max_channels = max_channels
+        # channel_id -> (valid until, active strikes, next expiry)
+        self._entries: OrderedDict[int, tuple[float, int, datetime | None]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, channel_id: int) -> tuple[int, datetime | None]:
+        with self._lock:
+            entry = self._entries.get(channel_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(channel_id)
+                return entry[1], entry[2]
+
+        count, next_expiry, db_now = ChannelRepository.get_active_strikes(
+            db, channel_id
+        )
+        valid_for = self.ttl
+        if next_expiry is not None:
+            valid_for = min(valid_for, (next_expiry - db_now).total_seconds())
+        with self._lock:
+            self._entries[channel_id] = (
+                time.monotonic() + valid_for,
+                count,
+                next_expiry,
+            )
+            self._entries.move_to_end(channel_id)
+            while len(self._entries) > self.max_channels:
+                self._entries.popitem(last=False)
+        return count, next_expiry
+
+    def invalidate(self, channel_id: int) -> None:
+        with self._lock:
+            self._entries.pop(channel_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+active_strike_cache = ActiveStrikeCache()
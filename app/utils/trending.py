@@ -0,0 +1,47 @@
+import math
+import os
+from datetime import date, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.repositories.job import JobRepository
+from app.repositories.video import VideoRepository
+
+# Scores are stored as ln(decayed views) relative to a fixed epoch, so they never need
+# re-decaying: ordering by the stored value is ordering by today's decayed view count.
+TRENDING_EPOCH = date(2025, 1, 1)
+HALF_LIFE_DAYS = float(os.getenv("TRENDING_HALF_LIFE_DAYS", "3"))
+DECAY_RATE = math.log(2) / HALF_LIFE_DAYS
+BACKFILL_DAYS = 30
+REFRESH_INTERVAL = float(os.getenv("TRENDING_REFRESH_INTERVAL", "300"))
+WATERMARK = "trending"
+
+
+def day_offset(day: date) -> float:
+    return DECAY_RATE * (day - TRENDING_EPOCH).days
+
+
+def decayed_views(score: float, today: date | None = None) -> float:
+    return math.exp(score - day_offset(today or date.today()))
+
+
+def refresh_trending_scores(db: Session, today: date | None = None) -> int:
+    # Views only carry a date, so each closed day is folded in exactly once.
+    today = today or date.today()
+    if not JobRepository.try_lock(db, WATERMARK):
+        db.rollback()
+        return 0
+    last_day = JobRepository.get_watermark(db, WATERMARK)
+    day = (
+        last_day + timedelta(days=1)
+        if last_day
+        else today - timedelta(days=BACKFILL_DAYS)
+    )
+    processed = 0
+    while day < today:
+        VideoRepository.add_trending_views(db, day, day_offset(day))
+        JobRepository.set_watermark(db, WATERMARK, day)
+        day += timedelta(days=1)
+        processed += 1
+    db.commit()
+    return processed
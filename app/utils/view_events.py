@@ -0,0 +1,137 @@
+import itertools
+import logging
+import os
+import threading
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from app.repositories.view import ViewRepository
+
+logger = logging.getLogger(__name__)
+
+FLUSH_SIZE = int(os.getenv("VIEW_EVENTS_FLUSH_SIZE", "5000"))
+FLUSH_INTERVAL = float(os.getenv("VIEW_EVENTS_FLUSH_INTERVAL", "1"))
+# "buffered": a request returns once its event is queued and batches commit with
+# synchronous_commit off, so a crash loses up to FLUSH_INTERVAL of events.
+# "sync": a request returns after the batch holding its event is durably committed.
+DURABILITY = os.getenv("VIEW_EVENTS_DURABILITY", "buffered")
+# Events kept for retry while the database is unavailable; the oldest go first.
+MAX_PENDING = int(os.getenv("VIEW_EVENTS_MAX_PENDING", str(FLUSH_SIZE * 20)))
+
+# Heartbeats reach the database at most this many seconds (plus one flush) late.
+PROGRESS_MAX_STALENESS = float(os.getenv("VIEW_PROGRESS_MAX_STALENESS", "5"))
+# Distinct (user, video) pairs held before a request flushes them itself.
+PROGRESS_MAX_ENTRIES = int(os.getenv("VIEW_PROGRESS_MAX_ENTRIES", "50000"))
+
+
+class ViewEventBuffer:
+    def __init__(
+        self,
+        flush_size: int = FLUSH_SIZE,
+        durable: bool = DURABILITY == "sync",
+        max_pending: int = MAX_PENDING,
+    ):
+        self.flush_size = flush_size
+        self.durable = durable
+        self.max_pending = max_pending
+        self._events: list[tuple] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def add(
+        self,
+        user_id: int,
+        video_id: int,
+        watched_percentage: float,
+        reaction: str | None,
+    ) -> bool:
+        # Returns whether the caller should flush now.
+        with self._lock:
+            self._events.append(
+                (
+                    next(self._seq),
+                    user_id,
+                    video_id,
+                    date.today(),
+                    watched_percentage,
+                    reaction,
+                )
+            )
+            return self.durable or len(self._events) >= self.flush_size
+
+    def flush(self, db: Session) -> int:
+        # Serialised, so concurrent callers commit in turn and each batch is as large as possible.
+        with self._flush_lock:
+            with self._lock:
+                events, self._events = self._events, []
+            if not events:
+                return 0
+            try:
+                ViewRepository.upsert_events(
+                    db, events, synchronous_commit=self.durable
+                )
+                db.commit()
+            except Exception:
+                db.rollback()
+                self._requeue(events)
+                raise
+            return len(events)
+
+    def _requeue(self, events: list[tuple]) -> None:
+        with self._lock:
+            self._events[:0] = events
+            overflow = len(self._events) - self.max_pending
+            if overflow > 0:
+                del self._events[:overflow]
+                logger.warning(
+                    "Dropped %d view events over the pending limit", overflow
+                )
+
+
+class ViewProgressBuffer:
+    """Latest watch progress per (user_id, video_id), written behind in one upsert."""
+
+    def __init__(self, max_entries: int = PROGRESS_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._progress: dict[tuple[int, int], tuple[date, float]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def set(self, user_id: int, video_id: int, watched_percentage: float) -> bool:
+        # Returns whether the caller should flush now.
+        with self._lock:
+            self._progress[user_id, video_id] = (date.today(), watched_percentage)
+            return len(self._progress) >= self.max_entries
+
+    def flush(self, db: Session) -> int:
+        with self._flush_lock:
+            with self._lock:
+                progress, self._progress = self._progress, {}
+            if not progress:
+                return 0
+            try:
+                ViewRepository.upsert_progress(
+                    db,
+                    [
+                        (user_id, video_id, watched_at, percentage)
+                        for (user_id, video_id), (
+                            watched_at,
+                            percentage,
+                        ) in progress.items()
+                    ],
+                )
+                db.commit()
+            except Exception:
+                db.rollback()
+                with self._lock:
+                    # Heartbeats that arrived meanwhile are newer and win.
+                    for key, value in progress.items():
+                        self._progress.setdefault(key, value)
+                raise
+            return len(progress)
+
+
+view_event_buffer = ViewEventBuffer()
+view_progress_buffer = ViewProgressBuffer()
@@ -1,7 +1,15 @@
 from datetime import date, timedelta
 import pytest
 
-from app.db.models import Channel, ChannelStrike, Report, User, Video
+from app.db.models import (
+    Channel,
+    ChannelStats,
+    ChannelStrike,
+    Report,
+    Subscription,
+    User,
+    Video,
+)
 from app.utils.auth import create_access_token
 
 
@@ -418,6 +426,14 @@ def test_get_all_reports(client, db, admin_headers):
     assert data["skip"] == 1
     assert data["limit"] == 1
 
+    response = client.get(
+        "/admin/reports?resolved=false&fields=reason,video_id", headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["reports"] == [
+        {"id": report1.id, "reason": "Inappropriate content", "video_id": video.id}
+    ]
+
 
 def test_resolve_report(client, db, admin_headers):
     reporter = User(
@@ -720,3 +736,219 @@ def test_get_channels_with_reports_analytics(client, db, admin_headers):
     assert analytics["report_stats"]["unique_reporters"] == 1
     assert 66 <= analytics["report_stats"]["resolved_percentage"] <= 67
     assert analytics["risk_level"] in ["HIGH", "MEDIUM", "LOW"]
+
+
+def test_search_users_and_channels(client, db, admin_headers, regular_user_headers):
+    users = [
+        User(
+            username=username,
+            email=f"{username}@example.com",
+            hashed_password="fake_hash",
+            created_at=date.today(),
+        )
+        for username in ["john", "johnny_cash", "jonathan", "alice"]
+    ]
+    db.add_all(users)
+    db.commit()
+    john, johnny, _, alice = users
+
+    response = client.get(
+        "/admin/users/search", params={"q": "John"}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [u["id"] for u in data["users"]] == [john.id, johnny.id]
+    assert data["users"][0]["similarity"] == 1.0
+
+    response = client.get(
+        "/admin/users/search", params={"q": "johny cash"}, headers=admin_headers
+    )
+    assert [u["id"] for u in response.json()["users"]] == [johnny.id]
+
+    response = client.get(
+        "/admin/users/search", params={"q": "%_"}, headers=admin_headers
+    )
+    assert response.json()["count"] == 0
+
+    channels = [
+        Channel(name=name, owner_id=alice.id, created_at=date.today())
+        for name in ["Cooking Daily", "Daily Cooking Tips", "Gaming"]
+    ]
+    db.add_all(channels)
+    db.commit()
+
+    response = client.get(
+        "/admin/channels/search", params={"q": "cook"}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [c["id"] for c in data["channels"]] == [channels[0].id, channels[1].id]
+
+    response = client.get(
+        "/admin/channels/search", params={"q": "cook"}, headers=regular_user_headers
+    )
+    assert response.status_code == 403
+
+
+def test_bulk_moderation(client, db, admin_headers, regular_user):
+    channel = Channel(
+        name="Spam Channel", owner_id=regular_user.id, created_at=date.today()
+    )
+    db.add(channel)
+    db.commit()
+    videos = [
+        Video(
+            title=f"Spam {i}",
+            channel_id=channel.id,
+            uploaded_at=date.today(),
+            is_monetized=True,
+        )
+        for i in range(3)
+    ]
+    videos[2].is_active = False
+    db.add_all(videos)
+    db.commit()
+    reports = [
+        Report(
+            reason="Spam",
+            reporter_id=regular_user.id,
+            video_id=videos[0].id,
+            is_resolved=resolved,
+        )
+        for resolved in (False, False, True)
+    ]
+    db.add_all(reports)
+    db.commit()
+    ids = [video.id for video in videos]
+
+    response = client.post(
+        "/admin/videos/deactivate",
+        json={"ids": [*ids, 99999, ids[0]]},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["results"] == [
+        {"id": ids[0], "outcome": "updated"},
+        {"id": ids[1], "outcome": "updated"},
+        {"id": ids[2], "outcome": "unchanged"},
+        {"id": 99999, "outcome": "not_found"},
+    ]
+    assert (data["updated"], data["unchanged"], data["not_found"]) == (2, 1, 1)
+    db.expire_all()
+    assert all(not video.is_active for video in videos)
+
+    response = client.post(
+        "/admin/videos/demonetize", json={"ids": ids}, headers=admin_headers
+    )
+    assert response.json()["updated"] == 3
+
+    response = client.post(
+        "/admin/users/ban",
+        json={"ids": [regular_user.id, 99999]},
+        headers=admin_headers,
+    )
+    assert [r["outcome"] for r in response.json()["results"]] == [
+        "updated",
+        "not_found",
+    ]
+    response = client.post(
+        "/admin/users/ban", json={"ids": [regular_user.id]}, headers=admin_headers
+    )
+    assert response.json()["unchanged"] == 1
+
+    response = client.post(
+        "/admin/reports/resolve",
+        json={"ids": [reports[1].id, reports[2].id]},
+        headers=admin_headers,
+    )
+    assert [r["outcome"] for r in response.json()["results"]] == [
+        "updated",
+        "unchanged",
+    ]
+
+    response = client.post(
+        f"/admin/video/{videos[0].id}/reports/resolve", headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "video_id": videos[0].id,
+        "resolved_report_ids": [reports[0].id],
+        "resolved": 1,
+    }
+    db.expire_all()
+    assert all(report.is_resolved for report in reports)
+
+    response = client.post("/admin/video/99999/reports/resolve", headers=admin_headers)
+    assert response.status_code == 404
+    response = client.post("/admin/users/ban", json={"ids": []}, headers=admin_headers)
+    assert response.status_code == 422
+
+
+def test_import_subscriptions(client, db, admin_headers, regular_user, monkeypatch):
+    monkeypatch.setattr("app.services.admin.IMPORT_BATCH_SIZE", 2)
+    channels = [
+        Channel(name=f"Imported {i}", owner_id=regular_user.id, created_at=date.today())
+        for i in range(2)
+    ]
+    db.add_all(channels)
+    db.commit()
+    db.add(
+        Subscription(
+            user_id=regular_user.id, channel_id=channels[1].id, is_active=False
+        )
+    )
+    db.commit()
+    first, second = (channel.id for channel in channels)
+
+    response = client.post(
+        "/admin/subscriptions/import",
+        json={
+            "followers": [
+                {
+                    "user_id": regular_user.id,
+                    "channel_ids": [first, second, first, 99999],
+                },
+                {"user_id": 99999, "channel_ids": [first]},
+            ]
+        },
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    # Duplicates collapse; unknown users and channels are skipped.
+    assert response.json() == {"requested": 4, "imported": 2, "batches": 2}
+    db.expire_all()
+    assert db.get(Subscription, (regular_user.id, second)).is_active
+    assert [
+        db.get(ChannelStats, channel_id).subscriber_count
+        for channel_id in (first, second)
+    ] == [1, 1]
+
+    response = client.post(
+        "/admin/subscriptions/import",
+        json={
+            "followers": [{"user_id": regular_user.id, "channel_ids": [first, second]}]
+        },
+        headers=admin_headers,
+    )
+    assert response.json() == {"requested": 2, "imported": 0, "batches": 1}
+
+
+def test_get_users_by_ids(
+    client, db, admin_headers, admin_user, regular_user, regular_user_headers
+):
+    response = client.get(
+        f"/admin/users?ids={regular_user.id}", headers=regular_user_headers
+    )
+    assert response.status_code == 403
+
+    response = client.get(
+        f"/admin/users?ids={regular_user.id}&ids=99999&ids={admin_user.id}&ids={regular_user.id}",
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [u["id"] for u in data["users"]] == [regular_user.id, admin_user.id]
+    assert data["users"][1]["is_moderator"] is True
+    assert data["users"][0]["is_deleted"] is False
+    assert data["missing"] == [99999]
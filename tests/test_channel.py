@@ -0,0 +1,410 @@
+from datetime import date, datetime, timedelta
+
+from app.db.models import (
+    Channel,
+    ChannelStrike,
+    PaidSubscription,
+    PaidSubTier,
+    Subscription,
+    User,
+    Video,
+    View,
+)
+from app.utils.auth import create_access_token
+from app.utils.revenue import rebuild_channel_revenue, refresh_channel_revenue
+
+
+def test_get_channel_stats(client, db):
+    response = client.get("/channel/99999/stats")
+    assert response.status_code == 404
+
+    users = [
+        User(
+            username=f"fan{i}",
+            email=f"fan{i}@example.com",
+            hashed_password="fake_hash",
+            created_at=date.today(),
+        )
+        for i in range(3)
+    ]
+    db.add_all(users)
+    db.commit()
+    channel = Channel(name="Counted", owner_id=users[0].id, created_at=date.today())
+    db.add(channel)
+    db.commit()
+
+    response = client.get(f"/channel/{channel.id}/stats")
+    assert response.status_code == 200
+    assert response.json() == {
+        "channel_id": channel.id,
+        "name": "Counted",
+        "total_views": 0,
+        "subscriber_count": 0,
+        "video_count": 0,
+        "active_strikes": 0,
+    }
+
+    videos = [
+        Video(title=f"Video {i}", channel_id=channel.id, uploaded_at=date.today())
+        for i in range(2)
+    ]
+    db.add_all(videos)
+    db.commit()
+    db.add_all([View(user_id=user.id, video_id=videos[0].id) for user in users])
+    db.add(View(user_id=users[0].id, video_id=videos[1].id))
+    db.add_all(
+        [
+            Subscription(user_id=users[1].id, channel_id=channel.id),
+            Subscription(user_id=users[2].id, channel_id=channel.id, is_active=False),
+        ]
+    )
+    db.add_all(
+        [
+            ChannelStrike(channel_id=channel.id, duration=timedelta(days=7)),
+            ChannelStrike(
+                channel_id=channel.id,
+                issued_at=datetime.now() - timedelta(days=30),
+                duration=timedelta(days=7),
+            ),
+        ]
+    )
+    db.commit()
+
+    data = client.get(f"/channel/{channel.id}/stats").json()
+    assert (
+        data["total_views"],
+        data["subscriber_count"],
+        data["video_count"],
+        data["active_strikes"],
+    ) == (4, 1, 2, 1)
+
+    # Reactions sit on existing view rows and never add views.
+    client.put(
+        f"/video/{videos[1].id}/reaction",
+        json={"user_id": users[0].id, "reaction": "Liked"},
+    )
+    client.put(
+        f"/video/{videos[1].id}/reaction",
+        json={"user_id": users[0].id, "reaction": "Disliked"},
+    )
+    client.put(
+        f"/video/{videos[1].id}/reaction",
+        json={"user_id": users[1].id, "reaction": "Liked"},
+    )
+    subscription = db.get(Subscription, (users[2].id, channel.id))
+    subscription.is_active = True
+    db.commit()
+    data = client.get(f"/channel/{channel.id}/stats").json()
+    assert (data["total_views"], data["subscriber_count"]) == (4, 2)
+
+    client.delete(f"/video/{videos[0].id}")
+    data = client.get(f"/channel/{channel.id}/stats").json()
+    assert (data["total_views"], data["video_count"]) == (1, 1)
+
+
+def test_get_channel_revenue(client, db):
+    owner = User(
+        username="creator",
+        email="creator@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    fans = [
+        User(
+            username=f"payer{i}",
+            email=f"payer{i}@example.com",
+            hashed_password="fake_hash",
+            created_at=date.today(),
+        )
+        for i in range(2)
+    ]
+    db.add_all([owner, *fans])
+    db.commit()
+    channel = Channel(name="Paid", owner_id=owner.id, created_at=date.today())
+    db.add(channel)
+    db.commit()
+    db.add_all([Subscription(user_id=fan.id, channel_id=channel.id) for fan in fans])
+    db.commit()
+    db.add_all(
+        [
+            # Jan through Mar 2025.
+            PaidSubscription(
+                sub_user_id=fans[0].id,
+                sub_channel_id=channel.id,
+                tier=PaidSubTier.GOLD,
+                active_since=datetime(2025, 1, 15),
+                active_to=datetime(2025, 3, 10),
+            ),
+            # Mar 2025 onwards.
+            PaidSubscription(
+                sub_user_id=fans[1].id,
+                sub_channel_id=channel.id,
+                tier=PaidSubTier.BRONZE,
+                active_since=datetime(2025, 3, 1),
+                active_to=None,
+            ),
+        ]
+    )
+    db.commit()
+
+    assert refresh_channel_revenue(db, today=date(2025, 4, 20)) == 4
+
+    response = client.get(
+        f"/channel/{channel.id}/revenue",
+        params={"from": "2025-01-01", "to": "2025-03-31"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [
+        (m["month"], m["tier"], m["subscribers"], m["revenue"]) for m in data["months"]
+    ] == [
+        ("2025-01-01", "GOLD", 1, 9.99),
+        ("2025-02-01", "GOLD", 1, 9.99),
+        ("2025-03-01", "BRONZE", 1, 4.99),
+        ("2025-03-01", "GOLD", 1, 9.99),
+    ]
+    assert data["total_revenue"] == 34.96
+
+    # Closed months are kept; the open month and the ones after it are rebuilt.
+    assert refresh_channel_revenue(db, today=date(2025, 5, 2)) == 2
+    data = client.get(
+        f"/channel/{channel.id}/revenue",
+        params={"from": "2025-04-01", "to": "2025-05-01"},
+    ).json()
+    assert [(m["month"], m["tier"]) for m in data["months"]] == [
+        ("2025-04-01", "BRONZE"),
+        ("2025-05-01", "BRONZE"),
+    ]
+
+    # A correction to a closed month shows up only once that month is rebuilt.
+    db.query(PaidSubscription).filter_by(sub_user_id=fans[0].id).update(
+        {"active_to": datetime(2025, 2, 10)}
+    )
+    db.commit()
+    assert refresh_channel_revenue(db, today=date(2025, 5, 20)) == 1
+    params = {"from": "2025-03-01", "to": "2025-03-31"}
+    data = client.get(f"/channel/{channel.id}/revenue", params=params).json()
+    assert [m["tier"] for m in data["months"]] == ["BRONZE", "GOLD"]
+    assert rebuild_channel_revenue(db, date(2025, 3, 1)) == 1
+    data = client.get(f"/channel/{channel.id}/revenue", params=params).json()
+    assert [m["tier"] for m in data["months"]] == ["BRONZE"]
+
+    response = client.get(
+        f"/channel/{channel.id}/revenue",
+        params={"from": "2025-05-01", "to": "2025-01-01"},
+    )
+    assert response.status_code == 400
+    response = client.get(
+        "/channel/99999/revenue", params={"from": "2025-01-01", "to": "2025-02-01"}
+    )
+    assert response.status_code == 404
+
+
+def test_get_channel_active_strikes(client, db):
+    moderator = User(
+        username="mod",
+        email="mod@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=True,
+    )
+    db.add(moderator)
+    db.commit()
+    channel = Channel(name="Striked", owner_id=moderator.id, created_at=date.today())
+    db.add(channel)
+    db.commit()
+    now = datetime.now()
+    db.add_all(
+        [
+            ChannelStrike(
+                channel_id=channel.id,
+                issued_at=now - timedelta(days=30),
+                duration=timedelta(days=7),
+            ),
+            ChannelStrike(
+                channel_id=channel.id,
+                issued_at=now - timedelta(days=1),
+                duration=timedelta(days=7),
+            ),
+        ]
+    )
+    db.commit()
+
+    response = client.get(f"/channel/{channel.id}/strikes")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["active_strikes"] == 1
+    assert datetime.fromisoformat(data["next_expiry"]) == now + timedelta(days=6)
+
+    # A strike issued through the admin API drops the cached count.
+    headers = {
+        "Authorization": f"Bearer {create_access_token(data={'user_id': moderator.id})}"
+    }
+    response = client.post(f"/admin/channel/{channel.id}/strike", headers=headers)
+    assert response.json()["strikes"] == 2
+    assert client.get(f"/channel/{channel.id}/strikes").json()["active_strikes"] == 2
+    assert client.get(f"/channel/{channel.id}/stats").json()["active_strikes"] == 2
+
+    response = client.get("/channel/99999/strikes")
+    assert response.status_code == 404
+
+
+def test_get_channel_subscribers(client, db):
+    users = [
+        User(
+            username=f"sub{i}",
+            email=f"sub{i}@example.com",
+            hashed_password="fake_hash",
+            created_at=date.today(),
+        )
+        for i in range(5)
+    ]
+    db.add_all(users)
+    db.commit()
+    channel = Channel(name="Followed", owner_id=users[0].id, created_at=date.today())
+    db.add(channel)
+    db.commit()
+    db.add_all(
+        [
+            Subscription(user_id=user.id, channel_id=channel.id, is_active=i != 2)
+            for i, user in enumerate(users)
+        ]
+    )
+    db.commit()
+    active = [user.id for i, user in enumerate(users) if i != 2]
+
+    response = client.get(f"/channel/{channel.id}/subscribers", params={"limit": 3})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["subscriber_count"] == 4
+    assert [s["user_id"] for s in data["subscribers"]] == active[:3]
+    assert data["next_after_id"] == active[2]
+
+    data = client.get(
+        f"/channel/{channel.id}/subscribers",
+        params={"limit": 3, "after_id": data["next_after_id"]},
+    ).json()
+    assert [(s["user_id"], s["username"]) for s in data["subscribers"]] == [
+        (active[3], "sub4")
+    ]
+    assert data["next_after_id"] is None
+
+    response = client.get("/channel/99999/subscribers")
+    assert response.status_code == 404
+
+
+def test_subscribe_and_unsubscribe(client, db):
+    owner = User(
+        username="owner",
+        email="owner@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    fan = User(
+        username="fan",
+        email="fan@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    db.add_all([owner, fan])
+    db.commit()
+    channel = Channel(name="Clicked", owner_id=owner.id, created_at=date.today())
+    db.add(channel)
+    db.commit()
+
+    response = client.post(f"/channel/{channel.id}/subscribe", json={"user_id": fan.id})
+    assert response.status_code == 200
+    assert response.json() == {
+        "channel_id": channel.id,
+        "user_id": fan.id,
+        "is_subscribed": True,
+        "changed": True,
+        "subscriber_count": 1,
+    }
+    # A repeated click changes nothing and does not count the subscriber twice.
+    data = client.post(
+        f"/channel/{channel.id}/subscribe", json={"user_id": fan.id}
+    ).json()
+    assert (data["changed"], data["subscriber_count"]) == (False, 1)
+
+    data = client.delete(
+        f"/channel/{channel.id}/subscribe", params={"user_id": fan.id}
+    ).json()
+    assert (data["is_subscribed"], data["changed"], data["subscriber_count"]) == (
+        False,
+        True,
+        0,
+    )
+    data = client.delete(
+        f"/channel/{channel.id}/subscribe", params={"user_id": fan.id}
+    ).json()
+    assert (data["changed"], data["subscriber_count"]) == (False, 0)
+
+    data = client.post(
+        f"/channel/{channel.id}/subscribe", json={"user_id": fan.id}
+    ).json()
+    assert (data["changed"], data["subscriber_count"]) == (True, 1)
+    db.expire_all()
+    assert db.get(Subscription, (fan.id, channel.id)).is_active
+    assert client.get(f"/channel/{channel.id}/stats").json()["subscriber_count"] == 1
+
+    response = client.post(f"/channel/{channel.id}/subscribe", json={"user_id": 99999})
+    assert response.status_code == 404
+    response = client.delete("/channel/99999/subscribe", params={"user_id": fan.id})
+    assert response.status_code == 404
+
+
+def test_unsubscribe_ends_paid_subscription(client, db):
+    owner = User(
+        username="owner",
+        email="owner@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    fan = User(
+        username="fan",
+        email="fan@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    db.add_all([owner, fan])
+    db.commit()
+    channel = Channel(name="Paid", owner_id=owner.id, created_at=date.today())
+    db.add(channel)
+    db.commit()
+    db.add(Subscription(user_id=fan.id, channel_id=channel.id))
+    db.commit()
+    ended = datetime(2025, 1, 31)
+    db.add_all(
+        [
+            PaidSubscription(
+                sub_user_id=fan.id,
+                sub_channel_id=channel.id,
+                tier=PaidSubTier.GOLD,
+                active_since=datetime(2025, 1, 1),
+                active_to=ended,
+            ),
+            PaidSubscription(
+                sub_user_id=fan.id,
+                sub_channel_id=channel.id,
+                tier=PaidSubTier.BRONZE,
+                active_since=datetime(2025, 3, 1),
+                active_to=None,
+            ),
+        ]
+    )
+    db.commit()
+
+    data = client.delete(
+        f"/channel/{channel.id}/subscribe", params={"user_id": fan.id}
+    ).json()
+    assert data["changed"] is True
+    db.expire_all()
+    paid = {
+        p.tier: p.active_to
+        for p in db.query(PaidSubscription).filter_by(sub_user_id=fan.id)
+    }
+    # The running tier stops with the subscription; the one already over keeps its end.
+    assert paid[PaidSubTier.GOLD] == ended
+    assert paid[PaidSubTier.BRONZE] is not None
+    assert paid[PaidSubTier.BRONZE] > datetime(2025, 3, 1)
@@ -1,5 +1,6 @@
 from datetime import date
-from app.db.models import User, Playlist
+from app.db.models import Channel, User, Playlist, PlaylistVideo, Video
+
 
 def test_create_playlist(client, db):
     playlist_data = {"name": "My Favorites"}
@@ -11,19 +12,19 @@ def test_create_playlist(client, db):
         email="test@example.com",
         hashed_password="fake_hash",
         created_at=date.today(),
-        is_moderator=False
+        is_moderator=False,
     )
     db.add(user)
     db.commit()
 
     response = client.post(f"/playlist/{user.id}", json=playlist_data)
     assert response.status_code == 201
-    
+
     data = response.json()
     assert "id" in data
     assert data["name"] == "My Favorites"
     assert data["author_id"] == user.id
-    
+
     db_playlist = db.get(Playlist, data["id"])
     assert db_playlist is not None
     assert db_playlist.name == "My Favorites"
@@ -38,7 +39,7 @@ def test_get_user_playlists(client, db):
         email="test@example.com",
         hashed_password="fake_hash",
         created_at=date.today(),
-        is_moderator=False
+        is_moderator=False,
     )
     db.add(user)
     db.commit()
@@ -63,11 +64,11 @@ def test_get_user_playlists(client, db):
 
 def test_get_single_playlist(client, db):
     user = User(
-        username="single_tester", 
-        email="test@example.com", 
+        username="single_tester",
+        email="test@example.com",
         hashed_password="fake_hash",
-        created_at=date.today(), 
-        is_moderator=False
+        created_at=date.today(),
+        is_moderator=False,
     )
     db.add(user)
     db.commit()
@@ -89,11 +90,11 @@ def test_get_single_playlist(client, db):
 
 def test_update_playlist(client, db):
     user = User(
-        username="update_tester", 
-        email="test@example.com", 
+        username="update_tester",
+        email="test@example.com",
         hashed_password="fake_hash",
-        created_at=date.today(), 
-        is_moderator=False
+        created_at=date.today(),
+        is_moderator=False,
     )
     db.add(user)
     db.commit()
@@ -117,11 +118,11 @@ def test_update_playlist(client, db):
 
 def test_delete_playlist(client, db):
     user = User(
-        username="delete_tester", 
-        email="test@example.com", 
+        username="delete_tester",
+        email="test@example.com",
         hashed_password="fake_hash",
-        created_at=date.today(), 
-        is_moderator=False
+        created_at=date.today(),
+        is_moderator=False,
     )
     db.add(user)
     db.commit()
@@ -140,4 +141,197 @@ def test_delete_playlist(client, db):
     assert deleted_playlist is None
 
     response = client.get(f"/playlist/{user.id}/{playlist.id}")
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+
+def test_playlist_videos(client, db):
+    user = User(
+        username="contents_tester",
+        email="test@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+    )
+    db.add(user)
+    db.commit()
+    channel = Channel(name="Music", owner_id=user.id, created_at=date.today())
+    db.add(channel)
+    db.commit()
+    videos = [
+        Video(
+            title=f"Song {i}",
+            channel_id=channel.id,
+            uploaded_at=date.today(),
+            is_active=i < 3,
+        )
+        for i in range(4)
+    ]
+    playlist = Playlist(name="Mix", author_id=user.id, created_at=date.today())
+    db.add_all([*videos, playlist])
+    db.commit()
+    v0, v1, v2, inactive = (video.id for video in videos)
+    url = f"/playlist/{user.id}/{playlist.id}/videos"
+
+    response = client.post(url, json={"video_ids": [v0, v1, v2, v0, inactive, 99999]})
+    assert response.status_code == 200
+    assert response.json() == {"playlist_id": playlist.id, "added": [v0, v1, v2]}
+    response = client.post(url, json={"video_ids": [v1]})
+    assert response.json()["added"] == []
+
+    data = client.get(url, params={"limit": 2}).json()
+    assert [(v["id"], v["position"]) for v in data["videos"]] == [
+        (v0, 1024),
+        (v1, 2048),
+    ]
+    assert data["videos"][0]["title"] == "Song 0"
+    cursor = {
+        "after_position": data["next_after_position"],
+        "after_id": data["next_after_id"],
+    }
+    data = client.get(url, params={"limit": 2, **cursor}).json()
+    assert [v["id"] for v in data["videos"]] == [v2]
+    assert data["next_after_position"] is None
+    response = client.get(url, params={"after_position": 1024})
+    assert response.status_code == 400
+
+    def order():
+        return [v["id"] for v in client.get(url).json()["videos"]]
+
+    response = client.put(f"{url}/{v2}/position", json={"after_video_id": None})
+    assert response.json()["position"] == 0
+    assert order() == [v2, v0, v1]
+    client.put(f"{url}/{v0}/position", json={"after_video_id": v1})
+    assert order() == [v2, v1, v0]
+
+    # No room between neighbours: the playlist is renumbered before the move.
+    for video_id, position in ((v2, 1), (v1, 2), (v0, 3)):
+        db.get(PlaylistVideo, (playlist.id, video_id)).position = position
+    db.commit()
+    response = client.put(f"{url}/{v0}/position", json={"after_video_id": v2})
+    assert response.json()["position"] == 1536
+    assert order() == [v2, v0, v1]
+
+    assert (
+        client.put(f"{url}/{v0}/position", json={"after_video_id": v0}).status_code
+        == 400
+    )
+    assert (
+        client.put(
+            f"{url}/{inactive}/position", json={"after_video_id": v2}
+        ).status_code
+        == 404
+    )
+    assert (
+        client.put(f"{url}/{v0}/position", json={"after_video_id": 99999}).status_code
+        == 404
+    )
+
+    response = client.delete(url, params={"video_ids": [v1, 99999]})
+    assert response.json() == {"playlist_id": playlist.id, "removed": [v1]}
+    assert order() == [v2, v0]
+
+    response = client.post(f"/playlist/{user.id}/{playlist.id}/copy", json={})
+    assert response.status_code == 201
+    copy = response.json()
+    assert copy["name"] == "Mix (copy)"
+    copied = client.get(f"/playlist/{user.id}/{copy['id']}/videos").json()
+    assert [(v["id"], v["position"]) for v in copied["videos"]] == [
+        (v2, 1024),
+        (v0, 1536),
+    ]
+
+    assert client.get(f"/playlist/{user.id}/99999/videos").status_code == 404
+    assert (
+        client.post(
+            f"/playlist/99999/{playlist.id}/videos", json={"video_ids": [v0]}
+        ).status_code
+        == 404
+    )
+
+
+def test_playlist_videos_paginate_through_equal_positions(client, db):
+    user = User(
+        username="tied",
+        email="tied@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    db.add(user)
+    db.commit()
+    channel = Channel(name="Ties", owner_id=user.id, created_at=date.today())
+    playlist = Playlist(name="Tied", author_id=user.id, created_at=date.today())
+    db.add_all([channel, playlist])
+    db.commit()
+    videos = [
+        Video(title=f"Tie {i}", channel_id=channel.id, uploaded_at=date.today())
+        for i in range(5)
+    ]
+    db.add_all(videos)
+    db.commit()
+    db.add_all(
+        [
+            PlaylistVideo(playlist_id=playlist.id, video_id=video.id, position=1024)
+            for video in videos
+        ]
+    )
+    db.commit()
+
+    url = f"/playlist/{user.id}/{playlist.id}/videos"
+    seen, params = [], {"limit": 2}
+    while True:
+        data = client.get(url, params=params).json()
+        seen += [v["id"] for v in data["videos"]]
+        if data["next_after_position"] is None:
+            break
+        params = {
+            "limit": 2,
+            "after_position": data["next_after_position"],
+            "after_id": data["next_after_id"],
+        }
+    assert seen == sorted(video.id for video in videos)
+
+
+def test_user_playlists_with_previews(client, db):
+    user = User(
+        username="preview_tester",
+        email="test@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+    )
+    db.add(user)
+    db.commit()
+    channel = Channel(name="Previews", owner_id=user.id, created_at=date.today())
+    db.add(channel)
+    db.commit()
+    videos = [
+        Video(title=f"Clip {i}", channel_id=channel.id, uploaded_at=date.today())
+        for i in range(5)
+    ]
+    full = Playlist(name="Full", author_id=user.id, created_at=date.today())
+    empty = Playlist(name="Empty", author_id=user.id, created_at=date.today())
+    db.add_all([*videos, full, empty])
+    db.commit()
+    # Stored positions decide the order, not video ids.
+    db.add_all(
+        [
+            PlaylistVideo(
+                playlist_id=full.id, video_id=video.id, position=(5 - i) * 1024
+            )
+            for i, video in enumerate(videos)
+        ]
+    )
+    db.commit()
+
+    response = client.get(f"/playlist/{user.id}", params={"preview": 3})
+    assert response.status_code == 200
+    data = response.json()
+    assert [(p["name"], p["video_count"]) for p in data] == [("Full", 5), ("Empty", 0)]
+    assert data[0]["preview_videos"] == [
+        {"id": video.id, "title": video.title, "channel_id": channel.id}
+        for video in reversed(videos[2:])
+    ]
+    assert data[1]["preview_videos"] == []
+
+    data = client.get(f"/playlist/{user.id}").json()
+    assert len(data[0]["preview_videos"]) == 4
@@ -0,0 +1,390 @@
+import os
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.models import Base
+from app.utils.explain import (
+    CASES,
+    REPOSITORIES,
+    explain_case,
+    plan_nodes,
+    rolled_back_session,
+    seed,
+)
+
+SNAPSHOT_DIR = Path(__file__).parent / "plans"
+UPDATE_SNAPSHOTS = os.environ.get("UPDATE_PLAN_SNAPSHOTS") == "1"
+# Snapshots are recorded on the server compose.yml runs; planners of other majors differ.
+SNAPSHOT_SERVER_MAJOR = 18
+
+BIG_TABLES = {
+    "users",
+    "videos",
+    "views",
+    "comments",
+    "subscription",
+    "playlist_video",
+    "reports",
+    "feed_inbox",
+}
+
+POINT = 50.0
+RANGE = 1_000.0
+
+# case -> (indexes the plan must use, big tables it may scan sequentially, max total cost)
+EXPECTED: dict[str, tuple[set[str], set[str], float | None]] = {
+    "admin.get_video_by_id": ({"pk_videos"}, set(), POINT),
+    "admin.get_users_by_ids": ({"pk_users"}, set(), RANGE),
+    "admin.get_user_by_id": ({"pk_users"}, set(), POINT),
+    "admin.get_channel_by_id": ({"pk_channels"}, set(), POINT),
+    "admin.get_report_by_id": ({"pk_reports"}, set(), POINT),
+    "admin.add_channel_strike": (set(), set(), POINT),
+    "admin.get_channel_strikes_count": (
+        {"ix_channel_strikes_channel_id_expires_at"},
+        set(),
+        POINT,
+    ),
+    "admin.get_all_reports[unresolved]": (
+        {"ix_reports_unresolved_created_at"},
+        set(),
+        RANGE,
+    ),
+    # No index on reports.created_at for the unfiltered listing; top-N sort over all reports.
+    "admin.get_all_reports[all]": (set(), {"reports"}, None),
+    "admin.get_reports_with_details[unresolved]": (
+        {"ix_reports_unresolved_created_at", "pk_users", "pk_videos"},
+        set(),
+        RANGE,
+    ),
+    # Analytics aggregate over every report by design.
+    "admin.get_problematic_users": (set(), {"reports", "users"}, None),
+    "admin.get_channels_with_reports_analytics": (
+        set(),
+        {"reports", "videos", "users"},
+        None,
+    ),
+    "admin.deactivate_videos": ({"pk_videos"}, set(), RANGE),
+    "admin.demonetize_videos": ({"pk_videos"}, set(), RANGE),
+    "admin.ban_users": ({"pk_users"}, set(), RANGE),
+    "admin.resolve_reports": ({"pk_reports"}, set(), RANGE),
+    "admin.resolve_video_reports": ({"ix_reports_video_id", "pk_videos"}, set(), POINT),
+    "admin.import_subscriptions": ({"ix_users_active_id"}, set(), RANGE),
+    "admin.search_users": ({"ix_users_username_trgm"}, set(), RANGE),
+    "admin.search_channels": (set(), set(), RANGE),
+    "admin.search_channels[trigram]": ({"ix_channels_name_trgm"}, set(), RANGE),
+    "auth.get_user_by_username": ({"uq_users_username"}, set(), POINT),
+    "auth.get_user_by_email": ({"uq_users_email"}, set(), POINT),
+    "auth.create_user": (set(), set(), POINT),
+    "channel.get_stats": (
+        {"pk_channels", "pk_channel_stats", "ix_channel_strikes_channel_id_expires_at"},
+        set(),
+        POINT,
+    ),
+    "channel.get_subscriber_count": ({"pk_channel_stats"}, set(), POINT),
+    "channel.get_subscribers": (
+        {"ix_subscription_active_channel_id_user_id", "pk_users"},
+        set(),
+        RANGE,
+    ),
+    "channel.subscribe": (
+        {"pk_channels", "ix_users_active_id", "pk_channel_stats"},
+        set(),
+        POINT,
+    ),
+    "channel.unsubscribe": (
+        {
+            "ix_subscription_active_channel_id_user_id",
+            "ix_paid_subscriptions_channel_active",
+            "pk_channel_stats",
+        },
+        set(),
+        POINT,
+    ),
+    "channel.get_active_strikes": (
+        {"ix_channel_strikes_channel_id_expires_at"},
+        set(),
+        POINT,
+    ),
+    # One pass over paid_subscriptions per rebuilt month; it is not one of the big tables.
+    "channel.get_first_paid_month": (set(), set(), None),
+    "channel.rebuild_revenue_month": (set(), set(), None),
+    "channel.get_revenue": ({"pk_channel_revenue_monthly"}, set(), RANGE),
+    # Every active subscriber of each claimed video's channel by design.
+    "feed.fan_out": (
+        {"pk_feed_outbox", "pk_videos", "ix_subscription_active_channel_id_user_id"},
+        set(),
+        None,
+    ),
+    "feed.get_feed": (
+        {"pk_feed_inbox", "pk_subscription", "pk_feed_pulled", "pk_videos"},
+        set(),
+        RANGE,
+    ),
+    "job.try_lock": (set(), set(), POINT),
+    "job.get_watermark": (set(), set(), POINT),
+    "job.set_watermark": (set(), set(), POINT),
+    "playlist.get_user": ({"pk_users"}, set(), POINT),
+    "playlist.create": ({"pk_playlists"}, set(), POINT),
+    "playlist.get_all_by_user": (
+        {
+            "ix_playlists_author_id",
+            "ix_playlist_video_playlist_id_position",
+            "pk_videos",
+        },
+        set(),
+        RANGE,
+    ),
+    "playlist.get_by_id": ({"ix_playlists_author_id"}, set(), POINT),
+    "playlist.update": ({"pk_playlists"}, set(), POINT),
+    "playlist.delete": (
+        {"pk_playlists", "ix_playlist_video_playlist_id_position"},
+        set(),
+        RANGE,
+    ),
+    "playlist.duplicate": (set(), set(), RANGE),
+    "playlist.get_videos": ({"pk_playlist_video", "pk_videos"}, set(), RANGE),
+    "playlist.add_videos": (
+        {"pk_videos", "ix_playlist_video_playlist_id_position"},
+        set(),
+        RANGE,
+    ),
+    "playlist.remove_videos": (
+        {"ix_playlist_video_playlist_id_position"},
+        set(),
+        POINT,
+    ),
+    "playlist.get_move_bounds": (
+        {"ix_playlist_video_video_id", "ix_playlist_video_playlist_id_position"},
+        set(),
+        POINT,
+    ),
+    "playlist.set_position": ({"ix_playlist_video_video_id"}, set(), POINT),
+    "playlist.renumber": (set(), set(), RANGE),
+    "user.get_all_active": (set(), {"users"}, None),
+    "user.get_by_id[for_update]": ({"pk_users"}, set(), POINT),
+    "user.get_by_ids": ({"pk_users"}, set(), RANGE),
+    "user.exists_by_username": ({"uq_users_username"}, set(), POINT),
+    "user.exists_by_email": ({"uq_users_email"}, set(), POINT),
+    # The online fallback ranks every video by its total views.
+    "user.get_recommendations": (set(), {"views", "videos"}, None),
+    "user.get_precomputed_recommendations": (set(), set(), RANGE),
+    # The global top-N is taken over all videos once per batch.
+    "user.snapshot_video_view_totals+compute_recommendations_bulk": (
+        {"pk_views"},
+        {"videos"},
+        None,
+    ),
+    "user.replace_precomputed_recommendations": (set(), set(), RANGE),
+    "user.get_yearly_view_count": ({"ix_views_user_id_watched_at"}, set(), RANGE),
+    "user.get_favorite_creator": ({"pk_views", "pk_videos"}, set(), RANGE),
+    "user.get_avg_view_percentage": ({"ix_views_user_id_watched_at"}, set(), RANGE),
+    "user.get_yearly_reaction_counts": (
+        {"ix_comments_user_id", "ix_views_user_id_watched_at"},
+        set(),
+        RANGE,
+    ),
+    "user.get_history": ({"ix_views_user_id_watched_at", "pk_videos"}, set(), RANGE),
+    "user.get_continue_watching": (
+        {"ix_views_unfinished_user_id_watched_at", "pk_views", "pk_videos"},
+        set(),
+        RANGE,
+    ),
+    "user.get_credibility_data": ({"pk_users", "ix_reports_reporter_id"}, set(), RANGE),
+    "video.get_by_id[for_update]": ({"pk_videos"}, set(), POINT),
+    "video.get_by_ids": ({"pk_videos"}, set(), RANGE),
+    "video.get_with_channel": ({"pk_videos", "pk_channels"}, set(), POINT),
+    "video.get_active_by_ids": ({"pk_videos"}, set(), RANGE),
+    "video.search": ({"ix_videos_search_vector"}, set(), RANGE),
+    "video.get_active_texts": (set(), {"videos"}, None),
+    "video.create": ({"pk_videos"}, set(), POINT),
+    "video.delete": (
+        {
+            "pk_videos",
+            "ix_comments_video_id",
+            "ix_views_video_id",
+            "ix_playlist_video_video_id",
+        },
+        set(),
+        RANGE,
+    ),
+    "video.get_stats": ({"ix_views_video_id", "ix_comments_video_id"}, set(), RANGE),
+    # Cost grows with the number of ids times the number of monthly view partitions.
+    "video.get_stats_by_ids": (
+        {"pk_videos", "ix_views_video_id", "ix_comments_video_id"},
+        set(),
+        None,
+    ),
+    "video.set_reaction": (
+        {"pk_videos", "ix_users_active_id", "pk_views", "ix_views_video_id"},
+        set(),
+        RANGE,
+    ),
+    "video.clear_reaction": ({"pk_videos", "ix_views_video_id"}, set(), RANGE),
+    "video.get_comments": ({"ix_comments_video_id"}, set(), RANGE),
+    "video.create_comments": (set(), set(), POINT),
+    "video.create_with_comment": (set(), set(), POINT),
+    "video.add_trending_views": ({"ix_views_watched_at"}, set(), None),
+    "video.get_trending": (
+        {"ix_video_trending_scores_score", "pk_videos"},
+        set(),
+        RANGE,
+    ),
+    "view.get_partition_names": (set(), set(), None),
+    "view.get_default_partition_min_date": (set(), set(), POINT),
+    "view.create_partition": (set(), set(), POINT),
+    "view.detach_partition": (set(), set(), None),
+    # Each reacted pair probes every monthly partition for older reactions to clear.
+    "view.upsert_events": (
+        {"ix_users_active_id", "pk_videos", "pk_views"},
+        set(),
+        None,
+    ),
+    "view.upsert_progress": ({"ix_users_active_id", "pk_videos"}, set(), RANGE),
+}
+
+
+def plan_shape(node: dict, parents: dict[str, str], depth: int = 0) -> list[str]:
+    # Node types, indexes and relations only; costs and row estimates drift between runs.
+    label = node["Node Type"]
+    if "Index Name" in node:
+        label += f" using {parents.get(node['Index Name'], node['Index Name'])}"
+    if "Relation Name" in node:
+        label += f" on {parents.get(node['Relation Name'], node['Relation Name'])}"
+    children = [
+        tuple(plan_shape(child, parents, depth + 1)) for child in node.get("Plans", ())
+    ]
+    if node["Node Type"] in ("Append", "Merge Append"):
+        # One entry per distinct partition plan: how many partitions exist follows the calendar.
+        children = list(dict.fromkeys(children))
+    return [f"{'  ' * depth}{label}", *(line for child in children for line in child)]
+
+
+@pytest.fixture(scope="module")
+def seeded(db_engine):
+    with Session(db_engine) as db:
+        seed(db)
+    # Cases roll back their writes, and the dead rows they leave could otherwise let
+    # autovacuum refresh statistics mid-run and flip near-tie plans between runs.
+    with db_engine.begin() as conn:
+        tables = (
+            conn.execute(
+                text(
+                    "SELECT relname FROM pg_class "
+                    "WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace"
+                )
+            )
+            .scalars()
+            .all()
+        )
+        for table in tables:
+            conn.execute(
+                text(f'ALTER TABLE "{table}" SET (autovacuum_enabled = false)')
+            )
+    yield db_engine
+    with db_engine.begin() as conn:
+        tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+        conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+
+
+@pytest.fixture(scope="module")
+def server_major(seeded):
+    with seeded.connect() as conn:
+        return int(conn.execute(text("SHOW server_version_num")).scalar_one()) // 10_000
+
+
+@pytest.fixture(scope="module")
+def partition_parents(seeded):
+    # Partitions and their indexes, mapped to the partitioned table/index they belong to.
+    with seeded.connect() as conn:
+        return dict(
+            conn.execute(
+                text(
+                    "SELECT child.relname, parent.relname FROM pg_inherits "
+                    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                    "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent"
+                )
+            ).all()
+        )
+
+
+@pytest.fixture(scope="module")
+def empty_partitions(seeded):
+    # Partitions without rows (months ahead, the default one) are seq scanned at no cost;
+    # that says nothing about the query, so such scans are not held against it.
+    with seeded.connect() as conn:
+        return set(
+            conn.execute(
+                text(
+                    "SELECT child.relname FROM pg_inherits "
+                    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                    "WHERE child.relkind = 'r' AND child.reltuples <= 0"
+                )
+            ).scalars()
+        )
+
+
+def test_every_repository_method_has_a_case():
+    covered = {
+        (name.split(".", 1)[0], method.split("[", 1)[0])
+        for name in CASES
+        for method in name.split(".", 1)[1].split("+")
+    }
+    methods = {
+        (repository, method)
+        for repository, cls in REPOSITORIES.items()
+        for method, value in vars(cls).items()
+        if isinstance(value, staticmethod)
+    }
+    assert methods - covered == set()
+    assert set(EXPECTED) == set(CASES)
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_query_plan(seeded, server_major, partition_parents, empty_partitions, name):
+    indexes, seq_scans_allowed, max_cost = EXPECTED[name]
+    with rolled_back_session(seeded) as db:
+        plans = explain_case(db, CASES[name])
+
+    nodes = [node for plan in plans for node in plan_nodes(plan["Plan"])]
+    used = {
+        partition_parents.get(node["Index Name"], node["Index Name"])
+        for node in nodes
+        if "Index Name" in node
+    }
+    seq_scanned = {
+        partition_parents.get(node["Relation Name"], node["Relation Name"])
+        for node in nodes
+        if node["Node Type"] == "Seq Scan"
+        and node["Relation Name"] not in empty_partitions
+    }
+    assert indexes <= used, f"{name} no longer uses {indexes - used}"
+    assert seq_scanned & BIG_TABLES <= seq_scans_allowed, (
+        f"{name} seq scans {seq_scanned}"
+    )
+    if max_cost is not None:
+        cost = max(plan["Plan"]["Total Cost"] for plan in plans)
+        assert cost <= max_cost, f"{name} costs {cost:.2f}, ceiling {max_cost}"
+
+    shape = (
+        "\n\n".join(
+            "\n".join(plan_shape(plan["Plan"], partition_parents)) for plan in plans
+        )
+        + "\n"
+    )
+    snapshot = SNAPSHOT_DIR / f"{name}.txt"
+    assert server_major == SNAPSHOT_SERVER_MAJOR, (
+        f"plan snapshots are recorded on PostgreSQL {SNAPSHOT_SERVER_MAJOR}, "
+        f"server is {server_major}"
+    )
+    if UPDATE_SNAPSHOTS:
+        SNAPSHOT_DIR.mkdir(exist_ok=True)
+        snapshot.write_text(shape)
+    assert snapshot.exists(), (
+        f"no plan snapshot for {name}; rerun with UPDATE_PLAN_SNAPSHOTS=1"
+    )
+    assert shape == snapshot.read_text(), (
+        f"plan of {name} changed; review and rerun with UPDATE_PLAN_SNAPSHOTS=1"
+    )
@@ -1,6 +1,21 @@
 from datetime import date, datetime
 
-from app.db.models import User, Report, Channel, View, Video, Subscription, Comment
+from sqlalchemy import func, select
+
+from app.db.models import (
+    User,
+    Report,
+    Channel,
+    View,
+    Video,
+    Subscription,
+    Comment,
+    UserRecommendation,
+    FeedInbox,
+)
+from app.repositories.user import UserRepository
+from app.utils.feed import fan_out_videos
+from app.utils.recommendations import refresh_users
 
 
 def test_get_users(client, db):
@@ -33,7 +48,7 @@ def test_get_users(client, db):
     )
     db.add_all([user1, user2, deleted_user])
     db.commit()
-    
+
     response = client.get("/user/")
     assert response.status_code == 200
     data = response.json()
@@ -43,6 +58,18 @@ def test_get_users(client, db):
     assert "bob" in usernames
     assert "deleted" not in usernames
 
+    response = client.get("/user/?fields=username")
+    assert response.status_code == 200
+    users = response.json()["users"]
+    assert sorted(users, key=lambda u: u["id"]) == [
+        {"id": user1.id, "username": "alice"},
+        {"id": user2.id, "username": "bob"},
+    ]
+
+    response = client.get("/user/?fields=username,hashed_password")
+    assert response.status_code == 400
+
+
 def test_update_user(client, db):
     user = User(
         username="originaluser",
@@ -56,19 +83,20 @@ def test_update_user(client, db):
     db.add(user)
     db.commit()
 
-    response = client.patch(f"/user/{user.id}", json={
-        "username": "updateduser"
-    })
+    response = client.patch(f"/user/{user.id}", json={"username": "updateduser"})
     assert response.status_code == 200
     data = response.json()
     assert data["username"] == "updateduser"
     assert data["email"] == "original@example.com"
 
-    response = client.patch(f"/user/{user.id}", json={
-        "username": "finaluser",
-        "email": "final@example.com",
-        "is_moderator": True
-    })
+    response = client.patch(
+        f"/user/{user.id}",
+        json={
+            "username": "finaluser",
+            "email": "final@example.com",
+            "is_moderator": True,
+        },
+    )
     assert response.status_code == 200
     data = response.json()
     assert data["username"] == "finaluser"
@@ -86,25 +114,20 @@ def test_update_user(client, db):
     )
     db.add(other_user)
     db.commit()
-    
-    response = client.patch(f"/user/{user.id}", json={
-        "username": "otheruser"
-    })
+
+    response = client.patch(f"/user/{user.id}", json={"username": "otheruser"})
     assert response.status_code == 400
 
-    response = client.patch("/user/99999", json={
-        "username": "newname"
-    })
+    response = client.patch("/user/99999", json={"username": "newname"})
     assert response.status_code == 404
 
     user.is_deleted = True
     db.commit()
-    
-    response = client.patch(f"/user/{user.id}", json={
-        "username": "nope"
-    })
+
+    response = client.patch(f"/user/{user.id}", json={"username": "nope"})
     assert response.status_code == 410
 
+
 def test_concurrent_user_update(client, db):
     user = User(
         username="concurrentuser",
@@ -127,6 +150,7 @@ def test_concurrent_user_update(client, db):
     db.refresh(user)
     assert user.username == "user2"
 
+
 def test_soft_delete_user(client, db):
     user = User(
         username="deleteuser",
@@ -150,14 +174,13 @@ def test_soft_delete_user(client, db):
     response = client.delete(f"/user/{user_id}")
     assert response.status_code == 410
 
-    response = client.patch(f"/user/{user_id}", json={
-        "username": "newname"
-    })
+    response = client.patch(f"/user/{user_id}", json={"username": "newname"})
     assert response.status_code == 410
 
     response = client.delete("/user/99999")
     assert response.status_code == 404
 
+
 def test_recommendations(client, db):
     """Test that recommendations respect priority order: watched channels > subscriptions > total views"""
 
@@ -175,27 +198,73 @@ def test_recommendations(client, db):
     )
     db.add(deleted_user)
     db.commit()
-    
+
     response = client.get(f"/user/{deleted_user.id}/recommendations")
     assert response.status_code == 410
 
-    viewer = User(username="viewer", email="viewer@example.com", hashed_password="fake_hash", created_at=date.today(), is_moderator=False, is_deleted=False, is_banned=False)
-    creator1 = User(username="creator1", email="creator1@example.com", hashed_password="fake_hash", created_at=date.today(), is_moderator=False, is_deleted=False, is_banned=False)
-    creator2 = User(username="creator2", email="creator2@example.com", hashed_password="fake_hash", created_at=date.today(), is_moderator=False, is_deleted=False, is_banned=False)
-    creator3 = User(username="creator3", email="creator3@example.com", hashed_password="fake_hash", created_at=date.today(), is_moderator=False, is_deleted=False, is_banned=False)
+    viewer = User(
+        username="viewer",
+        email="viewer@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
+    creator1 = User(
+        username="creator1",
+        email="creator1@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
+    creator2 = User(
+        username="creator2",
+        email="creator2@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
+    creator3 = User(
+        username="creator3",
+        email="creator3@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
     db.add_all([viewer, creator1, creator2, creator3])
     db.commit()
 
-    channel1 = Channel(name="Most Watched Channel", created_at=date.today(), owner_id=creator1.id)
-    channel2 = Channel(name="Subscribed Channel", created_at=date.today(), owner_id=creator2.id)
-    channel3 = Channel(name="Popular Channel", created_at=date.today(), owner_id=creator3.id)
+    channel1 = Channel(
+        name="Most Watched Channel", created_at=date.today(), owner_id=creator1.id
+    )
+    channel2 = Channel(
+        name="Subscribed Channel", created_at=date.today(), owner_id=creator2.id
+    )
+    channel3 = Channel(
+        name="Popular Channel", created_at=date.today(), owner_id=creator3.id
+    )
     db.add_all([channel1, channel2, channel3])
     db.commit()
 
-    video1_ch1 = Video(title="Watched Video 1", channel_id=channel1.id, uploaded_at=date.today())
-    video2_ch1 = Video(title="Watched Video 2", channel_id=channel1.id, uploaded_at=date.today())
-    video1_ch2 = Video(title="Subscribed Video", channel_id=channel2.id, uploaded_at=date.today())
-    video1_ch3 = Video(title="Popular Video", channel_id=channel3.id, uploaded_at=date.today())
+    video1_ch1 = Video(
+        title="Watched Video 1", channel_id=channel1.id, uploaded_at=date.today()
+    )
+    video2_ch1 = Video(
+        title="Watched Video 2", channel_id=channel1.id, uploaded_at=date.today()
+    )
+    video1_ch2 = Video(
+        title="Subscribed Video", channel_id=channel2.id, uploaded_at=date.today()
+    )
+    video1_ch3 = Video(
+        title="Popular Video", channel_id=channel3.id, uploaded_at=date.today()
+    )
     db.add_all([video1_ch1, video2_ch1, video1_ch2, video1_ch3])
     db.commit()
 
@@ -208,35 +277,81 @@ def test_recommendations(client, db):
     db.add(subscription)
     db.commit()
 
-    other_user1 = User(username="other1", email="other1@example.com", hashed_password="fake_hash", created_at=date.today(), is_moderator=False, is_deleted=False, is_banned=False)
-    other_user2 = User(username="other2", email="other2@example.com", hashed_password="fake_hash", created_at=date.today(), is_moderator=False, is_deleted=False, is_banned=False)
-    other_user3 = User(username="other3", email="other3@example.com", hashed_password="fake_hash", created_at=date.today(), is_moderator=False, is_deleted=False, is_banned=False)
+    other_user1 = User(
+        username="other1",
+        email="other1@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
+    other_user2 = User(
+        username="other2",
+        email="other2@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
+    other_user3 = User(
+        username="other3",
+        email="other3@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
     db.add_all([other_user1, other_user2, other_user3])
     db.commit()
-    
-    view_ch1_v2_1 = View(user_id=other_user1.id, video_id=video2_ch1.id, watched_at=date.today())
-    view_ch1_v2_2 = View(user_id=other_user2.id, video_id=video2_ch1.id, watched_at=date.today())
-    view_ch1_v1_1 = View(user_id=other_user3.id, video_id=video1_ch1.id, watched_at=date.today())
-    
-    view_popular1 = View(user_id=other_user1.id, video_id=video1_ch3.id, watched_at=date.today())
-    view_popular2 = View(user_id=other_user2.id, video_id=video1_ch3.id, watched_at=date.today())
-    view_popular3 = View(user_id=other_user3.id, video_id=video1_ch3.id, watched_at=date.today())
-    
-    db.add_all([view_ch1_v2_1, view_ch1_v2_2, view_ch1_v1_1, view_popular1, view_popular2, view_popular3])
+
+    view_ch1_v2_1 = View(
+        user_id=other_user1.id, video_id=video2_ch1.id, watched_at=date.today()
+    )
+    view_ch1_v2_2 = View(
+        user_id=other_user2.id, video_id=video2_ch1.id, watched_at=date.today()
+    )
+    view_ch1_v1_1 = View(
+        user_id=other_user3.id, video_id=video1_ch1.id, watched_at=date.today()
+    )
+
+    view_popular1 = View(
+        user_id=other_user1.id, video_id=video1_ch3.id, watched_at=date.today()
+    )
+    view_popular2 = View(
+        user_id=other_user2.id, video_id=video1_ch3.id, watched_at=date.today()
+    )
+    view_popular3 = View(
+        user_id=other_user3.id, video_id=video1_ch3.id, watched_at=date.today()
+    )
+
+    db.add_all(
+        [
+            view_ch1_v2_1,
+            view_ch1_v2_2,
+            view_ch1_v1_1,
+            view_popular1,
+            view_popular2,
+            view_popular3,
+        ]
+    )
     db.commit()
 
     response = client.get(f"/user/{viewer.id}/recommendations?limit=10")
-    
+
     assert response.status_code == 200
     videos = response.json()["videos"]
-    
+
     video_ids = [v["id"] for v in videos]
-    
+
     assert video_ids[0] == video2_ch1.id
     assert video_ids[1] == video1_ch1.id
     assert video_ids[2] == video1_ch2.id
     assert video_ids[3] == video1_ch3.id
 
+
 def test_user_credibility(client, db):
     reporter = User(
         username="reporter",
@@ -262,7 +377,7 @@ def test_user_credibility(client, db):
     channel = Channel(name="Test Channel", created_at=date.today(), owner=creator)
     db.add(channel)
     db.commit()
-    
+
     video = Video(title="Test Video", channel=channel, uploaded_at=date.today())
     db.add(video)
     db.commit()
@@ -281,7 +396,7 @@ def test_user_credibility(client, db):
 
     response = client.get(f"/user/{reporter.id}/credibility")
     assert response.status_code == 200
-    
+
     data = response.json()
     assert data["user_id"] == reporter.id
     assert data["username"] == "reporter"
@@ -291,7 +406,7 @@ def test_user_credibility(client, db):
 
     response = client.get(f"/user/{creator.id}/credibility")
     assert response.status_code == 200
-    
+
     data = response.json()
     assert data["user_id"] == creator.id
     assert data["username"] == "creator"
@@ -304,16 +419,17 @@ def test_user_credibility(client, db):
 
     reporter.is_deleted = True
     db.commit()
-    
+
     response = client.get(f"/user/{reporter.id}/credibility")
     assert response.status_code == 410
 
+
 def test_get_user_year_views(client, db):
     user = User(
-        username="stats_user_1", 
-        email="stats1@example.com", 
-        hashed_password="fake_hash", 
-        created_at=date.today()
+        username="stats_user_1",
+        email="stats1@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
     )
     db.add(user)
     db.commit()
@@ -321,34 +437,26 @@ def test_get_user_year_views(client, db):
     channel = Channel(name="TechChannel", owner_id=user.id, created_at=date.today())
     db.add(channel)
     db.commit()
-    
+
     video = Video(title="Video 1", channel_id=channel.id, uploaded_at=date.today())
     db.add(video)
     db.commit()
 
-    view_current = View(
-        user_id=user.id, 
-        video_id=video.id, 
-        watched_at=date.today()
-    )
+    view_current = View(user_id=user.id, video_id=video.id, watched_at=date.today())
     last_year_date = date(datetime.now().year - 1, 1, 1)
-    
+
     video2 = Video(title="Video 2", channel_id=channel.id, uploaded_at=last_year_date)
     db.add(video2)
     db.commit()
 
-    view_old = View(
-        user_id=user.id, 
-        video_id=video2.id, 
-        watched_at=last_year_date
-    )
-    
+    view_old = View(user_id=user.id, video_id=video2.id, watched_at=last_year_date)
+
     db.add_all([view_current, view_old])
     db.commit()
 
     response = client.get(f"/user/{user.id}/views")
     assert response.status_code == 200
-    
+
     data = response.json()
     assert data["user_id"] == user.id
     assert data["total_views"] == 1
@@ -356,9 +464,24 @@ def test_get_user_year_views(client, db):
 
 
 def test_get_user_favorite_creator(client, db):
-    user = User(username="stats_user_2", email="stats2@example.com", hashed_password="fake_hash", created_at=date.today())
-    creator1 = User(username="creator_1", email="c1@example.com", hashed_password="fake_hash", created_at=date.today())
-    creator2 = User(username="creator_2", email="c2@example.com", hashed_password="fake_hash", created_at=date.today())
+    user = User(
+        username="stats_user_2",
+        email="stats2@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    creator1 = User(
+        username="creator_1",
+        email="c1@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    creator2 = User(
+        username="creator_2",
+        email="c2@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
     db.add_all([user, creator1, creator2])
     db.commit()
 
@@ -381,76 +504,443 @@ def test_get_user_favorite_creator(client, db):
 
     response = client.get(f"/user/{user.id}/favoriteCreator")
     assert response.status_code == 200
-    
+
     data = response.json()
     assert data["favorite_creator"] == "GamingHub"
     assert data["videos_watched"] == 2
 
-    user_empty = User(username="empty", email="empty@example.com", hashed_password="fake_hash", created_at=date.today())
+    user_empty = User(
+        username="empty",
+        email="empty@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
     db.add(user_empty)
     db.commit()
-    
+
     response = client.get(f"/user/{user_empty.id}/favoriteCreator")
     assert response.status_code == 200
     assert response.json()["favorite_creator"] is None
 
 
 def test_get_user_year_reactions(client, db):
-    user = User(username="stats_user_3", email="stats3@example.com", hashed_password="fake_hash", created_at=date.today())
+    user = User(
+        username="stats_user_3",
+        email="stats3@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
     db.add(user)
     db.commit()
-    
+
     chan = Channel(name="ReactChan", owner_id=user.id, created_at=date.today())
     db.add(chan)
     db.commit()
-    
+
     video = Video(title="React Video", channel_id=chan.id, uploaded_at=date.today())
     video2 = Video(title="React Video 2", channel_id=chan.id, uploaded_at=date.today())
     db.add_all([video, video2])
     db.commit()
 
-    c1 = Comment(comment_text="Nice", user_id=user.id, video_id=video.id, commented_at=date.today())
-    v1 = View(user_id=user.id, video_id=video.id, watched_at=date.today(), reaction="LIKE")
-    
+    c1 = Comment(
+        comment_text="Nice",
+        user_id=user.id,
+        video_id=video.id,
+        commented_at=date.today(),
+    )
+    v1 = View(
+        user_id=user.id, video_id=video.id, watched_at=date.today(), reaction="LIKE"
+    )
+
     db.add_all([c1, v1])
     db.commit()
 
     response = client.get(f"/user/{user.id}/reactions")
     assert response.status_code == 200
-    
+
     data = response.json()
     assert data["total_reactions"] == 2
 
 
 def test_get_user_avg_view_time(client, db):
-    user = User(username="stats_user_4", email="stats4@example.com", hashed_password="fake_hash", created_at=date.today())
+    user = User(
+        username="stats_user_4",
+        email="stats4@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
     db.add(user)
     db.commit()
-    
+
     chan = Channel(name="AvgChan", owner_id=user.id, created_at=date.today())
     db.add(chan)
     db.commit()
-    
+
     video1 = Video(title="Avg Video 1", channel_id=chan.id, uploaded_at=date.today())
     video2 = Video(title="Avg Video 2", channel_id=chan.id, uploaded_at=date.today())
     db.add_all([video1, video2])
     db.commit()
 
-    v1 = View(user_id=user.id, video_id=video1.id, watched_at=date.today(), watched_percentage=0.50)
-    v2 = View(user_id=user.id, video_id=video2.id, watched_at=date.today(), watched_percentage=1.00)
-    
+    v1 = View(
+        user_id=user.id,
+        video_id=video1.id,
+        watched_at=date.today(),
+        watched_percentage=0.50,
+    )
+    v2 = View(
+        user_id=user.id,
+        video_id=video2.id,
+        watched_at=date.today(),
+        watched_percentage=1.00,
+    )
+
     db.add_all([v1, v2])
     db.commit()
 
     response = client.get(f"/user/{user.id}/averageViewTime")
     assert response.status_code == 200
-    
+
     data = response.json()
     assert data["average_view_percents"] == 75.0
 
-    user_new = User(username="noviews", email="noviews@example.com", hashed_password="fake_hash", created_at=date.today())
+    user_new = User(
+        username="noviews",
+        email="noviews@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
     db.add(user_new)
     db.commit()
-    
+
     response = client.get(f"/user/{user_new.id}/averageViewTime")
-    assert response.json()["average_view_percents"] == 0.0
\ No newline at end of file
+    assert response.json()["average_view_percents"] == 0.0
+
+
+def test_precomputed_recommendations(client, db):
+    viewer = User(
+        username="viewer",
+        email="viewer@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    cold = User(
+        username="cold",
+        email="cold@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    creator = User(
+        username="creator",
+        email="creator@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    others = [
+        User(
+            username=f"other{i}",
+            email=f"other{i}@example.com",
+            hashed_password="fake_hash",
+            created_at=date.today(),
+        )
+        for i in range(3)
+    ]
+    db.add_all([viewer, cold, creator, *others])
+    db.commit()
+
+    watched_channel = Channel(
+        name="Watched Channel", owner_id=creator.id, created_at=date.today()
+    )
+    popular_channel = Channel(
+        name="Popular Channel", owner_id=creator.id, created_at=date.today()
+    )
+    db.add_all([watched_channel, popular_channel])
+    db.commit()
+
+    a1 = Video(title="A1", channel_id=watched_channel.id, uploaded_at=date.today())
+    a2 = Video(title="A2", channel_id=watched_channel.id, uploaded_at=date.today())
+    b1 = Video(title="B1", channel_id=popular_channel.id, uploaded_at=date.today())
+    b2 = Video(title="B2", channel_id=popular_channel.id, uploaded_at=date.today())
+    db.add_all([a1, a2, b1, b2])
+    db.commit()
+
+    db.add_all(
+        [
+            View(user_id=viewer.id, video_id=a1.id),
+            View(user_id=others[0].id, video_id=a1.id),
+            *[View(user_id=other.id, video_id=b1.id) for other in others],
+            View(user_id=others[0].id, video_id=b2.id),
+        ]
+    )
+    db.commit()
+
+    UserRepository.snapshot_video_view_totals(db)
+    refresh_users(db, [viewer.id])
+    db.commit()
+
+    stored = (
+        db.execute(
+            select(UserRecommendation.video_id)
+            .where(UserRecommendation.user_id == viewer.id)
+            .order_by(UserRecommendation.rank)
+        )
+        .scalars()
+        .all()
+    )
+    online = [v.id for v in UserRepository.get_recommendations(db, viewer.id, 10)]
+    assert stored == online == [a1.id, a2.id, b1.id, b2.id]
+
+    UserRepository.replace_precomputed_recommendations(
+        db,
+        [viewer.id],
+        [
+            (viewer.id, rank, video_id)
+            for rank, video_id in enumerate(reversed(stored), 1)
+        ],
+    )
+    db.commit()
+
+    response = client.get(f"/user/{viewer.id}/recommendations?limit=3")
+    assert response.status_code == 200
+    assert [v["id"] for v in response.json()["videos"]] == [b2.id, b1.id, a2.id]
+
+    response = client.get(f"/user/{cold.id}/recommendations")
+    assert response.status_code == 200
+    assert [v["id"] for v in response.json()["videos"]] == [b1.id, a1.id, b2.id, a2.id]
+
+
+def test_user_feed(client, db, monkeypatch):
+    # Channels with more than one subscriber are merged at read time instead of fanned out.
+    monkeypatch.setattr("app.utils.feed.FANOUT_MAX_SUBSCRIBERS", 1)
+    viewer = User(
+        username="viewer",
+        email="viewer@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    fan = User(
+        username="fan",
+        email="fan@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    creator = User(
+        username="creator",
+        email="creator@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    db.add_all([viewer, fan, creator])
+    db.commit()
+
+    small = Channel(name="Small Channel", owner_id=creator.id, created_at=date.today())
+    large = Channel(name="Large Channel", owner_id=creator.id, created_at=date.today())
+    db.add_all([small, large])
+    db.commit()
+    db.add_all(
+        [
+            Subscription(user_id=viewer.id, channel_id=small.id),
+            Subscription(user_id=viewer.id, channel_id=large.id),
+            Subscription(user_id=fan.id, channel_id=large.id),
+        ]
+    )
+    db.commit()
+
+    s1 = Video(title="S1", channel_id=small.id, uploaded_at=date(2026, 1, 1))
+    l1 = Video(title="L1", channel_id=large.id, uploaded_at=date(2026, 1, 2))
+    s2 = Video(title="S2", channel_id=small.id, uploaded_at=date(2026, 1, 3))
+    l2 = Video(title="L2", channel_id=large.id, uploaded_at=date(2026, 1, 4))
+    hidden = Video(
+        title="Hidden",
+        channel_id=small.id,
+        uploaded_at=date(2026, 1, 5),
+        is_active=False,
+    )
+    db.add_all([s1, l1, s2, l2, hidden])
+    db.commit()
+
+    assert fan_out_videos(db) == 5
+    inbox = db.execute(select(FeedInbox.user_id, FeedInbox.video_id)).all()
+    assert sorted(inbox) == sorted((viewer.id, video.id) for video in (s1, s2, hidden))
+
+    response = client.get(f"/user/{viewer.id}/feed", params={"limit": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert [v["id"] for v in data["videos"]] == [l2.id, s2.id]
+    assert (data["next_after_date"], data["next_after_id"]) == ("2026-01-03", s2.id)
+
+    data = client.get(
+        f"/user/{viewer.id}/feed",
+        params={
+            "limit": 2,
+            "after_date": data["next_after_date"],
+            "after_id": data["next_after_id"],
+        },
+    ).json()
+    assert [v["id"] for v in data["videos"]] == [l1.id, s1.id]
+
+    assert [v["id"] for v in client.get(f"/user/{fan.id}/feed").json()["videos"]] == [
+        l2.id,
+        l1.id,
+    ]
+
+    client.delete(f"/channel/{small.id}/subscribe", params={"user_id": viewer.id})
+    data = client.get(f"/user/{viewer.id}/feed").json()
+    assert [v["id"] for v in data["videos"]] == [l2.id, l1.id]
+    assert data["next_after_id"] is None
+
+    response = client.get(f"/user/{viewer.id}/feed", params={"after_id": s2.id})
+    assert response.status_code == 400
+    response = client.get("/user/99999/feed")
+    assert response.status_code == 404
+
+
+def test_user_feed_keeps_videos_after_channel_shrinks(client, db, monkeypatch):
+    monkeypatch.setattr("app.utils.feed.FANOUT_MAX_SUBSCRIBERS", 1)
+    viewer = User(
+        username="viewer",
+        email="viewer@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    fan = User(
+        username="fan",
+        email="fan@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    db.add_all([viewer, fan])
+    db.commit()
+    channel = Channel(
+        name="Shrinking Channel", owner_id=fan.id, created_at=date.today()
+    )
+    db.add(channel)
+    db.commit()
+    db.add_all(
+        [Subscription(user_id=user.id, channel_id=channel.id) for user in (viewer, fan)]
+    )
+    db.commit()
+
+    # Uploaded while the channel is above the threshold: merged at read time.
+    first = Video(title="First", channel_id=channel.id, uploaded_at=date(2026, 1, 1))
+    db.add(first)
+    db.commit()
+    fan_out_videos(db)
+    assert db.scalar(select(func.count()).select_from(FeedInbox)) == 0
+
+    # Dropping to the threshold keeps the earlier video and fans out the next one.
+    client.delete(f"/channel/{channel.id}/subscribe", params={"user_id": fan.id})
+    second = Video(title="Second", channel_id=channel.id, uploaded_at=date(2026, 1, 2))
+    db.add(second)
+    db.commit()
+    fan_out_videos(db)
+    assert db.execute(select(FeedInbox.user_id, FeedInbox.video_id)).all() == [
+        (viewer.id, second.id)
+    ]
+    data = client.get(f"/user/{viewer.id}/feed").json()
+    assert [v["id"] for v in data["videos"]] == [second.id, first.id]
+
+
+def test_watch_history_and_continue_watching(client, db):
+    viewer = User(
+        username="viewer",
+        email="viewer@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    creator = User(
+        username="creator",
+        email="creator@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    db.add_all([viewer, creator])
+    db.commit()
+    channel = Channel(
+        name="History Channel", owner_id=creator.id, created_at=date.today()
+    )
+    db.add(channel)
+    db.commit()
+    a, b, c, d, e, f = videos = [
+        Video(
+            title=title,
+            channel_id=channel.id,
+            uploaded_at=date(2025, 12, 1),
+            is_active=title != "D",
+        )
+        for title in "ABCDEF"
+    ]
+    db.add_all(videos)
+    db.commit()
+
+    def view(video, day, percentage, reaction=None):
+        return View(
+            user_id=viewer.id,
+            video_id=video.id,
+            watched_at=date(2026, 1, day),
+            watched_percentage=percentage,
+            reaction=reaction,
+        )
+
+    db.add_all(
+        [
+            view(a, 1, 0.5),
+            view(a, 3, 1.0),  # finished on a later view
+            view(b, 2, 0.4),
+            view(c, 4, 0.96),  # past the completion threshold
+            view(d, 6, 0.3),  # inactive video
+            view(e, 5, 0.0, "Liked"),  # reacted without watching
+            view(f, 3, 0.2),
+            view(f, 4, 0.6),
+        ]
+    )
+    db.commit()
+
+    response = client.get(f"/user/{viewer.id}/history", params={"limit": 3})
+    assert response.status_code == 200
+    data = response.json()
+    assert [(h["video_id"], h["watched_at"]) for h in data["history"]] == [
+        (e.id, "2026-01-05"),
+        (f.id, "2026-01-04"),
+        (c.id, "2026-01-04"),
+    ]
+    assert (data["next_after_date"], data["next_after_id"]) == ("2026-01-04", c.id)
+
+    data = client.get(
+        f"/user/{viewer.id}/history",
+        params={
+            "limit": 3,
+            "after_date": data["next_after_date"],
+            "after_id": data["next_after_id"],
+        },
+    ).json()
+    assert [(h["video_id"], h["watched_at"]) for h in data["history"]] == [
+        (f.id, "2026-01-03"),
+        (a.id, "2026-01-03"),
+        (b.id, "2026-01-02"),
+    ]
+    data = client.get(
+        f"/user/{viewer.id}/history",
+        params={
+            "limit": 3,
+            "after_date": data["next_after_date"],
+            "after_id": data["next_after_id"],
+        },
+    ).json()
+    assert [h["video_id"] for h in data["history"]] == [a.id]
+    assert data["next_after_id"] is None
+
+    response = client.get(f"/user/{viewer.id}/continue-watching")
+    assert response.status_code == 200
+    assert [
+        (v["video_id"], v["watched_percentage"]) for v in response.json()["videos"]
+    ] == [
+        (f.id, 0.6),
+        (b.id, 0.4),
+    ]
+
+    response = client.get(
+        f"/user/{viewer.id}/history", params={"after_date": "2026-01-04"}
+    )
+    assert response.status_code == 400
+    response = client.get("/user/99999/continue-watching")
+    assert response.status_code == 404
@@ -1,12 +1,29 @@
-from datetime import date
-from sqlalchemy import select, func
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select, func, text
 from app.db.models import Video, Channel, User, Comment, View
+from app.repositories.view import ViewRepository
+from app.utils.partitions import maintain_view_partitions
+from app.utils.trending import HALF_LIFE_DAYS, refresh_trending_scores
+from app.utils.view_events import view_event_buffer, view_progress_buffer
+
+
+@pytest.fixture
+def restore_view_partitions(db):
+    # Partitions created by a test would otherwise outlive it and change later plans.
+    before = set(ViewRepository.get_partition_names(db))
+    yield
+    db.rollback()
+    for name in set(ViewRepository.get_partition_names(db)) - before:
+        db.execute(text(f"DROP TABLE {name}"))
+    db.commit()
 
 
 def test_get_video(client, db):
     response = client.get("/video/99999")
     assert response.status_code == 404
-    
+
     user = User(
         username="testuser",
         email="test@example.com",
@@ -18,11 +35,11 @@ def test_get_video(client, db):
     )
     db.add(user)
     db.commit()
-    
+
     channel = Channel(name="Test Channel", owner_id=user.id, created_at=date.today())
     db.add(channel)
     db.commit()
-    
+
     video = Video(
         title="Test Video",
         description="Test Description",
@@ -33,7 +50,7 @@ def test_get_video(client, db):
     )
     db.add(video)
     db.commit()
-    
+
     response = client.get(f"/video/{video.id}")
     assert response.status_code == 200
     data = response.json()
@@ -41,6 +58,24 @@ def test_get_video(client, db):
     assert data["title"] == "Test Video"
     assert data["channel_id"] == channel.id
 
+    response = client.get(f"/video/{video.id}?fields=title,uploaded_at")
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": video.id,
+        "title": "Test Video",
+        "uploaded_at": date.today().isoformat(),
+    }
+
+    response = client.get(f"/video/?ids={video.id}&fields=title")
+    assert response.status_code == 200
+    assert response.json() == {
+        "videos": [{"id": video.id, "title": "Test Video"}],
+        "missing": [],
+    }
+
+    response = client.get(f"/video/{video.id}?fields=title,views")
+    assert response.status_code == 400
+
 
 def test_create_video(client, db):
     video_data = {
@@ -50,7 +85,7 @@ def test_create_video(client, db):
     }
     response = client.post("/video/", json=video_data)
     assert response.status_code == 404
-    
+
     user = User(
         username="testuser",
         email="test@example.com",
@@ -62,11 +97,11 @@ def test_create_video(client, db):
     )
     db.add(user)
     db.commit()
-    
+
     channel = Channel(name="Test Channel", owner_id=user.id, created_at=date.today())
     db.add(channel)
     db.commit()
-    
+
     video_data = {
         "title": "New Video",
         "description": "New Description",
@@ -80,7 +115,7 @@ def test_create_video(client, db):
     assert data["title"] == "New Video"
     assert data["is_active"] is True
     assert data["is_monetized"] is True
-    
+
     video_data_defaults = {
         "title": "Video with Defaults",
         "channel_id": channel.id,
@@ -93,15 +128,29 @@ def test_create_video(client, db):
 
 
 def test_update_video(client, db):
-    user = User(username="testuser", email="test@example.com", hashed_password="fake_hash", created_at=date.today(), is_moderator=False, is_deleted=False, is_banned=False)
+    user = User(
+        username="testuser",
+        email="test@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
     db.add(user)
     db.commit()
-    
+
     channel = Channel(name="Test Channel", owner_id=user.id, created_at=date.today())
     db.add(channel)
     db.commit()
-    
-    video = Video(title="Original", channel_id=channel.id, uploaded_at=date.today(), is_active=True, is_monetized=False)
+
+    video = Video(
+        title="Original",
+        channel_id=channel.id,
+        uploaded_at=date.today(),
+        is_active=True,
+        is_monetized=False,
+    )
     db.add(video)
     db.commit()
 
@@ -115,10 +164,11 @@ def test_update_video(client, db):
     assert video.is_active is False
     assert video.is_monetized is True
 
+
 def test_delete_video(client, db):
     response = client.delete("/video/99999")
     assert response.status_code == 404
-    
+
     user = User(
         username="testuser",
         email="test@example.com",
@@ -130,11 +180,11 @@ def test_delete_video(client, db):
     )
     db.add(user)
     db.commit()
-    
+
     channel = Channel(name="Test Channel", owner_id=user.id, created_at=date.today())
     db.add(channel)
     db.commit()
-    
+
     video = Video(
         title="Test Video",
         channel_id=channel.id,
@@ -143,11 +193,11 @@ def test_delete_video(client, db):
     db.add(video)
     db.commit()
     video_id = video.id
-    
+
     response = client.delete(f"/video/{video_id}")
     assert response.status_code == 204
     assert db.get(Video, video_id) is None
-    
+
     response = client.delete(f"/video/{video_id}")
     assert response.status_code == 404
 
@@ -155,21 +205,45 @@ def test_delete_video(client, db):
 def test_get_video_stats(client, db):
     response = client.get("/video/99999/stats")
     assert response.status_code == 404
-    
-    user1 = User(username="user1", email="user1@example.com", hashed_password="fake_hash", created_at=date.today(), is_moderator=False, is_deleted=False, is_banned=False)
-    user2 = User(username="user2", email="user2@example.com", hashed_password="fake_hash", created_at=date.today(), is_moderator=False, is_deleted=False, is_banned=False)
-    user3 = User(username="user3", email="user3@example.com", hashed_password="fake_hash", created_at=date.today(), is_moderator=False, is_deleted=False, is_banned=False)
+
+    user1 = User(
+        username="user1",
+        email="user1@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
+    user2 = User(
+        username="user2",
+        email="user2@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
+    user3 = User(
+        username="user3",
+        email="user3@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
     db.add_all([user1, user2, user3])
     db.commit()
-    
+
     channel = Channel(name="Test Channel", owner_id=user1.id, created_at=date.today())
     db.add(channel)
     db.commit()
-    
+
     video = Video(title="Test Video", channel_id=channel.id, uploaded_at=date.today())
     db.add(video)
     db.commit()
-    
+
     response = client.get(f"/video/{video.id}/stats")
     assert response.status_code == 200
     data = response.json()
@@ -178,16 +252,31 @@ def test_get_video_stats(client, db):
     assert data["likes"] == 0
     assert data["dislikes"] == 0
     assert data["total_comments"] == 0
-    
+
     view1 = View(user_id=user1.id, video_id=video.id, reaction="Liked")
     view2 = View(user_id=user2.id, video_id=video.id, reaction="Liked")
     view3 = View(user_id=user3.id, video_id=video.id, reaction="Disliked")
-    comment1 = Comment(comment_text="Great!", user_id=user1.id, video_id=video.id, commented_at=date.today())
-    comment2 = Comment(comment_text="Nice!", user_id=user2.id, video_id=video.id, commented_at=date.today())
-    comment3 = Comment(comment_text="Cool!", user_id=user3.id, video_id=video.id, commented_at=date.today())
+    comment1 = Comment(
+        comment_text="Great!",
+        user_id=user1.id,
+        video_id=video.id,
+        commented_at=date.today(),
+    )
+    comment2 = Comment(
+        comment_text="Nice!",
+        user_id=user2.id,
+        video_id=video.id,
+        commented_at=date.today(),
+    )
+    comment3 = Comment(
+        comment_text="Cool!",
+        user_id=user3.id,
+        video_id=video.id,
+        commented_at=date.today(),
+    )
     db.add_all([view1, view2, view3, comment1, comment2, comment3])
     db.commit()
-    
+
     response = client.get(f"/video/{video.id}/stats")
     assert response.status_code == 200
     data = response.json()
@@ -197,22 +286,109 @@ def test_get_video_stats(client, db):
     assert data["total_comments"] == 3
 
 
+def test_get_videos_and_stats_by_ids(client, db):
+    user1 = User(
+        username="user1",
+        email="user1@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
+    user2 = User(
+        username="user2",
+        email="user2@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
+    db.add_all([user1, user2])
+    db.commit()
+
+    channel = Channel(name="Test Channel", owner_id=user1.id, created_at=date.today())
+    db.add(channel)
+    db.commit()
+
+    first = Video(title="First", channel_id=channel.id, uploaded_at=date.today())
+    second = Video(title="Second", channel_id=channel.id, uploaded_at=date.today())
+    db.add_all([first, second])
+    db.commit()
+
+    db.add_all(
+        [
+            View(user_id=user1.id, video_id=first.id, reaction="Liked"),
+            View(user_id=user2.id, video_id=first.id, reaction="Liked"),
+            View(user_id=user1.id, video_id=second.id, reaction="Disliked"),
+            Comment(
+                comment_text="Great!",
+                user_id=user1.id,
+                video_id=first.id,
+                commented_at=date.today(),
+            ),
+            Comment(
+                comment_text="Nice!",
+                user_id=user2.id,
+                video_id=first.id,
+                commented_at=date.today(),
+            ),
+        ]
+    )
+    db.commit()
+
+    response = client.get(
+        f"/video/?ids={second.id}&ids=99999&ids={first.id}&ids={second.id}"
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [v["title"] for v in data["videos"]] == ["Second", "First"]
+    assert data["missing"] == [99999]
+
+    response = client.get(f"/video/stats?ids={first.id}&ids=99999&ids={second.id}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["missing"] == [99999]
+    assert [
+        (
+            s["video_id"],
+            s["total_views"],
+            s["likes"],
+            s["dislikes"],
+            s["total_comments"],
+        )
+        for s in data["stats"]
+    ] == [(first.id, 2, 2, 0, 2), (second.id, 1, 0, 1, 0)]
+
+    response = client.get("/video/stats")
+    assert response.status_code == 422
+
+
 def test_get_video_comments(client, db):
     response = client.get("/video/99999/comments")
     assert response.status_code == 404
-    
-    user = User(username="user1", email="user1@example.com", hashed_password="fake_hash", created_at=date.today(), is_moderator=False, is_deleted=False, is_banned=False)
+
+    user = User(
+        username="user1",
+        email="user1@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
     db.add(user)
     db.commit()
-    
+
     channel = Channel(name="Test Channel", owner_id=user.id, created_at=date.today())
     db.add(channel)
     db.commit()
-    
+
     video = Video(title="Test Video", channel_id=channel.id, uploaded_at=date.today())
     db.add(video)
     db.commit()
-    
+
     response = client.get(f"/video/{video.id}/comments")
     assert response.status_code == 200
     data = response.json()
@@ -220,12 +396,17 @@ def test_get_video_comments(client, db):
     assert data["page"] == 1
     assert data["limit"] == 10
     assert len(data["comments"]) == 0
-    
+
     for i in range(15):
-        comment = Comment(comment_text=f"Comment {i}", user_id=user.id, video_id=video.id, commented_at=date.today())
+        comment = Comment(
+            comment_text=f"Comment {i}",
+            user_id=user.id,
+            video_id=video.id,
+            commented_at=date.today(),
+        )
         db.add(comment)
     db.commit()
-    
+
     response = client.get(f"/video/{video.id}/comments?page=1&limit=10")
     assert response.status_code == 200
     data = response.json()
@@ -233,13 +414,13 @@ def test_get_video_comments(client, db):
     assert data["page"] == 1
     assert data["total_pages"] == 2
     assert len(data["comments"]) == 10
-    
+
     response = client.get(f"/video/{video.id}/comments?page=2&limit=10")
     assert response.status_code == 200
     data = response.json()
     assert data["page"] == 2
     assert len(data["comments"]) == 5
-    
+
     response = client.get(f"/video/{video.id}/comments?page=1&limit=5")
     assert response.status_code == 200
     data = response.json()
@@ -247,58 +428,790 @@ def test_get_video_comments(client, db):
     assert data["total_pages"] == 3
     assert len(data["comments"]) == 5
 
+
+def test_get_video_page(client, db):
+    response = client.get("/video/99999/page")
+    assert response.status_code == 404
+
+    user1 = User(
+        username="user1",
+        email="user1@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
+    user2 = User(
+        username="user2",
+        email="user2@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
+    db.add_all([user1, user2])
+    db.commit()
+
+    channel = Channel(name="Test Channel", owner_id=user1.id, created_at=date.today())
+    db.add(channel)
+    db.commit()
+
+    video = Video(title="Test Video", channel_id=channel.id, uploaded_at=date.today())
+    db.add(video)
+    db.commit()
+
+    db.add_all(
+        [
+            View(user_id=user1.id, video_id=video.id, reaction="Liked"),
+            View(user_id=user2.id, video_id=video.id, reaction="Disliked"),
+        ]
+    )
+    db.commit()
+    response = client.post(
+        f"/video/{video.id}/comments/bulk",
+        json={
+            "comments": [
+                {"user_id": user1.id, "comment_text": f"Comment {i}"} for i in range(7)
+            ]
+        },
+    )
+    assert response.status_code == 201
+
+    response = client.get(f"/video/{video.id}/page?comment_limit=5")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["video"]["id"] == video.id
+    assert data["video"]["title"] == "Test Video"
+    assert data["channel"] == {"id": channel.id, "name": "Test Channel"}
+    assert data["stats"]["total_views"] == 2
+    assert data["stats"]["likes"] == 1
+    assert data["stats"]["dislikes"] == 1
+    assert data["stats"]["total_comments"] == 7
+    assert data["comments"]["total_comments"] == 7
+    assert data["comments"]["total_pages"] == 2
+    assert [c["comment_text"] for c in data["comments"]["comments"]] == [
+        f"Comment {i}" for i in range(6, 1, -1)
+    ]
+
+
 def test_create_video_with_comment(client, db):
-    
-    response = client.post("/video/with-comment", json={
-        "title": "My First Video",
-        "channel_id": 99999,
-        "initial_comment": "Pinned comment!"
-    })
+    response = client.post(
+        "/video/with-comment",
+        json={
+            "title": "My First Video",
+            "channel_id": 99999,
+            "initial_comment": "Pinned comment!",
+        },
+    )
     assert response.status_code == 404
-    
-    user = User(username="creator", email="creator@example.com", hashed_password="fake_hash", created_at=date.today(), is_moderator=False, is_deleted=False, is_banned=False)
+
+    user = User(
+        username="creator",
+        email="creator@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
     db.add(user)
     db.commit()
-    
+
     channel = Channel(name="Test Channel", owner_id=user.id, created_at=date.today())
     db.add(channel)
     db.commit()
-    
-    response = client.post("/video/with-comment", json={
-        "title": "My First Video",
-        "channel_id": channel.id,
-        "initial_comment": "Pinned comment!"
-    })
+
+    response = client.post(
+        "/video/with-comment",
+        json={
+            "title": "My First Video",
+            "channel_id": channel.id,
+            "initial_comment": "Pinned comment!",
+        },
+    )
     assert response.status_code == 201
     data = response.json()
     assert data["video"]["title"] == "My First Video"
     assert data["comment_text"] == "Pinned comment!"
-    
+
     video_id = data["video"]["id"]
-    comment_count = db.scalar(select(func.count(Comment.id)).where(Comment.video_id == video_id))
+    comment_count = db.scalar(
+        select(func.count(Comment.id)).where(Comment.video_id == video_id)
+    )
     assert comment_count == 1
-    
-    comment = db.execute(select(Comment).where(Comment.video_id == video_id)).scalar_one()
+
+    comment = db.execute(
+        select(Comment).where(Comment.video_id == video_id)
+    ).scalar_one()
     assert comment.user_id == user.id
     assert comment.comment_text == "Pinned comment!"
-    
+
     user.is_deleted = True
     db.commit()
-    
-    response = client.post("/video/with-comment", json={
-        "title": "Another Video",
-        "channel_id": channel.id,
-        "initial_comment": "Test"
-    })
+
+    response = client.post(
+        "/video/with-comment",
+        json={
+            "title": "Another Video",
+            "channel_id": channel.id,
+            "initial_comment": "Test",
+        },
+    )
     assert response.status_code == 410
-    
+
     user.is_deleted = False
     user.is_banned = True
     db.commit()
-    
-    response = client.post("/video/with-comment", json={
-        "title": "Banned Video",
-        "channel_id": channel.id,
-        "initial_comment": "Test"
-    })
-    assert response.status_code == 403
\ No newline at end of file
+
+    response = client.post(
+        "/video/with-comment",
+        json={
+            "title": "Banned Video",
+            "channel_id": channel.id,
+            "initial_comment": "Test",
+        },
+    )
+    assert response.status_code == 403
+
+
+def test_get_similar_videos(client, db):
+    response = client.get("/video/99999/similar")
+    assert response.status_code == 404
+
+    user = User(
+        username="creator",
+        email="creator@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
+    db.add(user)
+    db.commit()
+
+    channel = Channel(name="Test Channel", owner_id=user.id, created_at=date.today())
+    db.add(channel)
+    db.commit()
+
+    ids = {}
+    for title, description in [
+        ("Python asyncio tutorial", "Learn asyncio event loops in Python"),
+        ("Advanced Python asyncio patterns", None),
+        ("Chocolate cake recipe", "Bake a chocolate cake"),
+    ]:
+        response = client.post(
+            "/video/",
+            json={"title": title, "description": description, "channel_id": channel.id},
+        )
+        assert response.status_code == 201
+        ids[title] = response.json()["id"]
+
+    tutorial = ids["Python asyncio tutorial"]
+    cake = ids["Chocolate cake recipe"]
+
+    response = client.get(f"/video/{tutorial}/similar")
+    assert response.status_code == 200
+    assert [v["id"] for v in response.json()["videos"]] == [
+        ids["Advanced Python asyncio patterns"]
+    ]
+
+    response = client.patch(
+        f"/video/{cake}", json={"title": "Python asyncio for bakers"}
+    )
+    assert response.status_code == 200
+    response = client.get(f"/video/{tutorial}/similar")
+    assert cake in [v["id"] for v in response.json()["videos"]]
+
+    response = client.patch(f"/video/{cake}", json={"is_active": False})
+    assert response.status_code == 200
+    response = client.get(f"/video/{tutorial}/similar")
+    assert cake not in [v["id"] for v in response.json()["videos"]]
+
+
+def test_get_trending_videos(client, db):
+    response = client.get("/video/trending")
+    assert response.status_code == 200
+    assert response.json()["videos"] == []
+
+    creator = User(
+        username="creator",
+        email="creator@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
+    viewers = [
+        User(
+            username=f"viewer{i}",
+            email=f"viewer{i}@example.com",
+            hashed_password="fake_hash",
+            created_at=date.today(),
+            is_moderator=False,
+            is_deleted=False,
+            is_banned=False,
+        )
+        for i in range(3)
+    ]
+    db.add_all([creator, *viewers])
+    db.commit()
+
+    channel = Channel(name="Test Channel", owner_id=creator.id, created_at=date.today())
+    db.add(channel)
+    db.commit()
+
+    old = Video(title="Old", channel_id=channel.id, uploaded_at=date.today())
+    fresh = Video(title="Fresh", channel_id=channel.id, uploaded_at=date.today())
+    viral = Video(title="Viral", channel_id=channel.id, uploaded_at=date.today())
+    db.add_all([old, fresh, viral])
+    db.commit()
+
+    today = date.today()
+    db.add_all(
+        [
+            View(
+                user_id=viewers[0].id,
+                video_id=old.id,
+                watched_at=today - timedelta(days=3),
+            ),
+            View(
+                user_id=viewers[0].id,
+                video_id=fresh.id,
+                watched_at=today - timedelta(days=1),
+            ),
+            View(user_id=viewers[1].id, video_id=fresh.id, watched_at=today),
+            *[
+                View(
+                    user_id=viewer.id,
+                    video_id=viral.id,
+                    watched_at=today - timedelta(days=5),
+                )
+                for viewer in viewers
+            ],
+        ]
+    )
+    db.commit()
+
+    assert refresh_trending_scores(db) > 0
+    assert refresh_trending_scores(db) == 0
+
+    response = client.get("/video/trending")
+    assert response.status_code == 200
+    videos = response.json()["videos"]
+    assert [v["id"] for v in videos] == [viral.id, fresh.id, old.id]
+    assert videos[0]["trending_score"] == pytest.approx(
+        3 * 2 ** (-5 / HALF_LIFE_DAYS), rel=1e-3
+    )
+
+    viral.is_active = False
+    db.commit()
+
+    response = client.get("/video/trending?limit=1")
+    assert [v["id"] for v in response.json()["videos"]] == [fresh.id]
+
+
+def test_search_videos(client, db):
+    user = User(
+        username="creator",
+        email="creator@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
+    db.add(user)
+    db.commit()
+
+    channel = Channel(name="Test Channel", owner_id=user.id, created_at=date.today())
+    db.add(channel)
+    db.commit()
+
+    in_title = Video(
+        title="Guitar lessons for beginners",
+        channel_id=channel.id,
+        uploaded_at=date.today(),
+    )
+    in_description = Video(
+        title="Weekend vlog",
+        description="Some guitar practice at the end",
+        channel_id=channel.id,
+        uploaded_at=date.today(),
+    )
+    inactive = Video(
+        title="Guitar solo",
+        channel_id=channel.id,
+        uploaded_at=date.today(),
+        is_active=False,
+    )
+    unrelated = Video(
+        title="Cooking pasta", channel_id=channel.id, uploaded_at=date.today()
+    )
+    db.add_all([in_title, in_description, inactive, unrelated])
+    db.commit()
+
+    response = client.get("/video/search", params={"q": "guitars"})
+    assert response.status_code == 200
+    data = response.json()
+    assert [v["id"] for v in data["videos"]] == [in_title.id, in_description.id]
+    assert data["next_after_id"] is None
+
+    response = client.get("/video/search", params={"q": "guitar", "limit": 1})
+    page = response.json()
+    assert [v["id"] for v in page["videos"]] == [in_title.id]
+
+    response = client.get(
+        "/video/search",
+        params={
+            "q": "guitar",
+            "limit": 1,
+            "after_rank": page["next_after_rank"],
+            "after_id": page["next_after_id"],
+        },
+    )
+    assert [v["id"] for v in response.json()["videos"]] == [in_description.id]
+
+    in_description.description = "No instruments this week"
+    db.commit()
+    response = client.get("/video/search", params={"q": "guitar"})
+    assert [v["id"] for v in response.json()["videos"]] == [in_title.id]
+
+    response = client.get("/video/search", params={"q": "guitar", "after_id": 1})
+    assert response.status_code == 400
+
+
+def test_search_videos_paginates_through_equal_ranks(client, db):
+    user = User(
+        username="creator",
+        email="creator@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_moderator=False,
+        is_deleted=False,
+        is_banned=False,
+    )
+    db.add(user)
+    db.commit()
+
+    channel = Channel(name="Test Channel", owner_id=user.id, created_at=date.today())
+    db.add(channel)
+    db.commit()
+
+    # Matches only in the B-weighted description all rank 0.4, which real cannot hold exactly.
+    videos = [
+        Video(
+            title=f"Weekend vlog {i}",
+            description="Some guitar practice",
+            channel_id=channel.id,
+            uploaded_at=date.today(),
+        )
+        for i in range(5)
+    ]
+    db.add_all(videos)
+    db.commit()
+
+    seen = []
+    params = {"q": "guitar", "limit": 2}
+    for _ in range(5):
+        page = client.get("/video/search", params=params).json()
+        assert len({v["rank"] for v in page["videos"]}) <= 1
+        seen.extend(v["id"] for v in page["videos"])
+        if page["next_after_id"] is None:
+            break
+        params.update(
+            after_rank=page["next_after_rank"], after_id=page["next_after_id"]
+        )
+    assert seen == sorted((v.id for v in videos), reverse=True)
+
+
+def test_maintain_view_partitions(db, restore_view_partitions):
+    user = User(
+        username="viewer",
+        email="viewer@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    db.add(user)
+    db.commit()
+    channel = Channel(name="Test Channel", owner_id=user.id, created_at=date.today())
+    db.add(channel)
+    db.commit()
+    video = Video(
+        title="Old video", channel_id=channel.id, uploaded_at=date(2025, 10, 1)
+    )
+    db.add(video)
+    db.commit()
+
+    db.add(View(user_id=user.id, video_id=video.id, watched_at=date(2025, 10, 5)))
+    db.commit()
+
+    maintain_view_partitions(
+        db, today=date(2026, 1, 15), months_ahead=3, retention_months=0
+    )
+    partitions = set(ViewRepository.get_partition_names(db))
+    assert {
+        f"views_p{month}"
+        for month in ["2025_10", "2025_11", "2025_12", "2026_01", "2026_04"]
+    } <= partitions
+    assert db.scalar(text("SELECT count(*) FROM views_p2025_10")) == 1
+    assert db.scalar(text("SELECT count(*) FROM views_default")) == 0
+    assert (
+        db.scalar(
+            select(func.count())
+            .select_from(View)
+            .where(
+                View.watched_at >= date(2025, 10, 1),
+                View.watched_at < date(2025, 11, 1),
+            )
+        )
+        == 1
+    )
+
+    _, detached = maintain_view_partitions(
+        db, today=date(2026, 1, 15), months_ahead=3, retention_months=2
+    )
+    for name in detached:
+        db.execute(text(f"DROP TABLE {name}"))
+    db.commit()
+    assert "views_p2025_10" in detached
+    assert "views_p2025_11" not in detached
+    assert db.scalar(select(func.count()).select_from(View)) == 0
+
+
+def test_record_views_batched(client, db):
+    user = User(
+        username="viewer",
+        email="viewer@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    db.add(user)
+    db.commit()
+    channel = Channel(name="Test Channel", owner_id=user.id, created_at=date.today())
+    db.add(channel)
+    db.commit()
+    video = Video(title="Watched", channel_id=channel.id, uploaded_at=date.today())
+    db.add(video)
+    db.commit()
+
+    events = [
+        (video.id, {"user_id": user.id, "watched_percentage": 0.3}),
+        (
+            video.id,
+            {"user_id": user.id, "watched_percentage": 0.8, "reaction": "Liked"},
+        ),
+        (video.id, {"user_id": user.id, "watched_percentage": 0.5}),
+        (99999, {"user_id": user.id}),
+    ]
+    for video_id, payload in events:
+        response = client.post(f"/video/{video_id}/view", json=payload)
+        assert response.status_code == 202
+        assert response.json()["status"] == "queued"
+    assert db.scalar(select(func.count()).select_from(View)) == 0
+
+    assert view_event_buffer.flush(db) == len(events)
+    rows = db.execute(select(View)).scalars().all()
+    assert [
+        (v.user_id, v.video_id, v.watched_at, v.watched_percentage, v.reaction)
+        for v in rows
+    ] == [(user.id, video.id, date.today(), 0.8, "Liked")]
+
+    client.post(
+        f"/video/{video.id}/view", json={"user_id": user.id, "watched_percentage": 1.0}
+    )
+    view_event_buffer.flush(db)
+    db.expire_all()
+    view = db.execute(select(View)).scalar_one()
+    assert (view.watched_percentage, view.reaction) == (1.0, "Liked")
+
+    response = client.post(
+        f"/video/{video.id}/view", json={"user_id": user.id, "watched_percentage": 1.5}
+    )
+    assert response.status_code == 422
+
+
+def test_record_view_reaction_clears_older_rows(client, db):
+    users = [
+        User(
+            username=f"again{i}",
+            email=f"again{i}@example.com",
+            hashed_password="fake_hash",
+            created_at=date.today(),
+        )
+        for i in range(2)
+    ]
+    db.add_all(users)
+    db.commit()
+    channel = Channel(
+        name="Test Channel", owner_id=users[0].id, created_at=date.today()
+    )
+    db.add(channel)
+    db.commit()
+    video = Video(title="Rewatched", channel_id=channel.id, uploaded_at=date.today())
+    db.add(video)
+    db.commit()
+    yesterday = date.today() - timedelta(days=1)
+    db.add_all(
+        [
+            View(
+                user_id=user.id,
+                video_id=video.id,
+                watched_at=yesterday,
+                reaction="Liked",
+            )
+            for user in users
+        ]
+    )
+    db.commit()
+
+    client.post(
+        f"/video/{video.id}/view", json={"user_id": users[0].id, "reaction": "Disliked"}
+    )
+    client.post(
+        f"/video/{video.id}/view",
+        json={"user_id": users[1].id, "watched_percentage": 0.5},
+    )
+    view_event_buffer.flush(db)
+    db.expire_all()
+    rows = (
+        db.execute(select(View).order_by(View.user_id, View.watched_at)).scalars().all()
+    )
+    assert [(v.user_id, v.watched_at, v.reaction) for v in rows] == [
+        (users[0].id, yesterday, None),
+        (users[0].id, date.today(), "Disliked"),
+        (users[1].id, yesterday, "Liked"),
+        (users[1].id, date.today(), None),
+    ]
+    stats = client.get(f"/video/{video.id}/stats").json()
+    assert (stats["likes"], stats["dislikes"]) == (1, 1)
+
+
+def test_watch_progress_coalesced(client, db):
+    user = User(
+        username="player",
+        email="player@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    db.add(user)
+    db.commit()
+    channel = Channel(name="Test Channel", owner_id=user.id, created_at=date.today())
+    db.add(channel)
+    db.commit()
+    video = Video(title="Long one", channel_id=channel.id, uploaded_at=date.today())
+    db.add(video)
+    db.commit()
+
+    for percentage in (0.1, 0.2, 0.6, 0.4):
+        response = client.put(
+            f"/video/{video.id}/progress",
+            json={"user_id": user.id, "watched_percentage": percentage},
+        )
+        assert response.status_code == 202
+    client.put(
+        "/video/99999/progress", json={"user_id": user.id, "watched_percentage": 0.5}
+    )
+    assert db.scalar(select(func.count()).select_from(View)) == 0
+
+    assert view_progress_buffer.flush(db) == 2
+    view = db.execute(select(View)).scalar_one()
+    assert (view.user_id, view.video_id, view.watched_percentage) == (
+        user.id,
+        video.id,
+        0.4,
+    )
+    assert view_progress_buffer.flush(db) == 0
+
+
+def test_video_reaction(client, db):
+    users = [
+        User(
+            username=f"reactor{i}",
+            email=f"reactor{i}@example.com",
+            hashed_password="fake_hash",
+            created_at=date.today(),
+        )
+        for i in range(3)
+    ]
+    db.add_all(users)
+    db.commit()
+    channel = Channel(
+        name="Test Channel", owner_id=users[0].id, created_at=date.today()
+    )
+    db.add(channel)
+    db.commit()
+    video = Video(title="Reacted", channel_id=channel.id, uploaded_at=date.today())
+    db.add(video)
+    db.commit()
+    yesterday = date.today() - timedelta(days=1)
+    db.add_all(
+        [
+            View(
+                user_id=users[1].id,
+                video_id=video.id,
+                watched_at=yesterday,
+                reaction="Liked",
+            ),
+            View(
+                user_id=users[2].id,
+                video_id=video.id,
+                watched_at=yesterday,
+                reaction="Disliked",
+            ),
+        ]
+    )
+    db.commit()
+
+    # A reaction needs a view to sit on and never creates one.
+    response = client.put(
+        f"/video/{video.id}/reaction",
+        json={"user_id": users[0].id, "reaction": "Liked"},
+    )
+    assert response.status_code == 409
+    assert db.query(View).filter_by(user_id=users[0].id).count() == 0
+
+    db.add_all(
+        [
+            View(
+                user_id=users[0].id,
+                video_id=video.id,
+                watched_at=yesterday - timedelta(days=1),
+                reaction="Disliked",
+            ),
+            View(
+                user_id=users[0].id,
+                video_id=video.id,
+                watched_at=yesterday,
+                watched_percentage=0.8,
+            ),
+        ]
+    )
+    db.commit()
+    response = client.put(
+        f"/video/{video.id}/reaction",
+        json={"user_id": users[0].id, "reaction": "Liked"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "video_id": video.id,
+        "reaction": "Liked",
+        "likes": 2,
+        "dislikes": 1,
+    }
+    db.expire_all()
+    rows = db.query(View).filter_by(user_id=users[0].id).order_by(View.watched_at).all()
+    assert [row.reaction for row in rows] == [None, "Liked"]
+
+    response = client.put(
+        f"/video/{video.id}/reaction",
+        json={"user_id": users[1].id, "reaction": "Disliked"},
+    )
+    assert response.json() == {
+        "video_id": video.id,
+        "reaction": "Disliked",
+        "likes": 1,
+        "dislikes": 2,
+    }
+    stats = client.get(f"/video/{video.id}/stats").json()
+    assert (stats["likes"], stats["dislikes"]) == (1, 2)
+    assert stats["total_views"] == 4
+
+    response = client.delete(
+        f"/video/{video.id}/reaction", params={"user_id": users[2].id}
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "video_id": video.id,
+        "reaction": None,
+        "likes": 1,
+        "dislikes": 1,
+    }
+    stats = client.get(f"/video/{video.id}/stats").json()
+    assert (stats["likes"], stats["dislikes"]) == (1, 1)
+
+    response = client.put(
+        "/video/99999/reaction", json={"user_id": users[0].id, "reaction": "Liked"}
+    )
+    assert response.status_code == 404
+    response = client.delete("/video/99999/reaction", params={"user_id": users[0].id})
+    assert response.status_code == 404
+    response = client.put(
+        f"/video/{video.id}/reaction", json={"user_id": users[0].id, "reaction": "Love"}
+    )
+    assert response.status_code == 422
+
+
+def test_post_comments(client, db):
+    author = User(
+        username="author",
+        email="author@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+    )
+    banned = User(
+        username="banned",
+        email="banned@example.com",
+        hashed_password="fake_hash",
+        created_at=date.today(),
+        is_banned=True,
+    )
+    db.add_all([author, banned])
+    db.commit()
+    channel = Channel(name="Test Channel", owner_id=author.id, created_at=date.today())
+    db.add(channel)
+    db.commit()
+    video = Video(title="Discussed", channel_id=channel.id, uploaded_at=date.today())
+    db.add(video)
+    db.commit()
+
+    response = client.post(
+        f"/video/{video.id}/comments",
+        json={"user_id": author.id, "comment_text": "First"},
+    )
+    assert response.status_code == 201
+    first = response.json()
+    assert (first["comment_text"], first["username"]) == ("First", "author")
+
+    # Fills the cached first page, which later posts update in place.
+    assert client.get(f"/video/{video.id}/comments").json()["total_comments"] == 1
+
+    response = client.post(
+        f"/video/{video.id}/comments/bulk",
+        json={
+            "comments": [
+                {"user_id": author.id, "comment_text": text}
+                for text in ("Second", "Third")
+            ]
+        },
+    )
+    assert response.status_code == 201
+    assert [c["comment_text"] for c in response.json()["comments"]] == [
+        "Second",
+        "Third",
+    ]
+
+    data = client.get(f"/video/{video.id}/comments").json()
+    assert data["total_comments"] == 3
+    assert [c["comment_text"] for c in data["comments"]] == ["Third", "Second", "First"]
+    assert client.get(f"/video/{video.id}/stats").json()["total_comments"] == 3
+
+    response = client.post(
+        f"/video/{video.id}/comments/bulk",
+        json={
+            "comments": [
+                {"user_id": author.id, "comment_text": "Fine"},
+                {"user_id": banned.id, "comment_text": "Spam"},
+            ]
+        },
+    )
+    assert response.status_code == 403
+    assert client.get(f"/video/{video.id}/comments").json()["total_comments"] == 3
+
+    response = client.post(
+        "/video/99999/comments", json={"user_id": author.id, "comment_text": "Lost"}
+    )
+    assert response.status_code == 404